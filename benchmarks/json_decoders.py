@@ -0,0 +1,60 @@
+"""Compares the json decoders on a realistic Sentinel Hub page of 100 products.
+
+Usage: poetry run python benchmarks/json_decoders.py [--repeat 200]
+"""
+import argparse
+import copy
+import json
+import os
+import timeit
+import uuid
+
+from sentinelpy import available_json_decoders, set_json_decoder
+from sentinelpy.client import decode_response_content
+
+DATA_FILE = os.path.join(
+    os.path.dirname(__file__), os.pardir, "tests", "data", "sentinel.api.json"
+)
+
+
+def build_page(rows: int = 100) -> bytes:
+    with open(DATA_FILE, "rb") as sentinel_data:
+        body = json.load(sentinel_data)
+    entries = body["feed"]["entry"]
+    page = []
+    for index in range(rows):
+        entry = copy.deepcopy(entries[index % len(entries)])
+        entry["id"] = str(uuid.uuid4())
+        page.append(entry)
+    body["feed"]["entry"] = page
+    body["feed"]["opensearch:totalResults"] = str(rows * 10)
+    return json.dumps(body).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    arguments = parser.parse_args()
+
+    page = build_page()
+    print(f"Page of 100 products, {len(page) / 1024:.0f} KiB")
+    baseline = None
+    for name in reversed(available_json_decoders()):
+        set_json_decoder(name)
+        seconds = min(
+            timeit.repeat(
+                lambda: decode_response_content(200, page),
+                number=arguments.repeat,
+                repeat=5,
+            )
+        )
+        per_page = seconds / arguments.repeat
+        baseline = baseline or per_page
+        print(
+            f"{name:>10}: {per_page * 1000:7.3f} ms per page "
+            f"({baseline / per_page:4.1f}x json)"
+        )
+
+
+if __name__ == "__main__":
+    main()
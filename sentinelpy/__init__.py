@@ -4,10 +4,50 @@ __author__ = """UK Hydrographic Office"""
 __email__ = "datascienceandengineering@ukho.gov.uk"
 __version__ = "0.1.0"
 
-from .main import query_sentinel_hub  # noqa: F401
+from .async_client import AsyncSentinelHubClient  # noqa: F401
+from .cache import (  # noqa: F401
+    CacheStats,
+    DiskCache,
+    MemoryCache,
+    ResponseCache,
+    cache_key,
+)
+from .catalog import ProductCatalog  # noqa: F401
+from .circuit_breaker import CircuitBreaker, CircuitState  # noqa: F401
+from .client import SentinelHubClient  # noqa: F401
+from .count import (  # noqa: F401
+    count_sentinel_products,
+    count_sentinel_products_batch,
+)
+from .endpoints import EndpointPool, EndpointStats  # noqa: F401
+from .federation import iter_federated_sentinel_products  # noqa: F401
+from .json_decoder import (  # noqa: F401
+    available_json_decoders,
+    get_json_decoder,
+    set_json_decoder,
+)
+from .main import (  # noqa: F401
+    query_sentinel_hub,
+    query_sentinel_hub_async,
+    set_default_client,
+)
+from .pagination import (  # noqa: F401
+    fetch_sentinel_products_parallel,
+    iter_merged_sentinel_products,
+    iter_sentinel_products,
+)
+from .partition import (  # noqa: F401
+    iter_partitioned_sentinel_products,
+    partition_sentinel_product_request,
+)
+from .product import Product  # noqa: F401
+from .projection import project_entry, project_response  # noqa: F401
 from .query_sentinel_products_response import (  # noqa: F401
+    LazyQuerySentinelProductsResponse,
     QuerySentinelProductsResponse,
 )
+from .rate_limit import RateLimiter  # noqa: F401
+from .raw_sentinel_products_response import RawSentinelProductsResponse  # noqa: F401
 from .request.model import (  # noqa: F401
     OrbitDirection,
     PlatformName,
@@ -29,3 +69,18 @@ from .request.request_query_builder import (  # noqa: F401
 from .request.sentinel_product_request_builder import (  # noqa: F401
     SentinelProductRequestBuilder,
 )
+from .retry import RetryAttempt, RetryPolicy  # noqa: F401
+from .single_flight import SingleFlight  # noqa: F401
+from .sink import (  # noqa: F401
+    DirectorySink,
+    Sink,
+    StreamSink,
+    archive_sentinel_products,
+)
+from .sync import (  # noqa: F401
+    SyncState,
+    SyncStateStore,
+    sync_sentinel_products,
+)
+from .table import ProductTable  # noqa: F401
+from .tiling import iter_tiled_sentinel_products, tile_footprint  # noqa: F401
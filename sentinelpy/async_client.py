@@ -0,0 +1,341 @@
+"""Asynchronous client module."""
+import asyncio
+import importlib
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, Mapping, Optional, Tuple
+
+from . import __version__
+from .cache import ResponseCache
+from .circuit_breaker import CircuitBreaker
+from .client import (
+    SENTINEL_HUB_MAX_ROWS,
+    build_query_url,
+    create_endpoint_pool,
+    decode_response_content,
+)
+from .endpoints import EndpointPool
+from .exceptions import CircuitOpenError
+from .projection import project_response
+from .query_sentinel_products_response import QuerySentinelProductsResponse
+from .rate_limit import RateLimiter
+from .request.model import SentinelProductRequest
+from .retry import RetryPolicy
+from .single_flight import SingleFlight
+
+
+class AsyncSentinelHubClient:
+    """Asynchronous client for the Sentinel Hub API, built on aiohttp so that a single
+    event loop can keep many queries in flight without threads. Requires the async
+    extra, i.e. pip install sentinelpy[async].
+
+    Connections are kept alive and reused between queries and the number of
+    queries in flight at once is limited by `max_concurrency`. As the synchronous
+    client, the proxies in the HTTP_PROXY, HTTPS_PROXY and NO_PROXY environment
+    variables are used.
+
+    Examples
+    ========
+    async with AsyncSentinelHubClient(max_concurrency=50) as client:
+        responses = await asyncio.gather(
+            *(client.query(request) for request in requests)
+        )
+
+        async for product in client.iter_products(request):
+            print(product["id"])
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: Optional[str] = None,
+        endpoints: Optional[EndpointPool] = None,
+        max_concurrency: int = 10,
+        timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce: bool = False,
+        lazy_decoding: bool = False,
+    ):
+        """
+        Args:
+            base_url::Optional[str]
+                Base url of the endpoint to query, e.g. a mirror of the hub,
+                defaults to https://scihub.copernicus.eu/dhus
+            endpoints::Optional[EndpointPool]
+                Compatible endpoints to spread queries over, failing over between
+                them, instead of base_url
+            max_concurrency::int
+                Maximum number of queries in flight at once, defaults to 10
+            timeout::Optional[float]
+                Seconds to wait for each query to complete, defaults to None
+                (no timeout)
+            retry_policy::Optional[RetryPolicy]
+                Policy for retrying queries that fail with a transient error,
+                defaults to None (no retries). Waiting queries do not count
+                towards max_concurrency
+            rate_limiter::Optional[RateLimiter]
+                Limits the rate at which queries, including retries, are sent,
+                defaults to None (no limit)
+            circuit_breaker::Optional[CircuitBreaker]
+                Fails queries fast while the hub is failing, with a CircuitOpenError
+                as the error of the response, defaults to None (always query)
+            cache::Optional[ResponseCache]
+                Cache serving repeated queries without querying the hub, e.g. a
+                DiskCache, defaults to None (no caching)
+            coalesce::bool
+                Whether concurrent tasks making an identical query share a single
+                query to the hub, defaults to False
+            lazy_decoding::bool
+                Whether the body of each response is only decoded when it is first
+                read, returning LazyQuerySentinelProductsResponses, defaults to False
+
+        Raises:
+            ValueError - if max_concurrency is less than 1, retry_policy
+            max_attempts is less than 1 or both base_url and endpoints are given
+            ImportError - if aiohttp is not installed
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.__endpoints = create_endpoint_pool(base_url, endpoints)
+        if retry_policy is not None and retry_policy.max_attempts < 1:
+            raise ValueError("retry_policy max_attempts must be at least 1")
+        self.__retry_policy = retry_policy
+        self.__rate_limiter = rate_limiter
+        self.__circuit_breaker = circuit_breaker
+        self.__cache = cache
+        self.__single_flight = SingleFlight() if coalesce else None
+        self.__lazy_decoding = lazy_decoding
+        self.__max_concurrency = max_concurrency
+        self.__timeout = timeout
+        self.__semaphore: Optional[asyncio.Semaphore] = None
+        try:
+            # Imported on first use so that sentinelpy does not require aiohttp
+            self.__aiohttp: Any = importlib.import_module("aiohttp")
+        except ImportError:
+            raise ImportError(
+                "AsyncSentinelHubClient requires aiohttp, install sentinelpy[async]"
+            )
+        self.__session: Any = None
+
+    async def query(
+        self,
+        sentinel_product_request: SentinelProductRequest,
+        *,
+        fields: Optional[Iterable[str]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> QuerySentinelProductsResponse:
+        """Queries the Sentinel Hub for the information in the request.
+
+        Args:
+            sentinel_product_request::SentinelProductRequest
+                Details regarding the request
+
+            fields::Optional[Iterable[str]]
+                Names of the fields to keep of each product, e.g. footprint, see
+                project_entry, defaults to None (keep every field)
+
+            logger::Optional[logging.Logger]
+                Logger to log information and error message defaults to None
+
+        Returns:
+            result::QuerySentinelProductsResponse
+                Result of the query
+        """
+        if logger is None:
+            logger = logging.getLogger(__name__)
+        logger.debug(f"Querying sentinel hub with request: {sentinel_product_request}")
+        if self.__cache is not None:
+            cached = self.__cache.get(sentinel_product_request)
+            if cached is not None:
+                logger.info("Serving response from cache")
+                return project_response(cached, fields)
+        if self.__single_flight is None:
+            result = await self.__query(sentinel_product_request, logger)
+        else:
+            result = await self.__single_flight.do_async(
+                sentinel_product_request,
+                lambda: self.__query(sentinel_product_request, logger),
+            )
+        return project_response(result, fields)
+
+    async def iter_products(
+        self,
+        sentinel_product_request: SentinelProductRequest,
+        *,
+        fields: Optional[Iterable[str]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterates over every product matching the request, one page at a time from
+        the requested start. The page size is the requested rows, capped at the
+        Sentinel Hub limit of 100.
+
+        Args:
+            sentinel_product_request::SentinelProductRequest
+                Details regarding the request
+
+            fields::Optional[Iterable[str]]
+                Names of the fields to keep of each product, e.g. footprint, see
+                project_entry, defaults to None (keep every field)
+
+            logger::Optional[logging.Logger]
+                Logger to log information and error message defaults to None
+
+        Returns:
+            products::AsyncIterator[Dict[str, Any]]
+                The products (feed entries) in the order returned by the hub
+
+        Raises:
+            QuerySentinelProductsError/IOError - if a page could not be retrieved
+        """
+        page_size = min(
+            sentinel_product_request.rows or SENTINEL_HUB_MAX_ROWS,
+            SENTINEL_HUB_MAX_ROWS,
+        )
+        start = sentinel_product_request.start
+        while True:
+            response = await self.query(
+                sentinel_product_request._replace(start=start, rows=page_size),
+                fields=fields,
+                logger=logger,
+            )
+            response.raise_for_failure()
+            entries = response.entries
+            for entry in entries:
+                yield entry
+            start += len(entries)
+            total_results = response.total_results
+            if not entries or total_results is None or start >= total_results:
+                return
+
+    async def close(self):
+        """Closes the connections held by the client"""
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    async def __aenter__(self) -> "AsyncSentinelHubClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def __query(
+        self, sentinel_product_request: SentinelProductRequest, logger: logging.Logger
+    ) -> QuerySentinelProductsResponse:
+        attempt = 1
+        while True:
+            result, retry_after = await self.__attempt(sentinel_product_request, logger)
+            delay = (
+                None
+                if self.__retry_policy is None
+                else self.__retry_policy.next_delay(attempt, result, retry_after)
+            )
+            if delay is None:
+                if self.__cache is not None:
+                    self.__cache.put(sentinel_product_request, result)
+                return result
+            logger.warning(
+                f"Attempt {attempt} to query Sentinel hub failed, retrying in "
+                f"{delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def __attempt(
+        self, sentinel_product_request: SentinelProductRequest, logger: logging.Logger
+    ) -> Tuple[QuerySentinelProductsResponse, Optional[str]]:
+        circuit_breaker = self.__circuit_breaker
+        if circuit_breaker is not None and not circuit_breaker.allow_request():
+            logger.warning("Circuit breaker is open, not querying Sentinel hub")
+            open_error = CircuitOpenError(circuit_breaker.retry_after)
+            return QuerySentinelProductsResponse(None, None, open_error), None
+        try:
+            result, retry_after = await self.__fail_over(
+                sentinel_product_request, logger
+            )
+        except BaseException:
+            if circuit_breaker is not None:
+                circuit_breaker.record_cancelled()
+            raise
+        if circuit_breaker is not None:
+            circuit_breaker.record(result)
+        return result, retry_after
+
+    async def __fail_over(
+        self, sentinel_product_request: SentinelProductRequest, logger: logging.Logger
+    ) -> Tuple[QuerySentinelProductsResponse, Optional[str]]:
+        auth = (sentinel_product_request.username, sentinel_product_request.password)
+        tried = []
+        base_url = self.__endpoints.select()
+        while base_url is not None:
+            url = build_query_url(sentinel_product_request, base_url)
+            logger.debug(f"Constructed url: {url}")
+            started = time.monotonic()
+            result, retry_after = await self.__send(url, auth, logger)
+            self.__endpoints.record(base_url, time.monotonic() - started, result)
+            tried.append(base_url)
+            if not self.__endpoints.is_failure(result):
+                break
+            base_url = self.__endpoints.select(exclude=tried)
+            if base_url is not None:
+                logger.warning(
+                    f"Query to {tried[-1]} failed, failing over to {base_url}"
+                )
+        return result, retry_after
+
+    async def __send(
+        self, url: str, auth: Tuple[str, str], logger: logging.Logger
+    ) -> Tuple[QuerySentinelProductsResponse, Optional[str]]:
+        if self.__rate_limiter is not None:
+            await asyncio.sleep(self.__rate_limiter.reserve())
+        try:
+            async with self.__get_semaphore():
+                status_code, headers, content = await asyncio.wait_for(
+                    self.__get(url, auth), self.__timeout
+                )
+            logger.info(
+                f"Received response from Sentinel hub with status: {status_code}"
+            )
+            return (
+                decode_response_content(
+                    status_code, content, lazy=self.__lazy_decoding
+                ),
+                headers.get("retry-after"),
+            )
+        except (IOError, EOFError, asyncio.TimeoutError) as request_exception:
+            return QuerySentinelProductsResponse(None, None, request_exception), None
+
+    def __get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so that it belongs to the running event loop
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.__max_concurrency)
+        return self.__semaphore
+
+    async def __get(
+        self, url: str, auth: Tuple[str, str]
+    ) -> Tuple[int, Mapping[str, str], bytes]:
+        aiohttp = self.__aiohttp
+        if self.__session is None:
+            # Created lazily so that it belongs to the running event loop
+            self.__session = aiohttp.ClientSession(
+                headers={
+                    "User-Agent": f"sentinelpy/{__version__}",
+                    "Accept": "application/json",
+                },
+                trust_env=True,
+            )
+        try:
+            async with self.__session.get(
+                url, auth=aiohttp.BasicAuth(*auth)
+            ) as response:
+                return response.status, response.headers, await response.read()
+        except IOError:
+            raise
+        except aiohttp.ClientError as client_error:
+            # Unlike those of requests, not every aiohttp error is an IOError
+            raise IOError(f"Query to Sentinel Hub failed: {client_error!r}") from (
+                client_error
+            )
@@ -0,0 +1,426 @@
+"""Cache module."""
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import List, NamedTuple, Optional, Tuple
+
+from .json_decoder import decode_json
+from .query_sentinel_products_response import (
+    LazyQuerySentinelProductsResponse,
+    QuerySentinelProductsResponse,
+)
+from .request.model import SentinelProductRequest
+
+
+def cache_key(sentinel_product_request: SentinelProductRequest) -> str:
+    """Canonical key of a request, identical for requests that return the same
+    results. The password is excluded so that it is never written to a cache.
+
+    Args:
+        sentinel_product_request::SentinelProductRequest
+            Details regarding the request
+
+    Returns:
+        key::str
+            Hex digest identifying the request
+    """
+    canonical = json.dumps(
+        {
+            "query": sentinel_product_request.query,
+            "rows": sentinel_product_request.rows,
+            "order_by": sentinel_product_request.order_by,
+            "start": sentinel_product_request.start,
+            "username": sentinel_product_request.username,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+CacheEntry = Tuple[float, QuerySentinelProductsResponse]
+
+
+class CacheStats(NamedTuple):
+    """Counters of a MemoryCache. Expired entries count as misses and as
+    expirations, evictions only counts entries dropped to stay within max_entries"""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+
+
+class ResponseCache(ABC):
+    """Base class of the response caches a client can be given. Only successful
+    responses are cached."""
+
+    @abstractmethod
+    def get(
+        self, sentinel_product_request: SentinelProductRequest
+    ) -> Optional[QuerySentinelProductsResponse]:
+        """Looks up the cached response to the request
+
+        Args:
+            sentinel_product_request::SentinelProductRequest
+                Details regarding the request
+
+        Returns:
+            response::Optional[QuerySentinelProductsResponse]
+                The cached response, None if there is no fresh response cached
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def put(
+        self,
+        sentinel_product_request: SentinelProductRequest,
+        response: QuerySentinelProductsResponse,
+    ):
+        """Caches the response to the request if it was successful
+
+        Args:
+            sentinel_product_request::SentinelProductRequest
+                Details regarding the request
+
+            response::QuerySentinelProductsResponse
+                Response to the request
+        """
+        raise NotImplementedError()
+
+
+class DiskCache(ResponseCache):
+    """Persistent response cache keeping each response in its own zlib compressed
+    file in directory, so that repeated queries, even from other processes, are
+    read from local disk instead of the Sentinel Hub.
+
+    Entries expire ttl seconds after being written. When the files exceed max_bytes
+    the least recently used entries are evicted, the size of the files being tracked
+    as entries are written and removed so that the directory is only scanned when
+    over max_bytes. Entries are written atomically and read back through a memory
+    map, temporary files left behind by a writer that died are removed when the
+    directory is scanned.
+
+    Examples
+    ========
+    cache = DiskCache("~/.cache/sentinelpy", ttl=6 * 60 * 60)
+    client = SentinelHubClient(cache=cache)
+    """
+
+    __SUFFIX = ".cache"
+    __TEMPORARY_SUFFIX = ".tmp"
+    # Older temporary files were left behind by a writer that died, those of live
+    # writers are renamed into place within moments
+    __STALE_TEMPORARY_SECONDS = 3600.0
+    # Expiry time and status code, followed by the compressed body
+    __HEADER = struct.Struct("<dH")
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        ttl: float = 3600.0,
+        max_bytes: int = 256 * 1024 * 1024,
+        compression_level: int = 6,
+    ):
+        """
+        Args:
+            directory::str
+                Directory holding the cache, created if it does not exist
+
+            ttl::float
+                Seconds a response stays fresh, defaults to 3600.0
+
+            max_bytes::int
+                Maximum total size of the cached files, defaults to 256 MiB
+
+            compression_level::int
+                zlib compression level from 1 (fastest) to 9 (smallest), defaults
+                to 6
+
+        Raises:
+            ValueError - if ttl or max_bytes is not positive or compression_level is
+            not between 1 and 9
+        """
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        if not 1 <= compression_level <= 9:
+            raise ValueError("compression_level must be between 1 and 9")
+        self.__directory = os.path.expanduser(directory)
+        self.__ttl = ttl
+        self.__max_bytes = max_bytes
+        self.__compression_level = compression_level
+        self.__lock = threading.Lock()
+        os.makedirs(self.__directory, exist_ok=True)
+        self.__total_bytes = sum(size for _, size, _ in self.__scan())
+
+    @property
+    def directory(self) -> str:
+        """Directory holding the cache"""
+        return self.__directory
+
+    def get(
+        self, sentinel_product_request: SentinelProductRequest
+    ) -> Optional[QuerySentinelProductsResponse]:
+        path = self.__path(sentinel_product_request)
+        try:
+            with open(path, "rb") as entry_file, mmap.mmap(
+                entry_file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as entry, memoryview(entry) as view:
+                expires_at, status_code = DiskCache.__HEADER.unpack_from(view)
+                if expires_at <= time.time():
+                    raise EOFError("Cache entry expired")
+                body = decode_json(zlib.decompress(view[DiskCache.__HEADER.size :]))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError, struct.error, zlib.error):
+            # Expired, truncated or corrupt entries are dropped
+            self.__discard(path)
+            return None
+        # Touch the entry so that eviction is least recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return QuerySentinelProductsResponse(status_code, body)
+
+    def put(
+        self,
+        sentinel_product_request: SentinelProductRequest,
+        response: QuerySentinelProductsResponse,
+    ):
+        # success decodes a lazy response, so invalid json is never cached
+        if not response.success:
+            return
+        if isinstance(response, LazyQuerySentinelProductsResponse):
+            # Cached as received rather than encoded again
+            body = response.content
+        else:
+            body = json.dumps(response.body, separators=(",", ":")).encode()
+        content = DiskCache.__HEADER.pack(
+            time.time() + self.__ttl, response.status_code
+        ) + zlib.compress(body, self.__compression_level)
+        if len(content) > self.__max_bytes:
+            return
+        path = self.__path(sentinel_product_request)
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.__directory, suffix=DiskCache.__TEMPORARY_SUFFIX
+        )
+        try:
+            with os.fdopen(file_descriptor, "wb") as entry_file:
+                entry_file.write(content)
+            replaced_bytes = DiskCache.__size(path)
+            os.replace(temporary_path, path)
+        except BaseException:
+            DiskCache.__remove(temporary_path)
+            raise
+        with self.__lock:
+            self.__total_bytes += len(content) - replaced_bytes
+            if self.__total_bytes > self.__max_bytes:
+                self.__evict()
+
+    def clear(self):
+        """Removes every entry from the cache"""
+        with self.__lock:
+            for _, _, path in self.__scan():
+                DiskCache.__remove(path)
+            self.__total_bytes = 0
+
+    def __evict(self):
+        # Other processes sharing the directory are not tracked, so the total is
+        # taken from the directory itself before evicting
+        entries = self.__scan()
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.__max_bytes:
+                break
+            DiskCache.__remove(path)
+            total_bytes -= size
+        self.__total_bytes = total_bytes
+
+    def __scan(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        stale_before = time.time() - DiskCache.__STALE_TEMPORARY_SECONDS
+        with os.scandir(self.__directory) as directory_entries:
+            for entry in directory_entries:
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if entry.name.endswith(DiskCache.__SUFFIX):
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                elif (
+                    entry.name.endswith(DiskCache.__TEMPORARY_SUFFIX)
+                    and stat.st_mtime < stale_before
+                ):
+                    DiskCache.__remove(entry.path)
+        return entries
+
+    def __discard(self, path: str):
+        size = DiskCache.__size(path)
+        DiskCache.__remove(path)
+        with self.__lock:
+            self.__total_bytes = max(0, self.__total_bytes - size)
+
+    def __path(self, sentinel_product_request: SentinelProductRequest) -> str:
+        return os.path.join(
+            self.__directory, cache_key(sentinel_product_request) + DiskCache.__SUFFIX
+        )
+
+    @staticmethod
+    def __size(path: str) -> int:
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return 0
+
+    @staticmethod
+    def __remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class MemoryCache(ResponseCache):
+    """In process response cache keeping up to max_entries responses in memory, so
+    that repeated queries are answered without a network round trip.
+
+    Queries relative to NOW (e.g. ingestiondate:[NOW-1DAY TO NOW]) return different
+    results over time so cannot be cached on their text alone. Before a request is
+    looked up NOW is replaced with the start of the current now_bucket seconds long
+    time bucket, so that such queries are cached for at most now_bucket seconds.
+
+    Entries expire ttl seconds after being written and the least recently used
+    entries are evicted when there are more than max_entries. The cached response
+    is shared between callers and should not be modified.
+
+    Examples
+    ========
+    cache = MemoryCache(ttl=600.0, now_bucket=300.0)
+    set_default_client(SentinelHubClient(cache=cache))
+
+    response = query_sentinel_hub(request)
+    print(cache.stats.hits, cache.stats.misses)
+    """
+
+    # Only NOW itself is replaced, any date math after it (e.g. -1YEAR or /DAY) is
+    # kept and applied by the hub to the start of the bucket
+    __RELATIVE_DATE = re.compile(r"\bNOW\b")
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 300.0,
+        max_entries: int = 1024,
+        now_bucket: float = 300.0,
+    ):
+        """
+        Args:
+            ttl::float
+                Seconds a response stays fresh, defaults to 300.0
+
+            max_entries::int
+                Maximum number of responses kept, defaults to 1024
+
+            now_bucket::float
+                Granularity in seconds that NOW is rounded down to, defaults to
+                300.0 (5 minutes)
+
+        Raises:
+            ValueError - if ttl or now_bucket is not positive or max_entries is less
+            than 1
+        """
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if now_bucket <= 0:
+            raise ValueError("now_bucket must be positive")
+        self.__ttl = ttl
+        self.__max_entries = max_entries
+        self.__now_bucket = now_bucket
+        self.__lock = threading.Lock()
+        self.__entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__expirations = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit, miss, eviction and expiration counters and the number of entries"""
+        with self.__lock:
+            return CacheStats(
+                self.__hits,
+                self.__misses,
+                self.__evictions,
+                self.__expirations,
+                len(self.__entries),
+            )
+
+    def get(
+        self, sentinel_product_request: SentinelProductRequest
+    ) -> Optional[QuerySentinelProductsResponse]:
+        now = time.time()
+        key = self.__key(sentinel_product_request, now)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self.__entries[key]
+                self.__expirations += 1
+                entry = None
+            if entry is None:
+                self.__misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return entry[1]
+
+    def put(
+        self,
+        sentinel_product_request: SentinelProductRequest,
+        response: QuerySentinelProductsResponse,
+    ):
+        # success decodes a lazy response, so invalid json is never cached
+        if not response.success:
+            return
+        now = time.time()
+        key = self.__key(sentinel_product_request, now)
+        with self.__lock:
+            self.__entries[key] = (now + self.__ttl, response)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def clear(self):
+        """Removes every entry from the cache, the counters are kept"""
+        with self.__lock:
+            self.__entries.clear()
+
+    def __key(
+        self, sentinel_product_request: SentinelProductRequest, now: float
+    ) -> str:
+        bucket_start = datetime.fromtimestamp(
+            now - now % self.__now_bucket, timezone.utc
+        )
+        query = MemoryCache.__RELATIVE_DATE.sub(
+            f"{bucket_start:%Y-%m-%dT%H:%M:%S}Z", sentinel_product_request.query
+        )
+        return cache_key(sentinel_product_request._replace(query=query))
@@ -0,0 +1,303 @@
+"""Catalog module."""
+import itertools
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .query_sentinel_products_response import QuerySentinelProductsResponse
+from .request.value_formatters import format_date
+
+DateRange = Tuple[datetime, datetime]
+
+
+class ProductCatalog:
+    """Local SQLite catalog of product metadata, so that products already retrieved
+    from the Sentinel Hub can be looked up again without querying it.
+
+    Products are upserted by uuid in batches, each batch in its own transaction.
+    The platform, product type, begin and end position, ingestion date and relative
+    orbit of each product are indexed, the full feed entry is kept alongside them.
+    The database uses write-ahead logging, so it can be read by other processes
+    while it is being written to.
+
+    A catalog is thread safe.
+
+    Examples
+    ========
+    with ProductCatalog("products.db") as catalog:
+        catalog.upsert(query_sentinel_hub(request))
+        products = catalog.find(
+            platform_name=PlatformName.SENTINEL_1,
+            begin_position=(datetime(2020, 1, 1), datetime(2020, 2, 1)),
+        )
+    """
+
+    __COLUMNS = (
+        "uuid",
+        "identifier",
+        "platform_name",
+        "product_type",
+        "begin_position",
+        "end_position",
+        "ingestion_date",
+        "relative_orbit_number",
+        "entry",
+    )
+    __INDEXED_COLUMNS = __COLUMNS[2:8]
+    __DATE = re.compile(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(\d+))?Z$")
+
+    def __init__(self, path: str, *, batch_size: int = 500):
+        """
+        Args:
+            path::str
+                Path of the SQLite database, created if it does not exist, or
+                ":memory:" for a catalog that is not persisted
+
+            batch_size::int
+                Number of products written per transaction, defaults to 500
+
+        Raises:
+            ValueError - if batch_size is less than 1
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.__batch_size = batch_size
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(
+            os.path.expanduser(path), check_same_thread=False
+        )
+        with self.__lock, self.__connection:
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute("PRAGMA synchronous=NORMAL")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS products ("
+                "uuid TEXT PRIMARY KEY, "
+                "identifier TEXT, "
+                "platform_name TEXT, "
+                "product_type TEXT, "
+                "begin_position TEXT, "
+                "end_position TEXT, "
+                "ingestion_date TEXT, "
+                "relative_orbit_number INTEGER, "
+                "entry TEXT NOT NULL)"
+            )
+            for column in ProductCatalog.__INDEXED_COLUMNS:
+                self.__connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS products_{column} "
+                    f"ON products ({column})"
+                )
+
+    def upsert(
+        self, products: Union[QuerySentinelProductsResponse, Iterable[Dict[str, Any]]]
+    ) -> int:
+        """Adds products to the catalog, replacing products with the same uuid
+
+        Args:
+            products::Union[QuerySentinelProductsResponse, Iterable[Dict[str, Any]]]
+                A response whose products (feed entries) are added, or the products
+                themselves e.g. from iter_sentinel_products
+
+        Returns:
+            count::int
+                Number of products added or replaced
+
+        Raises:
+            QuerySentinelProductsError/IOError - if products is an unsuccessful
+            response
+        """
+        if isinstance(products, QuerySentinelProductsResponse):
+            products.raise_for_failure()
+            products = products.entries
+        statement = (
+            f"INSERT OR REPLACE INTO products ({', '.join(ProductCatalog.__COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(ProductCatalog.__COLUMNS))})"
+        )
+        rows = (ProductCatalog.__row(product) for product in products)
+        count = 0
+        while True:
+            batch = list(itertools.islice(rows, self.__batch_size))
+            if not batch:
+                return count
+            with self.__lock, self.__connection:
+                self.__connection.executemany(statement, batch)
+            count += len(batch)
+
+    def get(self, uuid: str) -> Optional[Dict[str, Any]]:
+        """Looks up a product by its uuid
+
+        Args:
+            uuid::str
+                The uuid (feed entry id) of the product
+
+        Returns:
+            product::Optional[Dict[str, Any]]
+                The product (feed entry), None if it is not in the catalog
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT entry FROM products WHERE uuid = ?", (uuid,)
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def find(
+        self,
+        *,
+        platform_name: Union[Enum, str, None] = None,
+        product_type: Union[Enum, str, None] = None,
+        relative_orbit_number: Optional[int] = None,
+        begin_position: Optional[DateRange] = None,
+        end_position: Optional[DateRange] = None,
+        ingestion_date: Optional[DateRange] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Finds the products matching every filter given, ordered by begin position
+
+        Args:
+            platform_name::Union[Enum, str, None]
+                Platform the product was acquired by e.g. PlatformName.SENTINEL_1
+
+            product_type::Union[Enum, str, None]
+                Type of the product e.g. Sentinel1ProductType.GRD
+
+            relative_orbit_number::Optional[int]
+                Relative orbit the product was acquired on
+
+            begin_position::Optional[Tuple[datetime, datetime]]
+                Inclusive range the sensing start must be within, naive datetimes
+                are treated as UTC
+
+            end_position::Optional[Tuple[datetime, datetime]]
+                Inclusive range the sensing end must be within
+
+            ingestion_date::Optional[Tuple[datetime, datetime]]
+                Inclusive range the ingestion date must be within
+
+            limit::Optional[int]
+                Maximum number of products returned, defaults to None (no limit)
+
+        Returns:
+            products::List[Dict[str, Any]]
+                The matching products (feed entries)
+        """
+        where, parameters = ProductCatalog.__where(
+            platform_name,
+            product_type,
+            relative_orbit_number,
+            begin_position,
+            end_position,
+            ingestion_date,
+        )
+        statement = f"SELECT entry FROM products{where} ORDER BY begin_position, uuid"
+        if limit is not None:
+            statement += " LIMIT ?"
+            parameters.append(limit)
+        with self.__lock:
+            rows = self.__connection.execute(statement, parameters).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(
+        self,
+        *,
+        platform_name: Union[Enum, str, None] = None,
+        product_type: Union[Enum, str, None] = None,
+        relative_orbit_number: Optional[int] = None,
+        begin_position: Optional[DateRange] = None,
+        end_position: Optional[DateRange] = None,
+        ingestion_date: Optional[DateRange] = None,
+    ) -> int:
+        """Counts the products matching every filter given
+
+        Args:
+            As find
+
+        Returns:
+            count::int
+                Number of matching products
+        """
+        where, parameters = ProductCatalog.__where(
+            platform_name,
+            product_type,
+            relative_orbit_number,
+            begin_position,
+            end_position,
+            ingestion_date,
+        )
+        with self.__lock:
+            return self.__connection.execute(
+                f"SELECT COUNT(*) FROM products{where}", parameters
+            ).fetchone()[0]
+
+    def close(self):
+        """Closes the database"""
+        with self.__lock:
+            self.__connection.close()
+
+    def __enter__(self) -> "ProductCatalog":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def __where(
+        platform_name: Union[Enum, str, None],
+        product_type: Union[Enum, str, None],
+        relative_orbit_number: Optional[int],
+        begin_position: Optional[DateRange],
+        end_position: Optional[DateRange],
+        ingestion_date: Optional[DateRange],
+    ) -> Tuple[str, List[Any]]:
+        conditions = []
+        parameters: List[Any] = []
+        for column, value in (
+            ("platform_name", platform_name),
+            ("product_type", product_type),
+            ("relative_orbit_number", relative_orbit_number),
+        ):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value.value if isinstance(value, Enum) else value)
+        for column, date_range in (
+            ("begin_position", begin_position),
+            ("end_position", end_position),
+            ("ingestion_date", ingestion_date),
+        ):
+            if date_range is not None:
+                conditions.append(f"{column} BETWEEN ? AND ?")
+                parameters.extend(format_date(value) for value in date_range)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, parameters
+
+    @staticmethod
+    def __row(product: Dict[str, Any]) -> Sequence[Any]:
+        fields = {}
+        for field_type in ("str", "int", "date"):
+            values = product.get(field_type, [])
+            for value in values if isinstance(values, list) else [values]:
+                fields[value.get("name")] = value.get("content")
+        relative_orbit_number = fields.get("relativeorbitnumber")
+        return (
+            product.get("id") or fields.get("uuid"),
+            product.get("title") or fields.get("identifier"),
+            fields.get("platformname"),
+            fields.get("producttype"),
+            ProductCatalog.__normalise_date(fields.get("beginposition")),
+            ProductCatalog.__normalise_date(fields.get("endposition")),
+            ProductCatalog.__normalise_date(fields.get("ingestiondate")),
+            None if relative_orbit_number is None else int(relative_orbit_number),
+            json.dumps(product, separators=(",", ":")),
+        )
+
+    @staticmethod
+    def __normalise_date(value: Optional[str]) -> Optional[str]:
+        # The hub drops trailing zeros of the milliseconds, which are padded so that
+        # dates compare in time order as text
+        match = None if value is None else ProductCatalog.__DATE.match(value)
+        if match is None:
+            return value
+        return f"{match.group(1)}.{(match.group(2) or '').ljust(3, '0')[:3]}Z"
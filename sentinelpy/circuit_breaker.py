@@ -0,0 +1,189 @@
+"""Circuit breaker module."""
+import threading
+import time
+from enum import Enum
+from typing import FrozenSet
+
+from .query_sentinel_products_response import QuerySentinelProductsResponse
+from .retry import is_transient_failure
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops queries being sent to the Sentinel Hub while it is failing, so that
+    callers fail fast instead of waiting on a dead connection.
+
+    The breaker starts closed and opens after failure_threshold consecutive queries
+    fail, i.e. the hub could not be reached or responded with one of the failure
+    status codes. While open, queries fail immediately with a CircuitOpenError.
+    After recovery_timeout seconds the breaker is half open and lets
+    half_open_max_calls trial queries through: if they succeed it closes, if one
+    fails it opens again.
+
+    A breaker is thread safe and can be shared by several clients.
+
+    Examples
+    ========
+    circuit_breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=30.0)
+    client = SentinelHubClient(circuit_breaker=circuit_breaker)
+
+    response = client.query(request)
+    if isinstance(response.error, CircuitOpenError):
+        print(f"Hub unavailable, breaker is {circuit_breaker.state.value}")
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        failure_status_codes: FrozenSet[int] = frozenset({500, 502, 503, 504}),
+    ):
+        """
+        Args:
+            failure_threshold::int
+                Number of consecutive failed queries that opens the breaker,
+                defaults to 5
+
+            recovery_timeout::float
+                Seconds the breaker stays open before letting trial queries
+                through, defaults to 30.0
+
+            half_open_max_calls::int
+                Number of trial queries let through at once while half open,
+                defaults to 1
+
+            failure_status_codes::FrozenSet[int]
+                Status codes counted as failures, defaults to 500, 502, 503 and 504
+
+        Raises:
+            ValueError - if failure_threshold or half_open_max_calls is less than 1
+            or recovery_timeout is negative
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        if recovery_timeout < 0:
+            raise ValueError("recovery_timeout must not be negative")
+        if half_open_max_calls < 1:
+            raise ValueError("half_open_max_calls must be at least 1")
+        self.__failure_threshold = failure_threshold
+        self.__recovery_timeout = recovery_timeout
+        self.__half_open_max_calls = half_open_max_calls
+        self.__failure_status_codes = failure_status_codes
+        self.__lock = threading.Lock()
+        self.__state = CircuitState.CLOSED
+        self.__failure_count = 0
+        self.__opened_at = 0.0
+        self.__trial_calls = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state of the breaker"""
+        with self.__lock:
+            self.__half_open_if_recovered()
+            return self.__state
+
+    @property
+    def failure_count(self) -> int:
+        """Number of consecutive failed queries"""
+        return self.__failure_count
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until the breaker lets trial queries through, 0.0 unless open"""
+        with self.__lock:
+            if self.__state is not CircuitState.OPEN:
+                return 0.0
+            elapsed = time.monotonic() - self.__opened_at
+            return max(0.0, self.__recovery_timeout - elapsed)
+
+    def allow_request(self) -> bool:
+        """Whether a query may be sent now. A query that is allowed must be followed
+        by a call to record once it completes.
+
+        Returns:
+            allowed::bool
+                True if the breaker is closed or a trial query is let through
+        """
+        with self.__lock:
+            self.__half_open_if_recovered()
+            if self.__state is CircuitState.CLOSED:
+                return True
+            if (
+                self.__state is CircuitState.HALF_OPEN
+                and self.__trial_calls < self.__half_open_max_calls
+            ):
+                self.__trial_calls += 1
+                return True
+            return False
+
+    def is_failure(self, response: QuerySentinelProductsResponse) -> bool:
+        """Whether the response counts as a failure of the hub
+
+        Args:
+            response::QuerySentinelProductsResponse
+                Result of a query
+
+        Returns:
+            failure::bool
+                True if the hub could not be reached or responded with a failure
+                status code
+        """
+        return is_transient_failure(response, self.__failure_status_codes)
+
+    def record(self, response: QuerySentinelProductsResponse):
+        """Records the result of a query that was allowed
+
+        Args:
+            response::QuerySentinelProductsResponse
+                Result of the query
+        """
+        if self.is_failure(response):
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def record_success(self):
+        """Records a query that reached the hub, closing the breaker"""
+        with self.__lock:
+            self.__state = CircuitState.CLOSED
+            self.__failure_count = 0
+            self.__trial_calls = 0
+
+    def record_failure(self):
+        """Records a failed query, opening the breaker if it was a trial query or
+        failure_threshold consecutive queries have failed"""
+        with self.__lock:
+            self.__failure_count += 1
+            if (
+                self.__state is CircuitState.HALF_OPEN
+                or self.__failure_count >= self.__failure_threshold
+            ):
+                self.__state = CircuitState.OPEN
+                self.__opened_at = time.monotonic()
+                self.__trial_calls = 0
+
+    def record_cancelled(self):
+        """Records a query that was allowed but abandoned before it completed,
+        neither a success nor a failure"""
+        with self.__lock:
+            if self.__state is CircuitState.HALF_OPEN and self.__trial_calls > 0:
+                self.__trial_calls -= 1
+
+    def reset(self):
+        """Closes the breaker and forgets previous failures"""
+        self.record_success()
+
+    def __half_open_if_recovered(self):
+        if (
+            self.__state is CircuitState.OPEN
+            and time.monotonic() - self.__opened_at >= self.__recovery_timeout
+        ):
+            self.__state = CircuitState.HALF_OPEN
+            self.__trial_calls = 0
@@ -0,0 +1,559 @@
+"""Client module."""
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import ResponseCache
+from .circuit_breaker import CircuitBreaker
+from .endpoints import EndpointPool
+from .exceptions import CircuitOpenError, QuerySentinelProductsError
+from .json_decoder import decode_json
+from .projection import project_response
+from .query_sentinel_products_response import (
+    LazyQuerySentinelProductsResponse,
+    QuerySentinelProductsResponse,
+)
+from .rate_limit import RateLimiter
+from .raw_sentinel_products_response import RawSentinelProductsResponse
+from .request.model import SentinelProductRequest
+from .retry import RetryPolicy
+from .single_flight import SingleFlight
+from .streaming import iter_feed_entries
+
+SENTINEL_HUB_BASE_URL = "https://scihub.copernicus.eu/dhus"
+SENTINEL_HUB_MAX_ROWS = 100
+
+T = TypeVar("T")
+
+
+def build_query_url(
+    sentinel_product_request: SentinelProductRequest, base_url: Optional[str] = None
+) -> str:
+    """Builds the Sentinel Hub search url for the request
+
+    Args:
+        sentinel_product_request::SentinelProductRequest
+            Details regarding the request
+
+        base_url::Optional[str]
+            Base url of the endpoint to query, defaults to the Sentinel Hub
+
+    Returns:
+        url::str
+            The url to query, requesting the results as json
+    """
+    query_params = {
+        "q": sentinel_product_request.query,
+        "start": sentinel_product_request.start,
+        "format": "json",
+    }
+
+    if sentinel_product_request.rows is not None:
+        query_params["rows"] = sentinel_product_request.rows
+
+    if sentinel_product_request.order_by is not None:
+        query_params["orderby"] = sentinel_product_request.order_by
+
+    if base_url is None:
+        base_url = SENTINEL_HUB_BASE_URL
+    return f"{base_url.rstrip('/')}/search?{urlencode(query_params)}"
+
+
+def create_endpoint_pool(
+    base_url: Optional[str], endpoints: Optional[EndpointPool]
+) -> EndpointPool:
+    """Creates the endpoint pool of a client from its arguments
+
+    Args:
+        base_url::Optional[str]
+            Base url of the single endpoint to query
+
+        endpoints::Optional[EndpointPool]
+            Endpoints to spread queries over
+
+    Returns:
+        endpoints::EndpointPool
+            endpoints if given, otherwise a pool of base_url or the Sentinel Hub
+
+    Raises:
+        ValueError - if both base_url and endpoints are given
+    """
+    if endpoints is not None:
+        if base_url is not None:
+            raise ValueError("Only one of base_url and endpoints can be given")
+        return endpoints
+    return EndpointPool([SENTINEL_HUB_BASE_URL if base_url is None else base_url])
+
+
+def decode_response_content(
+    status_code: int, content: bytes, *, lazy: bool = False
+) -> QuerySentinelProductsResponse:
+    """Decodes the raw json content of a Sentinel Hub response with the current json
+    decoder, see set_json_decoder
+
+    Args:
+        status_code::int
+            HTTP status code of the response
+        content::bytes
+            Body of the response
+        lazy::bool
+            Whether to only decode the body when it is first read, see
+            LazyQuerySentinelProductsResponse, defaults to False
+
+    Returns:
+        result::QuerySentinelProductsResponse
+            Result holding the decoded body, or a QuerySentinelProductsError if
+            the content is not valid json
+    """
+    if lazy:
+        return LazyQuerySentinelProductsResponse(status_code, content)
+    try:
+        return QuerySentinelProductsResponse(status_code, decode_json(content))
+    except ValueError as json_error:
+        return QuerySentinelProductsResponse(
+            status_code,
+            None,
+            QuerySentinelProductsError(
+                json_error, status_code, content.decode(errors="replace")
+            ),
+        )
+
+
+class SentinelHubClient:
+    """Client for the Sentinel Hub API that keeps a pool of keep-alive
+    connections open between queries, so that repeated queries do not pay for a
+    new TCP/TLS handshake each time.
+
+    The client is safe to share between threads and should be closed when no
+    longer required, either by calling `close` or using it as a context manager.
+
+    Examples
+    ========
+    with SentinelHubClient(pool_size=20) as client:
+        first_page = client.query(request)
+        second_page = client.query(request._replace(start=100))
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: Optional[str] = None,
+        endpoints: Optional[EndpointPool] = None,
+        pool_size: int = 10,
+        timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce: bool = False,
+        lazy_decoding: bool = False,
+    ):
+        """
+        Args:
+            base_url::Optional[str]
+                Base url of the endpoint to query, e.g. a mirror of the hub,
+                defaults to https://scihub.copernicus.eu/dhus
+
+            endpoints::Optional[EndpointPool]
+                Compatible endpoints to spread queries over, failing over between
+                them, instead of base_url
+
+            pool_size::int
+                Maximum number of connections kept open to each host, should be at
+                least the number of threads sharing the client. Defaults to 10
+
+            timeout::Optional[float]
+                Seconds to wait to connect to the hub and between bytes of its
+                response, a query that takes longer fails with a requests Timeout
+                error, defaults to None (no timeout)
+
+            retry_policy::Optional[RetryPolicy]
+                Policy for retrying queries that fail with a transient error,
+                defaults to None (no retries)
+
+            rate_limiter::Optional[RateLimiter]
+                Limits the rate at which queries, including retries, are sent,
+                defaults to None (no limit)
+
+            circuit_breaker::Optional[CircuitBreaker]
+                Fails queries fast while the hub is failing, with a CircuitOpenError
+                as the error of the response, defaults to None (always query)
+
+            cache::Optional[ResponseCache]
+                Cache serving repeated queries without querying the hub, e.g. a
+                DiskCache, defaults to None (no caching)
+
+            coalesce::bool
+                Whether concurrent threads making an identical query share a single
+                query to the hub, defaults to False
+
+            lazy_decoding::bool
+                Whether the body of each response is only decoded when it is first
+                read, returning LazyQuerySentinelProductsResponses, defaults to False
+
+        Raises:
+            ValueError - if pool_size is less than 1, retry_policy max_attempts is
+            less than 1 or both base_url and endpoints are given
+        """
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.__endpoints = create_endpoint_pool(base_url, endpoints)
+        if retry_policy is not None and retry_policy.max_attempts < 1:
+            raise ValueError("retry_policy max_attempts must be at least 1")
+        self.__retry_policy = retry_policy
+        self.__rate_limiter = rate_limiter
+        self.__circuit_breaker = circuit_breaker
+        self.__cache = cache
+        self.__single_flight = SingleFlight() if coalesce else None
+        self.__lazy_decoding = lazy_decoding
+        self.__timeout = timeout
+        self.__session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.__session.mount("https://", adapter)
+        self.__session.mount("http://", adapter)
+
+    def query(
+        self,
+        sentinel_product_request: SentinelProductRequest,
+        *,
+        fields: Optional[Iterable[str]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> QuerySentinelProductsResponse:
+        """Queries the Sentinel Hub for the information in the request.
+
+        Args:
+            sentinel_product_request::SentinelProductRequest
+                Details regarding the request
+
+            fields::Optional[Iterable[str]]
+                Names of the fields to keep of each product, e.g. footprint, see
+                project_entry, defaults to None (keep every field)
+
+            logger::Optional[logging.Logger]
+                Logger to log information and error message defaults to None
+
+        Returns:
+            result::QuerySentinelProductsResponse
+                Result of the query
+        """
+        if logger is None:
+            logger = logging.getLogger(__name__)
+        if self.__cache is not None:
+            cached = self.__cache.get(sentinel_product_request)
+            if cached is not None:
+                logger.info("Serving response from cache")
+                return project_response(cached, fields)
+        if self.__single_flight is None:
+            result = self.__query_decoded(sentinel_product_request, logger)
+        else:
+            result = self.__single_flight.do(
+                sentinel_product_request,
+                lambda: self.__query_decoded(sentinel_product_request, logger),
+            )
+        return project_response(result, fields)
+
+    def query_raw(
+        self,
+        sentinel_product_request: SentinelProductRequest,
+        *,
+        logger: Optional[logging.Logger] = None,
+    ) -> RawSentinelProductsResponse:
+        """Queries the Sentinel Hub for the information in the request without
+        decoding the response, for consumers that pass the body on untouched, e.g.
+        to a sink. Queries are retried, rate limited and failed over as by query but
+        are not cached.
+
+        Args:
+            sentinel_product_request::SentinelProductRequest
+                Details regarding the request
+
+            logger::Optional[logging.Logger]
+                Logger to log information and error message defaults to None
+
+        Returns:
+            result::RawSentinelProductsResponse
+                Status, headers and undecoded body of the response
+        """
+        if logger is None:
+            logger = logging.getLogger(__name__)
+        if self.__single_flight is None:
+            return self.__query(sentinel_product_request, logger)
+        return self.__single_flight.do(
+            ("raw", sentinel_product_request),
+            lambda: self.__query(sentinel_product_request, logger),
+        )
+
+    def stream(
+        self,
+        sentinel_product_request: SentinelProductRequest,
+        *,
+        chunk_size: int = 64 * 1024,
+        fields: Optional[Iterable[str]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Queries the Sentinel Hub for the information in the request, yielding
+        each product (feed entry) as soon as it has been read from the response
+        rather than once the whole response has been read and decoded. Lowers the
+        memory used and the time to the first product on large pages.
+
+        Queries are rate limited, guarded by the circuit breaker and sent to the
+        best endpoint, failing over until one responds successfully, as by query.
+        They are not retried, cached or coalesced as products may already have
+        been yielded when a query fails.
+
+        Args:
+            sentinel_product_request::SentinelProductRequest
+                Details regarding the request
+
+            chunk_size::int
+                Number of bytes read from the response at a time, defaults to 64 KiB
+
+            fields::Optional[Iterable[str]]
+                Names of the fields to keep of each product, e.g. footprint, the
+                rest are dropped as each product is parsed, see project_entry.
+                Defaults to None (keep every field)
+
+            logger::Optional[logging.Logger]
+                Logger to log information and error message defaults to None
+
+        Returns:
+            entries::Iterator[Dict[str, Any]]
+                The products (feed entries) of the response
+
+        Raises:
+            QuerySentinelProductsError - if the hub responded with an unsuccessful
+            status code or invalid json
+            IOError - if the hub could not be reached
+            CircuitOpenError - if the circuit breaker is open
+            ValueError - if chunk_size is less than 1
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        if logger is None:
+            logger = logging.getLogger(__name__)
+        return self.__stream(sentinel_product_request, chunk_size, fields, logger)
+
+    def close(self):
+        """Closes the pooled connections held by the client"""
+        self.__session.close()
+
+    def __enter__(self) -> "SentinelHubClient":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __query_decoded(
+        self, sentinel_product_request: SentinelProductRequest, logger: logging.Logger
+    ) -> QuerySentinelProductsResponse:
+        result = self.__decode(self.__query(sentinel_product_request, logger))
+        if self.__cache is not None:
+            self.__cache.put(sentinel_product_request, result)
+        return result
+
+    def __query(
+        self, sentinel_product_request: SentinelProductRequest, logger: logging.Logger
+    ) -> RawSentinelProductsResponse:
+        attempt = 1
+        while True:
+            result = self.__attempt(sentinel_product_request, logger)
+            delay = (
+                None
+                if self.__retry_policy is None
+                else self.__retry_policy.next_delay(
+                    attempt,
+                    SentinelHubClient.__outcome(result),
+                    result.headers.get("Retry-After"),
+                )
+            )
+            if delay is None:
+                return result
+            logger.warning(
+                f"Attempt {attempt} to query Sentinel hub failed, retrying in "
+                f"{delay:.2f}s"
+            )
+            time.sleep(delay)
+            attempt += 1
+
+    def __attempt(
+        self, sentinel_product_request: SentinelProductRequest, logger: logging.Logger
+    ) -> RawSentinelProductsResponse:
+        try:
+            return self.__guard(
+                lambda base_url: self.__send(
+                    sentinel_product_request, base_url, logger
+                ),
+                SentinelHubClient.__outcome,
+                logger,
+            )
+        except CircuitOpenError as open_error:
+            return RawSentinelProductsResponse(None, {}, None, open_error)
+
+    def __guard(
+        self,
+        send: Callable[[str], T],
+        outcome_of: Callable[[T], QuerySentinelProductsResponse],
+        logger: logging.Logger,
+    ) -> T:
+        circuit_breaker = self.__circuit_breaker
+        if circuit_breaker is not None and not circuit_breaker.allow_request():
+            logger.warning("Circuit breaker is open, not querying Sentinel hub")
+            raise CircuitOpenError(circuit_breaker.retry_after)
+        try:
+            result = self.__fail_over(send, outcome_of, logger)
+        except BaseException:
+            if circuit_breaker is not None:
+                circuit_breaker.record_cancelled()
+            raise
+        if circuit_breaker is not None:
+            circuit_breaker.record(outcome_of(result))
+        return result
+
+    def __fail_over(
+        self,
+        send: Callable[[str], T],
+        outcome_of: Callable[[T], QuerySentinelProductsResponse],
+        logger: logging.Logger,
+    ) -> T:
+        tried = []
+        base_url = self.__endpoints.select()
+        while base_url is not None:
+            started = time.monotonic()
+            result = send(base_url)
+            outcome = outcome_of(result)
+            self.__endpoints.record(base_url, time.monotonic() - started, outcome)
+            tried.append(base_url)
+            if not self.__endpoints.is_failure(outcome):
+                break
+            base_url = self.__endpoints.select(exclude=tried)
+            if base_url is not None:
+                logger.warning(
+                    f"Query to {tried[-1]} failed, failing over to {base_url}"
+                )
+        return result
+
+    def __send(
+        self,
+        sentinel_product_request: SentinelProductRequest,
+        base_url: str,
+        logger: logging.Logger,
+    ) -> RawSentinelProductsResponse:
+        if self.__rate_limiter is not None:
+            self.__rate_limiter.acquire()
+        try:
+            response = self.__call_api(sentinel_product_request, base_url, logger)
+            logger.info(
+                "Received response from Sentinel hub with status: "
+                f"{response.status_code}"
+            )
+            return RawSentinelProductsResponse(
+                response.status_code, response.headers, response.content
+            )
+        except IOError as request_exception:
+            return RawSentinelProductsResponse(None, {}, None, request_exception)
+
+    def __stream(
+        self,
+        sentinel_product_request: SentinelProductRequest,
+        chunk_size: int,
+        fields: Optional[Iterable[str]],
+        logger: logging.Logger,
+    ) -> Iterator[Dict[str, Any]]:
+        result, response = self.__guard(
+            lambda base_url: self.__send_streamed(
+                sentinel_product_request, base_url, logger
+            ),
+            lambda sent: SentinelHubClient.__outcome(sent[0]),
+            logger,
+        )
+        if response is None:
+            if result.error is not None:
+                raise result.error
+            raise QuerySentinelProductsError(
+                IOError(f"Sentinel Hub responded with status: {result.status_code}"),
+                result.status_code,
+                (result.content or b"").decode(errors="replace"),
+            )
+        try:
+            try:
+                yield from iter_feed_entries(
+                    response.iter_content(chunk_size), fields=fields
+                )
+            except ValueError as json_error:
+                raise QuerySentinelProductsError(
+                    json_error, response.status_code, ""
+                ) from json_error
+        finally:
+            response.close()
+
+    def __send_streamed(
+        self,
+        sentinel_product_request: SentinelProductRequest,
+        base_url: str,
+        logger: logging.Logger,
+    ) -> Tuple[RawSentinelProductsResponse, Optional[requests.Response]]:
+        if self.__rate_limiter is not None:
+            self.__rate_limiter.acquire()
+        try:
+            response = self.__call_api(
+                sentinel_product_request, base_url, logger, stream=True
+            )
+        except IOError as request_exception:
+            return RawSentinelProductsResponse(None, {}, None, request_exception), None
+        logger.info(
+            f"Received response from Sentinel hub with status: {response.status_code}"
+        )
+        if 200 <= response.status_code < 300:
+            # The body is left unread, to be streamed
+            return (
+                RawSentinelProductsResponse(
+                    response.status_code, response.headers, b""
+                ),
+                response,
+            )
+        try:
+            return (
+                RawSentinelProductsResponse(
+                    response.status_code, response.headers, response.content
+                ),
+                None,
+            )
+        finally:
+            response.close()
+
+    def __call_api(
+        self,
+        sentinel_product_request: SentinelProductRequest,
+        base_url: Optional[str],
+        logger: logging.Logger,
+        *,
+        stream: bool = False,
+    ) -> requests.Response:
+        logger.debug(f"Querying sentinel hub with request: {sentinel_product_request}")
+        url = build_query_url(sentinel_product_request, base_url)
+        auth = (sentinel_product_request.username, sentinel_product_request.password)
+        logger.debug(f"Constructed url: {url}")
+        if stream:
+            return self.__session.get(
+                url, auth=auth, timeout=self.__timeout, stream=True
+            )
+        return self.__session.get(url, auth=auth, timeout=self.__timeout)
+
+    def __decode(
+        self, result: RawSentinelProductsResponse
+    ) -> QuerySentinelProductsResponse:
+        if result.status_code is None or result.content is None:
+            return QuerySentinelProductsResponse(result.status_code, None, result.error)
+        return decode_response_content(
+            result.status_code, result.content, lazy=self.__lazy_decoding
+        )
+
+    @staticmethod
+    def __outcome(result: RawSentinelProductsResponse) -> QuerySentinelProductsResponse:
+        # Retries, failover and the circuit breaker only depend on the status code
+        # and error, so are decided without decoding the body
+        return QuerySentinelProductsResponse(result.status_code, None, result.error)
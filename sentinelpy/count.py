@@ -0,0 +1,117 @@
+"""Count module."""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Union
+
+from .client import SentinelHubClient
+from .exceptions import QuerySentinelProductsError
+from .main import default_client
+from .request.model import SentinelProductRequest
+from .request.request_query_builder import RequestQueryBuilder
+from .request.sentinel_product_request_builder import SentinelProductRequestBuilder
+
+
+def count_sentinel_products(
+    sentinel_product_request: SentinelProductRequest,
+    *,
+    client: Optional[SentinelHubClient] = None,
+    logger: Optional[logging.Logger] = None,
+) -> int:
+    """Counts the products matching the request without retrieving them, by asking
+    the Sentinel Hub for zero rows and reading `opensearch:totalResults`.
+
+    Args:
+        sentinel_product_request::SentinelProductRequest
+            Details regarding the request, rows, start and order_by are ignored
+
+        client::Optional[SentinelHubClient]
+            Client to query with, defaults to the shared client
+
+        logger::Optional[logging.Logger]
+            Logger to log information and error message defaults to None
+
+    Returns:
+        count::int
+            Number of products matching the query
+
+    Raises:
+        QuerySentinelProductsError/IOError - if the count could not be retrieved
+    """
+    if client is None:
+        client = default_client()
+    response = client.query(
+        sentinel_product_request._replace(rows=0, start=0, order_by=None),
+        logger=logger,
+    )
+    response.raise_for_failure()
+    total_results = response.total_results
+    if total_results is None:
+        raise QuerySentinelProductsError(
+            ValueError("Sentinel Hub response did not contain the total results"),
+            response.status_code,
+            str(response.body),
+        )
+    return total_results
+
+
+def count_sentinel_products_batch(
+    queries: Iterable[Union[str, RequestQueryBuilder]],
+    *,
+    username: str,
+    password: str,
+    client: Optional[SentinelHubClient] = None,
+    max_workers: int = 8,
+    logger: Optional[logging.Logger] = None,
+) -> List[int]:
+    """Counts the products matching each of the queries, in parallel over a shared
+    client.
+
+    Args:
+        queries::Iterable[Union[str, RequestQueryBuilder]]
+            The queries to count, a RequestQueryBuilder is built before querying
+
+        username::str
+            The username for the Sentinel Hub API
+
+        password::str
+            The password for the Sentinel Hub API
+
+        client::Optional[SentinelHubClient]
+            Client to query with, defaults to the shared client. Its pool_size
+            should be at least max_workers
+
+        max_workers::int
+            Maximum number of counts in flight at once, defaults to 8
+
+        logger::Optional[logging.Logger]
+            Logger to log information and error message defaults to None
+
+    Returns:
+        counts::List[int]
+            Number of products matching each query, in the order of the queries
+
+    Raises:
+        QuerySentinelProductsError/IOError - if a count could not be retrieved
+        ValueError - if username or password missing or max_workers less than 1
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    if client is None:
+        client = default_client()
+    sentinel_product_requests = [
+        SentinelProductRequestBuilder()
+        .with_username(username)
+        .with_password(password)
+        .with_query(query)
+        .build()
+        for query in queries
+    ]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(
+                lambda sentinel_product_request: count_sentinel_products(
+                    sentinel_product_request, client=client, logger=logger
+                ),
+                sentinel_product_requests,
+            )
+        )
@@ -0,0 +1,187 @@
+"""Endpoints module."""
+import threading
+import time
+from typing import Collection, Dict, FrozenSet, List, NamedTuple, Optional, Sequence
+
+from .query_sentinel_products_response import QuerySentinelProductsResponse
+from .retry import is_transient_failure
+
+
+class EndpointStats(NamedTuple):
+    """Health of an endpoint as tracked by an EndpointPool. latency is the moving
+    average in seconds of successful queries, None until one has succeeded, and
+    error_rate the moving average of the fraction of queries that failed"""
+
+    base_url: str
+    latency: Optional[float]
+    error_rate: float
+    requests: int
+    healthy: bool
+
+
+class EndpointPool:
+    """A set of compatible OpenSearch endpoints (the Sentinel Hub and its mirrors)
+    that queries are spread over. Each query is sent to the fastest healthy
+    endpoint, judged by an exponentially weighted moving average of its latency and
+    error rate. A query that fails is sent on to the next best endpoint.
+
+    An endpoint is unhealthy while its error rate is at least max_error_rate. An
+    unhealthy endpoint is only tried once every probe_interval seconds, or when every
+    endpoint is unhealthy, so that it is used again once it recovers.
+
+    A pool is thread safe and can be shared by several clients.
+
+    Examples
+    ========
+    endpoints = EndpointPool(
+        [
+            "https://scihub.copernicus.eu/dhus",
+            "https://mirror.example.com/dhus",
+        ]
+    )
+    client = SentinelHubClient(endpoints=endpoints)
+    """
+
+    def __init__(
+        self,
+        base_urls: Sequence[str],
+        *,
+        smoothing: float = 0.2,
+        max_error_rate: float = 0.5,
+        probe_interval: float = 30.0,
+        failure_status_codes: FrozenSet[int] = frozenset({500, 502, 503, 504}),
+    ):
+        """
+        Args:
+            base_urls::Sequence[str]
+                Base urls of the endpoints, the search url of each is
+                {base_url}/search e.g. https://scihub.copernicus.eu/dhus. Ties are
+                broken in this order
+
+            smoothing::float
+                Weight of the latest query in the moving averages, between 0
+                (exclusive) and 1, defaults to 0.2
+
+            max_error_rate::float
+                Error rate at which an endpoint is unhealthy, defaults to 0.5
+
+            probe_interval::float
+                Seconds between trying an unhealthy endpoint, defaults to 30.0
+
+            failure_status_codes::FrozenSet[int]
+                Status codes counted as failures, defaults to 500, 502, 503 and 504
+
+        Raises:
+            ValueError - if base_urls is empty or contains duplicates or smoothing
+            is not within (0, 1]
+        """
+        if not base_urls:
+            raise ValueError("base_urls must not be empty")
+        if len(set(base_urls)) != len(base_urls):
+            raise ValueError("base_urls must not contain duplicates")
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be greater than 0 and at most 1")
+        self.__smoothing = smoothing
+        self.__max_error_rate = max_error_rate
+        self.__probe_interval = probe_interval
+        self.__failure_status_codes = failure_status_codes
+        self.__lock = threading.Lock()
+        self.__stats: Dict[str, EndpointStats] = {
+            base_url: EndpointStats(base_url, None, 0.0, 0, True)
+            for base_url in base_urls
+        }
+        self.__last_attempt: Dict[str, float] = {}
+
+    @property
+    def base_urls(self) -> List[str]:
+        """Base urls of the endpoints"""
+        return list(self.__stats)
+
+    @property
+    def stats(self) -> List[EndpointStats]:
+        """Current health of each endpoint, in the order of base_urls"""
+        with self.__lock:
+            return list(self.__stats.values())
+
+    def select(self, exclude: Collection[str] = ()) -> Optional[str]:
+        """Chooses the endpoint to send the next query to
+
+        Args:
+            exclude::Collection[str]
+                Base urls not to choose, e.g. those already tried for the query
+
+        Returns:
+            base_url::Optional[str]
+                The fastest healthy endpoint, endpoints that have not been queried
+                yet are tried first. None if every endpoint is excluded
+        """
+        with self.__lock:
+            candidates = [
+                stats
+                for stats in self.__stats.values()
+                if stats.base_url not in exclude
+            ]
+            if not candidates:
+                return None
+            now = time.monotonic()
+            eligible = [
+                stats
+                for stats in candidates
+                if stats.healthy
+                or now - self.__last_attempt.get(stats.base_url, now)
+                >= self.__probe_interval
+            ]
+            selected = min(
+                eligible or candidates,
+                key=lambda stats: stats.latency if stats.latency is not None else 0.0,
+            )
+            self.__last_attempt[selected.base_url] = now
+            return selected.base_url
+
+    def is_failure(self, response: QuerySentinelProductsResponse) -> bool:
+        """Whether the response counts as a failure of the endpoint
+
+        Args:
+            response::QuerySentinelProductsResponse
+                Result of a query
+
+        Returns:
+            failure::bool
+                True if the endpoint could not be reached or responded with a
+                failure status code
+        """
+        return is_transient_failure(response, self.__failure_status_codes)
+
+    def record(
+        self, base_url: str, latency: float, response: QuerySentinelProductsResponse
+    ):
+        """Records the result of a query sent to an endpoint
+
+        Args:
+            base_url::str
+                The endpoint queried
+
+            latency::float
+                Seconds the query took
+
+            response::QuerySentinelProductsResponse
+                Result of the query
+        """
+        failed = self.is_failure(response)
+        with self.__lock:
+            stats = self.__stats[base_url]
+            if not failed:
+                stats = stats._replace(
+                    latency=latency
+                    if stats.latency is None
+                    else self.__average(stats.latency, latency)
+                )
+            error_rate = self.__average(stats.error_rate, 1.0 if failed else 0.0)
+            self.__stats[base_url] = stats._replace(
+                error_rate=error_rate,
+                requests=stats.requests + 1,
+                healthy=error_rate < self.__max_error_rate,
+            )
+
+    def __average(self, average: float, value: float) -> float:
+        return (1 - self.__smoothing) * average + self.__smoothing * value
@@ -16,3 +16,14 @@ class QuerySentinelProductsError(BaseException):
             and o.status_code == self.status_code
             and o.source == self.source
         )
+
+
+class CircuitOpenError(BaseException):
+    def __init__(self, retry_after: float):
+        super().__init__(
+            f"Circuit breaker is open, queries resume in {retry_after:.1f}s"
+        )
+        self.retry_after = retry_after
+
+    def __eq__(self, o: object) -> bool:
+        return isinstance(o, CircuitOpenError) and o.retry_after == self.retry_after
@@ -0,0 +1,172 @@
+"""Federation module."""
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Empty, Queue
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set
+
+from .client import SENTINEL_HUB_MAX_ROWS, SentinelHubClient
+from .pagination import put_unless_stopped
+from .request.model import SentinelProductRequest
+
+
+class __HubPage(NamedTuple):
+    hub: int
+    entries: List[Dict[str, Any]]
+    total_results: Optional[int]
+    error: Optional[BaseException]
+    done: bool
+
+
+def iter_federated_sentinel_products(
+    sentinel_product_request: SentinelProductRequest,
+    clients: Sequence[SentinelHubClient],
+    *,
+    hub_timeout: float = 1.0,
+    logger: Optional[logging.Logger] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Iterates over every product matching the request on any of several compatible
+    hubs, e.g. the Sentinel Hub, collaborative ground segment mirrors and internal
+    caches. The request is paginated on every hub at the same time and their
+    products merged into a single stream, with products held by more than one hub
+    (the same uuid or identifier) only yielded once.
+
+    Iteration stops as soon as every hub has reported how many products it holds
+    and the products yielded so far cover the largest of these, so the slower hubs
+    are not waited on once the quicker ones have returned everything. Once a hub
+    has returned all of its products and they cover the largest number reported,
+    hubs that have not reported within hub_timeout seconds of the start are not
+    waited on either, so a hung hub does not hold up iteration. Products only held
+    by such a hub are missed. A hub that fails is skipped, an error is only raised
+    if every hub fails.
+
+    Args:
+        sentinel_product_request::SentinelProductRequest
+            Details regarding the request, rows is used as the page size (capped at
+            the Sentinel Hub limit of 100)
+
+        clients::Sequence[SentinelHubClient]
+            A client for each hub, e.g. SentinelHubClient(base_url=..., timeout=30),
+            given a timeout so that queries to hubs no longer waited on end
+
+        hub_timeout::float
+            Seconds from the start a hub has to report how many products it holds
+            before it is no longer waited on once the other hubs have returned
+            everything, defaults to 1.0
+
+        logger::Optional[logging.Logger]
+            Logger to log information and error message defaults to None
+
+    Returns:
+        products::Iterator[Dict[str, Any]]
+            The unique products (feed entries) in no defined order
+
+    Raises:
+        QuerySentinelProductsError/IOError - if every hub failed
+        ValueError - if clients is empty or hub_timeout is negative
+    """
+    if not clients:
+        raise ValueError("clients must not be empty")
+    if hub_timeout < 0:
+        raise ValueError("hub_timeout must not be negative")
+    if logger is None:
+        logger = logging.getLogger(__name__)
+    return __iter_federated_products(
+        sentinel_product_request, clients, hub_timeout, logger
+    )
+
+
+def __iter_federated_products(
+    sentinel_product_request: SentinelProductRequest,
+    clients: Sequence[SentinelHubClient],
+    hub_timeout: float,
+    logger: logging.Logger,
+) -> Iterator[Dict[str, Any]]:
+    pages: "Queue[__HubPage]" = Queue(maxsize=len(clients))
+    stopped = threading.Event()
+    page_size = min(
+        sentinel_product_request.rows or SENTINEL_HUB_MAX_ROWS, SENTINEL_HUB_MAX_ROWS
+    )
+
+    def paginate(hub: int) -> None:
+        try:
+            start = sentinel_product_request.start
+            while True:
+                response = clients[hub].query(
+                    sentinel_product_request._replace(start=start, rows=page_size),
+                    logger=logger,
+                )
+                response.raise_for_failure()
+                entries = response.entries
+                total_results = response.total_results
+                page = __HubPage(hub, entries, total_results, None, False)
+                if not put_unless_stopped(pages, page, stopped):
+                    return
+                start += len(entries)
+                if not entries or total_results is None or start >= total_results:
+                    break
+            put_unless_stopped(pages, __HubPage(hub, [], None, None, True), stopped)
+        except BaseException as error:
+            put_unless_stopped(pages, __HubPage(hub, [], None, error, True), stopped)
+
+    executor = ThreadPoolExecutor(max_workers=len(clients))
+    hubs: List["Future[None]"] = []
+    try:
+        for hub in range(len(clients)):
+            hubs.append(executor.submit(paginate, hub))
+        reported: Dict[int, Optional[int]] = {}
+        finished: Set[int] = set()
+        completed = False
+        errors: List[BaseException] = []
+        seen_keys: Set[Any] = set()
+        yielded = 0
+        deadline = time.monotonic() + hub_timeout
+        while len(finished) < len(clients):
+            totals = [total for total in reported.values() if total is not None]
+            covered = bool(totals) and (
+                yielded >= max(totals) - sentinel_product_request.start
+            )
+            if covered and len(reported) == len(clients):
+                return
+            try:
+                page = pages.get(
+                    timeout=max(deadline - time.monotonic(), 0.0)
+                    if covered and completed
+                    else None
+                )
+            except Empty:
+                logger.warning(
+                    f"{len(clients) - len(reported)} federated hubs did not report "
+                    f"within {hub_timeout}s, not waiting for them"
+                )
+                return
+            if page.error is not None:
+                logger.warning(f"Federated hub {page.hub} failed: {page.error!r}")
+                errors.append(page.error)
+            if page.done:
+                finished.add(page.hub)
+                reported.setdefault(page.hub, None)
+                completed = completed or page.error is None
+            else:
+                reported.setdefault(page.hub, page.total_results)
+            for entry in page.entries:
+                # Mirrors may assign their own uuid, so the identifier is also used
+                keys = {
+                    (field, entry[field])
+                    for field in ("id", "title")
+                    if entry.get(field) is not None
+                }
+                if not seen_keys.isdisjoint(keys):
+                    continue
+                seen_keys.update(keys)
+                yielded += 1
+                yield entry
+        if len(errors) == len(clients):
+            raise errors[0]
+    finally:
+        stopped.set()
+        # Hubs still paginating stop at their next page, hung hubs are not joined
+        for future in hubs:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -0,0 +1,90 @@
+"""JSON decoder module."""
+import importlib
+import json
+import threading
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+JsonDecoder = Callable[[bytes], Any]
+
+# Fastest first, each decodes bytes without decoding them to str first
+__BACKEND_MODULES = ("orjson", "ujson", "simdjson")
+
+
+def __load_backends() -> Dict[str, JsonDecoder]:
+    backends: Dict[str, JsonDecoder] = {}
+    for module_name in __BACKEND_MODULES:
+        try:
+            backends[module_name] = importlib.import_module(module_name).loads
+        except (ImportError, AttributeError):
+            continue
+    backends["json"] = json.loads
+    return backends
+
+
+__BACKENDS = __load_backends()
+__DECODER: Tuple[str, JsonDecoder] = next(iter(__BACKENDS.items()))
+__DECODER_LOCK = threading.Lock()
+
+
+def available_json_decoders() -> List[str]:
+    """Names of the json decoders that can be used, fastest first. orjson, ujson
+    and simdjson are used when they are installed, json always is
+
+    Returns:
+        names::List[str]
+            Names of the installed decoders
+    """
+    return list(__BACKENDS)
+
+
+def get_json_decoder() -> str:
+    """Name of the json decoder used to decode responses, the fastest installed
+    unless set with set_json_decoder
+
+    Returns:
+        name::str
+            Name of the decoder, "custom" if set to a function
+    """
+    return __DECODER[0]
+
+
+def set_json_decoder(decoder: Union[str, JsonDecoder]):
+    """Sets the json decoder used to decode responses
+
+    Args:
+        decoder::Union[str, Callable[[bytes], Any]]
+            Name of an installed decoder, see available_json_decoders, or a function
+            decoding json from bytes that raises ValueError on invalid json
+
+    Raises:
+        ValueError - if there is no installed decoder with the name
+    """
+    global __DECODER
+    if isinstance(decoder, str):
+        if decoder not in __BACKENDS:
+            raise ValueError(
+                f"json decoder {decoder} is not installed, available decoders are "
+                f"{', '.join(__BACKENDS)}"
+            )
+        selected = (decoder, __BACKENDS[decoder])
+    else:
+        selected = ("custom", decoder)
+    with __DECODER_LOCK:
+        __DECODER = selected
+
+
+def decode_json(content: bytes) -> Any:
+    """Decodes json with the current decoder
+
+    Args:
+        content::bytes
+            The json, e.g. the body of a response
+
+    Returns:
+        value::Any
+            The decoded value
+
+    Raises:
+        ValueError - if content is not valid json
+    """
+    return __DECODER[1](content)
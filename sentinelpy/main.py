@@ -1,21 +1,22 @@
 """Main module."""
 import logging
-from typing import Optional
-from urllib.parse import urlencode
+import threading
+from typing import Iterable, Optional
 
-import requests
-
-from .exceptions import QuerySentinelProductsError
+from .async_client import AsyncSentinelHubClient
+from .client import SentinelHubClient
 from .query_sentinel_products_response import QuerySentinelProductsResponse
 from .request.model import SentinelProductRequest
 
-__SENTINEL_HUB_URL_PATTERN = "https://scihub.copernicus.eu/dhus/search?{query}"
+__DEFAULT_CLIENT: Optional[SentinelHubClient] = None
+__DEFAULT_CLIENT_LOCK = threading.Lock()
 
 
 def query_sentinel_hub(
     sentinel_product_request: SentinelProductRequest,
     *,
     log_level: int = logging.INFO,
+    fields: Optional[Iterable[str]] = None,
     logger: Optional[logging.Logger] = None,
 ) -> QuerySentinelProductsResponse:
     """Queries the Sentinel Hub for the information in the request.
@@ -27,6 +28,10 @@ def query_sentinel_hub(
         log_level::int
             Level of logs to print
 
+        fields::Optional[Iterable[str]]
+            Names of the fields to keep of each product, e.g. footprint, see
+            project_entry, defaults to None (keep every field)
+
         logger::Optional[logging.Logger]
             Logger to log information and error message defaults to None
 
@@ -37,51 +42,73 @@ def query_sentinel_hub(
     if logger is None:
         logger = logging.getLogger(__name__)
     logger.setLevel(log_level)
-    try:
-        response = __call_api(sentinel_product_request, logger)
-        logger.info(
-            f"Received response from Sentinel hub with status: {response.status_code}"
-        )
-        return __read_response(response)
-    except IOError as request_exception:
-        return QuerySentinelProductsResponse(None, None, request_exception)
-
-
-def __call_api(
-    sentinel_product_request: SentinelProductRequest, logger: logging.Logger
-) -> requests.Response:
-    logger.debug(f"Querying sentinel hub with request: {sentinel_product_request}")
-    url = __build_url(sentinel_product_request)
-    auth = (sentinel_product_request.username, sentinel_product_request.password)
-    logger.debug(f"Constructed url: {url}")
-    return requests.get(url, auth=auth,)
-
-
-def __read_response(response: requests.Response) -> QuerySentinelProductsResponse:
-    try:
-        data = response.json()
-        return QuerySentinelProductsResponse(response.status_code, data)
-    except ValueError as json_error:
-        return QuerySentinelProductsResponse(
-            response.status_code,
-            None,
-            QuerySentinelProductsError(
-                json_error, response.status_code, response.content.decode()
-            ),
+    return default_client().query(
+        sentinel_product_request, fields=fields, logger=logger
+    )
+
+
+async def query_sentinel_hub_async(
+    sentinel_product_request: SentinelProductRequest,
+    *,
+    log_level: int = logging.INFO,
+    fields: Optional[Iterable[str]] = None,
+    logger: Optional[logging.Logger] = None,
+) -> QuerySentinelProductsResponse:
+    """Asynchronously queries the Sentinel Hub for the information in the request.
+
+    Opens a new connection for each call, use an AsyncSentinelHubClient to reuse
+    connections between many queries.
+
+    Args:
+        sentinel_product_request::SentinelProductRequest
+            Details regarding the request
+
+        log_level::int
+            Level of logs to print
+
+        fields::Optional[Iterable[str]]
+            Names of the fields to keep of each product, e.g. footprint, see
+            project_entry, defaults to None (keep every field)
+
+        logger::Optional[logging.Logger]
+            Logger to log information and error message defaults to None
+
+    Returns:
+        result::QuerySentinelProductsResponse
+            Result of the query
+    """
+    if logger is None:
+        logger = logging.getLogger(__name__)
+    logger.setLevel(log_level)
+    async with AsyncSentinelHubClient(max_concurrency=1) as client:
+        return await client.query(
+            sentinel_product_request, fields=fields, logger=logger
         )
 
 
-def __build_url(sentinel_product_request: SentinelProductRequest) -> str:
-    query_params = {
-        "q": sentinel_product_request.query,
-        "start": sentinel_product_request.start,
-        "format": "json",
-    }
+def default_client() -> SentinelHubClient:
+    """Returns the client shared by the module level query functions, creating it on
+    first use so that connections are pooled between calls.
+
+    Returns:
+        client::SentinelHubClient
+            The shared client
+    """
+    global __DEFAULT_CLIENT
+    with __DEFAULT_CLIENT_LOCK:
+        if __DEFAULT_CLIENT is None:
+            __DEFAULT_CLIENT = SentinelHubClient()
+        return __DEFAULT_CLIENT
 
-    if sentinel_product_request.rows is not None:
-        query_params["rows"] = sentinel_product_request.rows
 
-    if sentinel_product_request.order_by is not None:
-        query_params["orderby"] = sentinel_product_request.order_by
+def set_default_client(client: SentinelHubClient):
+    """Replaces the client shared by the module level query functions, e.g. with one
+    configured with a retry policy, rate limiter or circuit breaker.
 
-    return __SENTINEL_HUB_URL_PATTERN.format(query=urlencode(query_params))
+    Args:
+        client::SentinelHubClient
+            The client to share, the previous client is not closed
+    """
+    global __DEFAULT_CLIENT
+    with __DEFAULT_CLIENT_LOCK:
+        __DEFAULT_CLIENT = client
@@ -0,0 +1,406 @@
+"""Pagination module."""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Full, Queue
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+)
+
+from .client import SENTINEL_HUB_MAX_ROWS, SentinelHubClient
+from .main import default_client
+from .projection import project_response
+from .query_sentinel_products_response import QuerySentinelProductsResponse
+from .request.model import SentinelProductRequest
+from .retry import RetryPolicy
+
+
+def iter_sentinel_products(
+    sentinel_product_request: SentinelProductRequest,
+    *,
+    client: Optional[SentinelHubClient] = None,
+    read_ahead: int = 0,
+    fields: Optional[Iterable[str]] = None,
+    logger: Optional[logging.Logger] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Iterates over every product matching the request, fetching one page at a time
+    from the requested start so that only the current page is held in memory.
+
+    The page size is the requested rows, capped at the Sentinel Hub limit of 100.
+    Iteration stops once `opensearch:totalResults` products have been read or the
+    hub returns an empty page.
+
+    With read_ahead, while the products of one page are being consumed the following
+    pages are fetched in the background, overlapping the network latency with the
+    work done by the consumer. Products are still yielded in the order returned by
+    the hub and at most read_ahead + 1 pages are held in memory.
+
+    Args:
+        sentinel_product_request::SentinelProductRequest
+            Details regarding the request
+
+        client::Optional[SentinelHubClient]
+            Client to query with, defaults to the shared client
+
+        read_ahead::int
+            Number of pages to fetch ahead of the page being consumed, defaults to 0
+            (fetch each page when it is needed)
+
+        fields::Optional[Iterable[str]]
+            Names of the fields to keep of each product, e.g. footprint, the rest
+            are dropped as each page is received, see project_entry. Defaults to
+            None (keep every field)
+
+        logger::Optional[logging.Logger]
+            Logger to log information and error message defaults to None
+
+    Returns:
+        products::Iterator[Dict[str, Any]]
+            The products (feed entries) in the order returned by the hub
+
+    Raises:
+        QuerySentinelProductsError/IOError - if a page could not be retrieved
+        ValueError - if read_ahead is negative
+    """
+    if read_ahead < 0:
+        raise ValueError("read_ahead must not be negative")
+    if client is None:
+        client = default_client()
+    if read_ahead:
+        return __iter_products_reading_ahead(
+            client, sentinel_product_request, read_ahead, fields, logger
+        )
+    return __iter_products(client, sentinel_product_request, fields, logger)
+
+
+def fetch_sentinel_products_parallel(
+    sentinel_product_request: SentinelProductRequest,
+    *,
+    client: Optional[SentinelHubClient] = None,
+    max_workers: int = 8,
+    max_page_retries: int = 2,
+    fields: Optional[Iterable[str]] = None,
+    logger: Optional[logging.Logger] = None,
+) -> List[Dict[str, Any]]:
+    """Fetches every product matching the request. The first page is fetched to find
+    `opensearch:totalResults`, then the remaining pages are fetched in parallel on a
+    bounded thread pool. Failed pages are retried on their own, after a random
+    delay with exponential backoff as RetryPolicy, and the products are returned in
+    the order returned by the hub.
+
+    Args:
+        sentinel_product_request::SentinelProductRequest
+            Details regarding the request, rows is used as the page size (capped at
+            the Sentinel Hub limit of 100)
+
+        client::Optional[SentinelHubClient]
+            Client to query with, defaults to the shared client. Its pool_size
+            should be at least max_workers
+
+        max_workers::int
+            Maximum number of pages fetched at once, defaults to 8
+
+        max_page_retries::int
+            Number of times a page that failed with a transient error is retried
+            before giving up, on top of the retries of the client's retry_policy,
+            defaults to 2
+
+        fields::Optional[Iterable[str]]
+            Names of the fields to keep of each product, e.g. footprint, the rest
+            are dropped as each page is received, see project_entry. Defaults to
+            None (keep every field)
+
+        logger::Optional[logging.Logger]
+            Logger to log information and error message defaults to None
+
+    Returns:
+        products::List[Dict[str, Any]]
+            The products (feed entries) in the order returned by the hub
+
+    Raises:
+        QuerySentinelProductsError/IOError - if a page could not be retrieved after
+        retrying
+        ValueError - if max_workers is less than 1 or max_page_retries is negative
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    if max_page_retries < 0:
+        raise ValueError("max_page_retries must not be negative")
+    if client is None:
+        client = default_client()
+    page_size = __page_size(sentinel_product_request)
+    start = sentinel_product_request.start
+
+    first_page = __fetch_page(
+        client,
+        sentinel_product_request,
+        start,
+        page_size,
+        max_page_retries,
+        fields,
+        logger,
+    )
+    products = first_page.entries
+    total_results = first_page.total_results
+    if not products or total_results is None:
+        return products
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pages: List["Future[QuerySentinelProductsResponse]"] = [
+            executor.submit(
+                __fetch_page,
+                client,
+                sentinel_product_request,
+                page_start,
+                page_size,
+                max_page_retries,
+                fields,
+                logger,
+            )
+            for page_start in range(start + page_size, total_results, page_size)
+        ]
+        try:
+            for page in pages:
+                products.extend(page.result().entries)
+        except BaseException:
+            for page in pages:
+                page.cancel()
+            raise
+    return products
+
+
+def iter_merged_sentinel_products(
+    sentinel_product_requests: Sequence[SentinelProductRequest],
+    *,
+    client: Optional[SentinelHubClient] = None,
+    max_workers: int = 4,
+    fields: Optional[Iterable[str]] = None,
+    logger: Optional[logging.Logger] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Iterates over the products matching any of the requests. The requests are
+    paginated in parallel and their products merged into a single stream, with
+    products matched by more than one request only yielded once.
+
+    Products are yielded as they arrive so the order across requests is not
+    defined. A bounded number of products are buffered, so fast requests wait for
+    a slow consumer.
+
+    Args:
+        sentinel_product_requests::Sequence[SentinelProductRequest]
+            The requests to merge
+
+        client::Optional[SentinelHubClient]
+            Client to query with, defaults to the shared client. Its pool_size
+            should be at least max_workers
+
+        max_workers::int
+            Maximum number of requests paginated at once, defaults to 4
+
+        fields::Optional[Iterable[str]]
+            Names of the fields to keep of each product, e.g. footprint, the rest
+            are dropped as each page is received, see project_entry. Defaults to
+            None (keep every field)
+
+        logger::Optional[logging.Logger]
+            Logger to log information and error message defaults to None
+
+    Returns:
+        products::Iterator[Dict[str, Any]]
+            The unique products (feed entries), identified by their id
+
+    Raises:
+        QuerySentinelProductsError/IOError - if a page could not be retrieved
+        ValueError - if max_workers is less than 1
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    if client is None:
+        client = default_client()
+    return __iter_merged_products(
+        sentinel_product_requests, client, max_workers, fields, logger
+    )
+
+
+def __iter_merged_products(
+    sentinel_product_requests: Sequence[SentinelProductRequest],
+    client: SentinelHubClient,
+    max_workers: int,
+    fields: Optional[Iterable[str]],
+    logger: Optional[logging.Logger],
+) -> Iterator[Dict[str, Any]]:
+    products: "Queue[Any]" = Queue(maxsize=max_workers * SENTINEL_HUB_MAX_ROWS)
+    stopped = threading.Event()
+    request_done = object()
+
+    def paginate(sentinel_product_request: SentinelProductRequest) -> None:
+        if stopped.is_set():
+            return
+        try:
+            for product in __iter_products(
+                client, sentinel_product_request, fields, logger
+            ):
+                if not put_unless_stopped(products, product, stopped):
+                    return
+            put_unless_stopped(products, request_done, stopped)
+        except BaseException as error:
+            put_unless_stopped(products, error, stopped)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        requests = [
+            executor.submit(paginate, sentinel_product_request)
+            for sentinel_product_request in sentinel_product_requests
+        ]
+        seen_ids: Set[Any] = set()
+        remaining = len(sentinel_product_requests)
+        try:
+            while remaining:
+                item = products.get()
+                if item is request_done:
+                    remaining -= 1
+                elif isinstance(item, BaseException):
+                    raise item
+                elif item.get("id") not in seen_ids:
+                    seen_ids.add(item.get("id"))
+                    yield item
+        finally:
+            stopped.set()
+            # Requests still queued are not fetched once the consumer has stopped
+            for request in requests:
+                request.cancel()
+
+
+def put_unless_stopped(
+    queue: "Queue[Any]", item: Any, stopped: threading.Event
+) -> bool:
+    """Puts an item on a bounded queue, giving up once stopped is set so that a
+    worker thread does not block forever after its consumer has gone
+
+    Args:
+        queue::Queue[Any]
+            The queue to put the item on
+
+        item::Any
+            The item to put
+
+        stopped::threading.Event
+            Set once the consumer has stopped taking items
+
+    Returns:
+        put::bool
+            Whether the item was put, False if stopped was set first
+    """
+    while not stopped.is_set():
+        try:
+            queue.put(item, timeout=0.1)
+            return True
+        except Full:
+            continue
+    return False
+
+
+def __iter_products(
+    client: SentinelHubClient,
+    sentinel_product_request: SentinelProductRequest,
+    fields: Optional[Iterable[str]],
+    logger: Optional[logging.Logger],
+) -> Iterator[Dict[str, Any]]:
+    page_size = __page_size(sentinel_product_request)
+    start = sentinel_product_request.start
+    while True:
+        response = __fetch_page(
+            client, sentinel_product_request, start, page_size, 0, fields, logger
+        )
+        entries = response.entries
+        yield from entries
+        start += len(entries)
+        total_results = response.total_results
+        if not entries or total_results is None or start >= total_results:
+            return
+
+
+def __iter_products_reading_ahead(
+    client: SentinelHubClient,
+    sentinel_product_request: SentinelProductRequest,
+    read_ahead: int,
+    fields: Optional[Iterable[str]],
+    logger: Optional[logging.Logger],
+) -> Iterator[Dict[str, Any]]:
+    page_size = __page_size(sentinel_product_request)
+    start = sentinel_product_request.start
+    first_page = __fetch_page(
+        client, sentinel_product_request, start, page_size, 0, fields, logger
+    )
+    total_results = first_page.total_results
+    if not first_page.entries or total_results is None:
+        yield from first_page.entries
+        return
+
+    page_starts = iter(range(start + page_size, total_results, page_size))
+    pages: Deque["Future[QuerySentinelProductsResponse]"] = deque()
+    with ThreadPoolExecutor(max_workers=read_ahead) as executor:
+
+        def fetch_next_page() -> None:
+            page_start = next(page_starts, None)
+            if page_start is not None:
+                pages.append(
+                    executor.submit(
+                        __fetch_page,
+                        client,
+                        sentinel_product_request,
+                        page_start,
+                        page_size,
+                        0,
+                        fields,
+                        logger,
+                    )
+                )
+
+        try:
+            for _ in range(read_ahead):
+                fetch_next_page()
+            yield from first_page.entries
+            while pages:
+                entries = pages.popleft().result().entries
+                fetch_next_page()
+                yield from entries
+        finally:
+            for page in pages:
+                page.cancel()
+
+
+def __fetch_page(
+    client: SentinelHubClient,
+    sentinel_product_request: SentinelProductRequest,
+    start: int,
+    page_size: int,
+    max_page_retries: int,
+    fields: Optional[Iterable[str]],
+    logger: Optional[logging.Logger],
+) -> QuerySentinelProductsResponse:
+    page_request = sentinel_product_request._replace(start=start, rows=page_size)
+    retry_policy = RetryPolicy(max_attempts=max_page_retries + 1)
+    attempt = 1
+    while True:
+        response = client.query(page_request, logger=logger)
+        delay = retry_policy.next_delay(attempt, response)
+        if delay is None:
+            response.raise_for_failure()
+            return project_response(response, fields)
+        time.sleep(delay)
+        attempt += 1
+
+
+def __page_size(sentinel_product_request: SentinelProductRequest) -> int:
+    return min(
+        sentinel_product_request.rows or SENTINEL_HUB_MAX_ROWS, SENTINEL_HUB_MAX_ROWS
+    )
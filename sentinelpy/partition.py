@@ -0,0 +1,209 @@
+"""Partition module."""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .client import SentinelHubClient
+from .count import count_sentinel_products
+from .main import default_client
+from .pagination import iter_merged_sentinel_products
+from .request.model import FilterKeyword, SentinelProductRequest
+from .request.request_query_builder import RequestQueryBuilder
+from .request.sentinel_product_request_builder import SentinelProductRequestBuilder
+from .request.value_formatters import format_date
+
+__PARTITIONABLE_FIELDS = (FilterKeyword.INGESTION_DATE, FilterKeyword.BEGIN_POSITION)
+__SMALLEST_PARTITION = timedelta(milliseconds=1)
+
+
+def partition_sentinel_product_request(
+    query: Union[str, RequestQueryBuilder],
+    window_start: datetime,
+    window_end: datetime,
+    *,
+    username: str,
+    password: str,
+    date_field: FilterKeyword = FilterKeyword.INGESTION_DATE,
+    max_partition_size: int = 5000,
+    client: Optional[SentinelHubClient] = None,
+    max_workers: int = 4,
+    logger: Optional[logging.Logger] = None,
+) -> List[SentinelProductRequest]:
+    """Splits a query over a time window into requests over smaller windows, each
+    matching at most max_partition_size products, so that no request has to page to
+    a deep start offset.
+
+    The window is bisected using count queries until each partition is small enough,
+    or is a single millisecond wide. Partitions that match no products are dropped.
+
+    Args:
+        query::Union[str, RequestQueryBuilder]
+            The query to partition, it should not filter on date_field itself
+
+        window_start::datetime
+            Start of the overall window, naive datetimes are treated as UTC
+
+        window_end::datetime
+            End of the overall window (inclusive), naive datetimes are treated as UTC
+
+        username::str
+            The username for the Sentinel Hub API
+
+        password::str
+            The password for the Sentinel Hub API
+
+        date_field::FilterKeyword
+            Field to partition on, either FilterKeyword.INGESTION_DATE (default) or
+            FilterKeyword.BEGIN_POSITION
+
+        max_partition_size::int
+            Maximum number of products each partition should match, defaults to 5000
+
+        client::Optional[SentinelHubClient]
+            Client to query with, defaults to the shared client
+
+        max_workers::int
+            Maximum number of count queries in flight at once, defaults to 4
+
+        logger::Optional[logging.Logger]
+            Logger to log information and error message defaults to None
+
+    Returns:
+        requests::List[SentinelProductRequest]
+            Requests for each partition in time order
+
+    Raises:
+        QuerySentinelProductsError/IOError - if a count could not be retrieved
+        ValueError - if the arguments are invalid or username or password missing
+    """
+    if date_field not in __PARTITIONABLE_FIELDS:
+        raise ValueError("date_field must be ingestiondate or beginposition")
+    if window_end < window_start:
+        raise ValueError("window_end must not be before window_start")
+    if max_partition_size < 1:
+        raise ValueError("max_partition_size must be at least 1")
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    if client is None:
+        client = default_client()
+    query_string = query if isinstance(query, str) else query.build()
+
+    def partition_request(window: Tuple[datetime, datetime]) -> SentinelProductRequest:
+        return __partition_request(query_string, window, date_field, username, password)
+
+    def count(window: Tuple[datetime, datetime]) -> int:
+        return count_sentinel_products(
+            partition_request(window), client=client, logger=logger
+        )
+
+    partitions = []
+    pending = [(window_start, window_end)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending:
+            counts = list(executor.map(count, pending))
+            bisected: List[Tuple[datetime, datetime]] = []
+            for window, window_count in zip(pending, counts):
+                if window_count > max_partition_size and __can_bisect(window):
+                    bisected.extend(__bisect(window))
+                elif window_count > 0:
+                    partitions.append(window)
+            pending = bisected
+    return [partition_request(window) for window in sorted(partitions)]
+
+
+def iter_partitioned_sentinel_products(
+    query: Union[str, RequestQueryBuilder],
+    window_start: datetime,
+    window_end: datetime,
+    *,
+    username: str,
+    password: str,
+    date_field: FilterKeyword = FilterKeyword.INGESTION_DATE,
+    max_partition_size: int = 5000,
+    client: Optional[SentinelHubClient] = None,
+    max_workers: int = 4,
+    fields: Optional[Iterable[str]] = None,
+    logger: Optional[logging.Logger] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Iterates over every product matching a query over a large time window by
+    partitioning the window (see partition_sentinel_product_request), paginating the
+    partitions in parallel and merging them into a single deduplicated stream.
+
+    Args:
+        As partition_sentinel_product_request, max_workers also limits the number of
+        partitions paginated at once
+
+        fields::Optional[Iterable[str]]
+            Names of the fields to keep of each product, e.g. footprint, the rest
+            are dropped as each page is received, see project_entry. Defaults to
+            None (keep every field)
+
+    Returns:
+        products::Iterator[Dict[str, Any]]
+            The unique products (feed entries) in no defined order
+
+    Raises:
+        QuerySentinelProductsError/IOError - if a count or page could not be
+        retrieved
+        ValueError - if the arguments are invalid or username or password missing
+    """
+    if client is None:
+        client = default_client()
+    partitions = partition_sentinel_product_request(
+        query,
+        window_start,
+        window_end,
+        username=username,
+        password=password,
+        date_field=date_field,
+        max_partition_size=max_partition_size,
+        client=client,
+        max_workers=max_workers,
+        logger=logger,
+    )
+    return iter_merged_sentinel_products(
+        partitions,
+        client=client,
+        max_workers=max_workers,
+        fields=fields,
+        logger=logger,
+    )
+
+
+def __partition_request(
+    query: str,
+    window: Tuple[datetime, datetime],
+    date_field: FilterKeyword,
+    username: str,
+    password: str,
+) -> SentinelProductRequest:
+    query_builder = RequestQueryBuilder()
+    if query != "*":
+        query_builder.group_(query).and_()
+    add_date_range = (
+        query_builder.ingestion_date
+        if date_field is FilterKeyword.INGESTION_DATE
+        else query_builder.begin_position
+    )
+    add_date_range(format_date(window[0]), format_date(window[1]))
+    return (
+        SentinelProductRequestBuilder()
+        .with_username(username)
+        .with_password(password)
+        .with_query(query_builder)
+        .build()
+    )
+
+
+def __can_bisect(window: Tuple[datetime, datetime]) -> bool:
+    return window[1] - window[0] >= 2 * __SMALLEST_PARTITION
+
+
+def __bisect(
+    window: Tuple[datetime, datetime]
+) -> Tuple[Tuple[datetime, datetime], Tuple[datetime, datetime]]:
+    start, end = window
+    middle = start + (end - start) / 2
+    middle -= timedelta(microseconds=middle.microsecond % 1000)
+    return (start, middle), (middle + __SMALLEST_PARTITION, end)
@@ -0,0 +1,228 @@
+"""Product module."""
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from .request.model import (
+    OrbitDirection,
+    PlatformName,
+    PolarisationMode,
+    ProductType,
+    SensorOperationalMode,
+    Sentinel1ProductType,
+    Sentinel2ProductType,
+    Sentinel3ProductType,
+    Sentinel5PProductType,
+    SwathIdentifier,
+    Timeliness,
+)
+
+
+class Product:
+    """A product (feed entry) returned by the Sentinel Hub, giving typed access to
+    its fields without scanning the str, date, int and double lists of the entry.
+
+    The position of each field in the entry is indexed by name on first access and
+    each field is only decoded to a Python type when it is read: str fields to
+    str, or to the matching enum e.g. PlatformName where there is one, date fields
+    to UTC datetimes, int fields to int and double fields to float.
+
+    Examples
+    ========
+    for product in query_sentinel_hub(request).products:
+        if product.platform_name is PlatformName.SENTINEL_1:
+            print(product.uuid, product["slicenumber"], product.begin_position)
+    """
+
+    __slots__ = ("__entry", "__index", "__decoded")
+
+    __MISSING = object()
+    __DECODERS: Dict[str, Callable[[str], Any]] = {
+        "str": str,
+        "int": int,
+        "double": float,
+    }
+    __DATE_FORMATS = ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ")
+    # Enum member by value, as is and upper case as the hub returns some values in
+    # upper case, for each str field with a matching enum
+    __ENUM_FIELDS: Dict[str, Dict[str, Enum]] = {
+        field: {
+            value: member
+            for enum in enums
+            for member in enum
+            for value in (member.value, member.value.upper())
+        }
+        for field, enums in (
+            ("platformname", (PlatformName,)),
+            (
+                "producttype",
+                (
+                    Sentinel1ProductType,
+                    Sentinel2ProductType,
+                    Sentinel3ProductType,
+                    Sentinel5PProductType,
+                ),
+            ),
+            ("orbitdirection", (OrbitDirection,)),
+            ("polarisationmode", (PolarisationMode,)),
+            ("sensoroperationalmode", (SensorOperationalMode,)),
+            ("swathidentifier", (SwathIdentifier,)),
+            ("timeliness", (Timeliness,)),
+        )
+    }
+
+    def __init__(self, entry: Dict[str, Any]):
+        """
+        Args:
+            entry::Dict[str, Any]
+                The feed entry of the product, as in QuerySentinelProductsResponse
+                entries
+        """
+        self.__entry = entry
+        self.__index: Optional[Dict[str, Tuple[str, int]]] = None
+        self.__decoded: Optional[Dict[str, Any]] = None
+
+    @property
+    def entry(self) -> Dict[str, Any]:
+        """The feed entry of the product"""
+        return self.__entry
+
+    @property
+    def uuid(self) -> Optional[str]:
+        return self.__entry.get("id")
+
+    @property
+    def identifier(self) -> Optional[str]:
+        return self.__entry.get("title")
+
+    @property
+    def platform_name(self) -> Optional[PlatformName]:
+        return self.get("platformname")
+
+    @property
+    def product_type(self) -> Optional[ProductType]:
+        return self.get("producttype")
+
+    @property
+    def begin_position(self) -> Optional[datetime]:
+        return self.get("beginposition")
+
+    @property
+    def end_position(self) -> Optional[datetime]:
+        return self.get("endposition")
+
+    @property
+    def ingestion_date(self) -> Optional[datetime]:
+        return self.get("ingestiondate")
+
+    @property
+    def orbit_number(self) -> Optional[int]:
+        return self.get("orbitnumber")
+
+    @property
+    def relative_orbit_number(self) -> Optional[int]:
+        return self.get("relativeorbitnumber")
+
+    @property
+    def orbit_direction(self) -> Optional[OrbitDirection]:
+        return self.get("orbitdirection")
+
+    @property
+    def polarisation_mode(self) -> Optional[PolarisationMode]:
+        return self.get("polarisationmode")
+
+    @property
+    def sensor_operational_mode(self) -> Optional[SensorOperationalMode]:
+        return self.get("sensoroperationalmode")
+
+    @property
+    def cloud_cover_percentage(self) -> Optional[float]:
+        return self.get("cloudcoverpercentage")
+
+    @property
+    def footprint(self) -> Optional[str]:
+        return self.get("footprint")
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Decoded value of a field
+
+        Args:
+            name::str
+                Name of the field e.g. beginposition
+
+            default::Any
+                Value returned if the product does not have the field, defaults to
+                None
+
+        Returns:
+            value::Any
+                The decoded value of the field
+        """
+        value = self.__decode(name)
+        return default if value is Product.__MISSING else value
+
+    def __getitem__(self, name: str) -> Any:
+        value = self.__decode(name)
+        if value is Product.__MISSING:
+            raise KeyError(name)
+        return value
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.__fields()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__fields())
+
+    def __len__(self) -> int:
+        return len(self.__fields())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Product):
+            return NotImplemented
+        return self.__entry == other.entry
+
+    def __repr__(self) -> str:
+        return f"Product(uuid={self.uuid!r}, identifier={self.identifier!r})"
+
+    def __decode(self, name: str) -> Any:
+        if self.__decoded is None:
+            self.__decoded = {}
+        elif name in self.__decoded:
+            return self.__decoded[name]
+        location = self.__fields().get(name)
+        if location is None:
+            return Product.__MISSING
+        field_type, position = location
+        fields = self.__entry[field_type]
+        content = (fields[position] if isinstance(fields, list) else fields)["content"]
+        if field_type == "date":
+            value = Product.__decode_date(content)
+        elif name in Product.__ENUM_FIELDS:
+            value = Product.__ENUM_FIELDS[name].get(content, content)
+        else:
+            value = Product.__DECODERS.get(field_type, str)(content)
+        self.__decoded[name] = value
+        return value
+
+    def __fields(self) -> Dict[str, Tuple[str, int]]:
+        if self.__index is None:
+            index = {}
+            for field_type in ("str", "date", "int", "double"):
+                fields = self.__entry.get(field_type, [])
+                for position, field in enumerate(
+                    fields if isinstance(fields, list) else [fields]
+                ):
+                    index[field["name"]] = (field_type, position)
+            self.__index = index
+        return self.__index
+
+    @staticmethod
+    def __decode_date(content: str) -> datetime:
+        for date_format in Product.__DATE_FORMATS:
+            try:
+                return datetime.strptime(content, date_format).replace(
+                    tzinfo=timezone.utc
+                )
+            except ValueError:
+                continue
+        raise ValueError(f"Invalid date: {content}")
@@ -0,0 +1,118 @@
+"""Projection module."""
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+from .query_sentinel_products_response import (
+    LazyQuerySentinelProductsResponse,
+    QuerySentinelProductsResponse,
+)
+
+# Lists of the named fields of an entry, the str, date, int and double fields
+__TYPED_FIELDS = frozenset(("str", "date", "int", "double"))
+
+
+def project_entry(entry: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """Copies the requested fields of a product (feed entry), dropping the rest.
+
+    Fields are matched by the name of the typed (str, date, int and double) fields,
+    e.g. footprint or beginposition, and by the keys of the entry itself, e.g.
+    title. The id of the product is always kept so that products can still be
+    identified and deduplicated. Kept typed fields are always lists.
+
+    Args:
+        entry::Dict[str, Any]
+            The product (feed entry)
+
+        fields::Iterable[str]
+            Names of the fields to keep
+
+    Returns:
+        entry::Dict[str, Any]
+            The product with only the requested fields
+    """
+    kept = __field_names(fields)
+    projected: Dict[str, Any] = {}
+    for key, value in entry.items():
+        if key in __TYPED_FIELDS:
+            typed_fields = [
+                field
+                for field in (value if isinstance(value, list) else [value])
+                if field.get("name") in kept
+            ]
+            if typed_fields:
+                projected[key] = typed_fields
+        elif key in kept:
+            projected[key] = value
+    return projected
+
+
+def project_response(
+    response: QuerySentinelProductsResponse, fields: Optional[Iterable[str]]
+) -> QuerySentinelProductsResponse:
+    """Projects each product (feed entry) in the body of a response, see
+    project_entry. The rest of the body, e.g. opensearch:totalResults, is kept.
+
+    A LazyQuerySentinelProductsResponse whose body has not been decoded yet is not
+    decoded here, the lazy response returned projects its body in place when it is
+    first decoded. A response that has already been decoded is copied, so
+    projection only saves memory once the original response is dropped.
+
+    Args:
+        response::QuerySentinelProductsResponse
+            The response to project
+
+        fields::Optional[Iterable[str]]
+            Names of the fields to keep, None to keep every field
+
+    Returns:
+        response::QuerySentinelProductsResponse
+            A response with the projected products, response itself if fields is
+            None or the response has no products
+    """
+    if fields is None:
+        return response
+    if isinstance(response, LazyQuerySentinelProductsResponse) and not (
+        response.decoded
+    ):
+        return __LazyProjectedResponse(response, __field_names(fields))
+    if not response.success or not response.entries:
+        return response
+    kept = __field_names(fields)
+    body = dict(response.body or {})
+    body["feed"] = dict(body["feed"])
+    body["feed"]["entry"] = [project_entry(entry, kept) for entry in response.entries]
+    return QuerySentinelProductsResponse(response.status_code, body)
+
+
+def __field_names(fields: Iterable[str]) -> FrozenSet[str]:
+    if isinstance(fields, frozenset) and "id" in fields:
+        return fields
+    return frozenset(fields).union(("id",))
+
+
+class __LazyProjectedResponse(LazyQuerySentinelProductsResponse):
+    __fields: FrozenSet[str]
+    __projected: bool
+
+    def __new__(
+        cls, response: LazyQuerySentinelProductsResponse, fields: FrozenSet[str]
+    ):
+        projected = super().__new__(
+            cls, response.status_code, response.content  # type: ignore
+        )
+        projected.__fields = fields
+        projected.__projected = False
+        return projected
+
+    @property
+    def body(self) -> Optional[Dict[str, Any]]:
+        body = super().body
+        if not self.__projected:
+            self.__projected = True
+            entries = self.entries
+            if body is not None and entries:
+                # The body was just decoded for this response alone, so its
+                # products are replaced rather than copied
+                body["feed"]["entry"] = [
+                    project_entry(entry, self.__fields) for entry in entries
+                ]
+        return body
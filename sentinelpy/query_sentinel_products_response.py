@@ -1,4 +1,8 @@
-from typing import Any, Callable, Dict, NamedTuple, Optional
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .exceptions import QuerySentinelProductsError
+from .json_decoder import decode_json
+from .product import Product
 
 
 class QuerySentinelProductsResponse(NamedTuple):
@@ -51,6 +55,32 @@ class QuerySentinelProductsResponse(NamedTuple):
             and 200 <= self.status_code < 300
         )
 
+    @property
+    def entries(self) -> List[Dict[str, Any]]:
+        """The products (feed entries) in the body, empty if there are none.
+
+        The Sentinel Hub returns a single product as an object rather than a list,
+        this always returns a list.
+        """
+        if not self.body:
+            return []
+        entries = self.body.get("feed", {}).get("entry", [])
+        return entries if isinstance(entries, list) else [entries]
+
+    @property
+    def products(self) -> List[Product]:
+        """The products in the body as Product records, empty if there are none"""
+        return [Product(entry) for entry in self.entries]
+
+    @property
+    def total_results(self) -> Optional[int]:
+        """Total number of products matching the query across all pages, None if
+        the body does not contain the total"""
+        if not self.body:
+            return None
+        total_results = self.body.get("feed", {}).get("opensearch:totalResults")
+        return int(total_results) if total_results is not None else None
+
     def raise_error(self):
         """If encountered an error raise so not
 
@@ -61,6 +91,22 @@ class QuerySentinelProductsResponse(NamedTuple):
         if self.error is not None:
             raise self.error
 
+    def raise_for_failure(self):
+        """If the request was not successful raise so not, i.e. raises the
+        encountered error or a QuerySentinelProductsError when the Sentinel Hub
+        responded with an unsuccessful status code.
+
+        Useful when consuming many responses, e.g. paginating, where a failed page
+        should stop the consumer.
+        """
+        self.raise_error()
+        if not self.success:
+            raise QuerySentinelProductsError(
+                IOError(f"Sentinel Hub responded with status: {self.status_code}"),
+                self.status_code,
+                str(self.body),
+            )
+
     def on_success(
         self, callback: Callable[[Dict[str, Any]], None]
     ) -> "QuerySentinelProductsResponse":
@@ -78,7 +124,8 @@ class QuerySentinelProductsResponse(NamedTuple):
         return self
 
     def on_failure(
-        self, callback: Callable[["QuerySentinelProductsResponse"], None],
+        self,
+        callback: Callable[["QuerySentinelProductsResponse"], None],
     ) -> "QuerySentinelProductsResponse":
         """Calls callback if the request failed in some way either could not
         reach API or there was an error in the response or parsing the response
@@ -93,3 +140,121 @@ class QuerySentinelProductsResponse(NamedTuple):
         if not self.success or self.body is None:
             callback(self)
         return self
+
+
+class LazyQuerySentinelProductsResponse(QuerySentinelProductsResponse):
+    """A QuerySentinelProductsResponse that keeps the undecoded body of the
+    response and only decodes it, with the current json decoder, when body is first
+    read, e.g. by entries or on_success. The decoded body is kept for later reads.
+
+    Checking status_code does not decode the body, so responses whose body is never
+    read cost no decoding. success, raise_error and raise_for_failure decode the
+    body first, so that a body that is not valid json is never taken for success:
+    body is then None and error a QuerySentinelProductsError, as for a
+    QuerySentinelProductsResponse. error itself does not decode the body.
+
+    Examples
+    ========
+    client = SentinelHubClient(lazy_decoding=True)
+    response = client.query(request)
+    print(response.status_code) # 200, the body has not been decoded
+    print(response.total_results) # 42, the body is decoded once here
+    """
+
+    __content: bytes
+    __decoded: bool
+    __body: Optional[Dict[str, Any]]
+    __error: Optional[BaseException]
+
+    def __new__(cls, status_code: int, content: bytes):
+        """
+        Args:
+            status_code::int
+                HTTP status code of the response
+
+            content::bytes
+                The undecoded body of the response
+        """
+        response = super().__new__(cls, status_code, None)
+        response.__content = content
+        response.__decoded = False
+        response.__body = None
+        response.__error = None
+        return response
+
+    @property
+    def content(self) -> bytes:
+        """The undecoded body of the response"""
+        return self.__content
+
+    @property
+    def decoded(self) -> bool:
+        """Whether the body has been decoded"""
+        return self.__decoded
+
+    @property
+    def body(self) -> Optional[Dict[str, Any]]:
+        if not self.__decoded:
+            try:
+                self.__body = decode_json(self.__content)
+            except ValueError as json_error:
+                self.__error = QuerySentinelProductsError(
+                    json_error,
+                    self.status_code,
+                    self.__content.decode(errors="replace"),
+                )
+            self.__decoded = True
+        return self.__body
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        return self.__error
+
+    @property
+    def success(self) -> bool:
+        self.decode()
+        return super().success
+
+    def decode(self) -> "LazyQuerySentinelProductsResponse":
+        """Decodes the body if it has not been decoded yet
+
+        Returns:
+            self::LazyQuerySentinelProductsResponse
+        """
+        self.body
+        return self
+
+    def raise_error(self):
+        self.decode()
+        super().raise_error()
+
+    def raise_for_failure(self):
+        self.decode()
+        super().raise_for_failure()
+
+    def _replace(self, **kwargs: Any) -> QuerySentinelProductsResponse:  # type: ignore
+        return QuerySentinelProductsResponse(*self)._replace(**kwargs)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter((self.status_code, self.body, self.error))
+
+    def __getitem__(self, index: Any) -> Any:
+        return tuple(self)[index]
+
+    def __eq__(self, other: object) -> bool:
+        return tuple(self) == other
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __getnewargs__(self) -> Tuple[Optional[int], bytes]:
+        return self.status_code, self.__content
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(status_code={self.status_code!r}, "
+            f"content=<{len(self.__content)} bytes>, decoded={self.__decoded!r})"
+        )
@@ -0,0 +1,116 @@
+"""Rate limit module."""
+import os
+import threading
+import time
+from typing import Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore
+
+
+class RateLimiter:
+    """Token bucket limiting the rate at which queries are sent to the Sentinel Hub.
+    The bucket holds up to burst tokens and is refilled at rate tokens per second,
+    each query takes a token and waits until one is available.
+
+    A limiter is thread safe and can be shared by several clients. With lock_file
+    the bucket is kept in that file, locked while it is updated, so that every
+    process on the node using the same file shares one budget.
+
+    Examples
+    ========
+    rate_limiter = RateLimiter(2.0, burst=5)
+    client = SentinelHubClient(rate_limiter=rate_limiter)
+
+    # Shared by every worker process on the node
+    rate_limiter = RateLimiter(2.0, burst=5, lock_file="/tmp/sentinelpy.bucket")
+    """
+
+    def __init__(self, rate: float, burst: int = 1, *, lock_file: Optional[str] = None):
+        """
+        Args:
+            rate::float
+                Number of queries allowed per second on average
+
+            burst::int
+                Number of queries that can be sent at once after being idle,
+                defaults to 1
+
+            lock_file::Optional[str]
+                Path of a file holding the bucket shared between processes,
+                defaults to None (the bucket is only shared within the process)
+
+        Raises:
+            ValueError - if rate is not positive, burst is less than 1 or lock_file
+            is given on a platform without file locking
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        if lock_file is not None and fcntl is None:
+            raise ValueError("lock_file is not supported on this platform")
+        self.__rate = rate
+        self.__burst = burst
+        self.__lock_file = lock_file
+        self.__lock = threading.Lock()
+        self.__tokens = float(burst)
+        self.__updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        """Number of queries allowed per second on average"""
+        return self.__rate
+
+    @property
+    def burst(self) -> int:
+        """Number of queries that can be sent at once after being idle"""
+        return self.__burst
+
+    def acquire(self):
+        """Takes a token, blocking until it is available"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def reserve(self) -> float:
+        """Takes a token without blocking, the caller must wait the returned delay
+        before using it. Used by the asyncio client to wait without blocking the
+        event loop.
+
+        Returns:
+            delay::float
+                Seconds until the token is available, 0.0 if it is available now
+        """
+        with self.__lock:
+            if self.__lock_file is None:
+                now = time.monotonic()
+                self.__tokens, delay = self.__take(self.__tokens, now - self.__updated)
+                self.__updated = now
+                return delay
+            return self.__reserve_shared(self.__lock_file)
+
+    def __reserve_shared(self, lock_file: str) -> float:
+        file_descriptor = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(file_descriptor, fcntl.LOCK_EX)
+            now = time.time()
+            state = os.read(file_descriptor, 64).split()
+            try:
+                tokens, updated = float(state[0]), float(state[1])
+            except (IndexError, ValueError):
+                tokens, updated = float(self.__burst), now
+            tokens, delay = self.__take(tokens, max(0.0, now - updated))
+            os.lseek(file_descriptor, 0, os.SEEK_SET)
+            os.ftruncate(file_descriptor, 0)
+            os.write(file_descriptor, f"{tokens!r} {now!r}".encode())
+            return delay
+        finally:
+            os.close(file_descriptor)
+
+    def __take(self, tokens: float, elapsed: float) -> Tuple[float, float]:
+        # Tokens may go negative, reserving future tokens for callers that wait
+        tokens = min(float(self.__burst), tokens + elapsed * self.__rate) - 1
+        return tokens, max(0.0, -tokens / self.__rate)
@@ -0,0 +1,49 @@
+from typing import Mapping, NamedTuple, Optional
+
+from .exceptions import QuerySentinelProductsError
+
+
+class RawSentinelProductsResponse(NamedTuple):
+    """Represents the undecoded result from the Sentinel Hub API, for consumers that
+    pass the body on, e.g. to an archive, without looking inside it
+
+    Examples
+    ========
+    raw_response = client.query_raw(request)
+    print(raw_response.status_code) # 200
+    print(raw_response.headers["Content-Type"]) # application/json
+    archive_file.write(raw_response.view)
+    """
+
+    status_code: Optional[int]
+    headers: Mapping[str, str]
+    content: Optional[bytes]
+    error: Optional[BaseException] = None
+
+    @property
+    def success(self) -> bool:
+        return (
+            self.error is None
+            and self.status_code is not None
+            and 200 <= self.status_code < 300
+        )
+
+    @property
+    def view(self) -> memoryview:
+        """The body as a memoryview, to pass on without copying, empty if there is
+        no body"""
+        return memoryview(self.content or b"")
+
+    def raise_for_failure(self):
+        """If the request was not successful raise so not, i.e. raises the
+        encountered error or a QuerySentinelProductsError when the Sentinel Hub
+        responded with an unsuccessful status code
+        """
+        if self.error is not None:
+            raise self.error
+        if not self.success:
+            raise QuerySentinelProductsError(
+                IOError(f"Sentinel Hub responded with status: {self.status_code}"),
+                self.status_code,
+                self.view.tobytes().decode(errors="replace"),
+            )
@@ -1,4 +1,5 @@
 import re
+from datetime import datetime, timezone
 from typing import Union
 
 __NO_BRACKETS_NUMERIC_RANGE_PATTERN = re.compile(r"^\d+\sTO\s\d+$")
@@ -44,3 +45,20 @@ def format_number_or_range(orbit_number: Union[str, int]) -> str:
         if __NO_BRACKETS_NUMERIC_RANGE_PATTERN.match(str(orbit_number)) is None
         else f"[{orbit_number}]"
     )
+
+
+def format_date(value: datetime) -> str:
+    """Formats the supplied datetime as a Sentinel Hub date, in UTC to the
+    millisecond, e.g. 2020-01-01T00:00:00.000Z
+
+    Args:
+        value::datetime
+            Datetime to format, naive datetimes are treated as UTC
+
+    Returns:
+        val::str
+            Formatted date compatible with Sentinel Hub API
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return f"{value:%Y-%m-%dT%H:%M:%S}.{value.microsecond // 1000:03d}Z"
@@ -0,0 +1,166 @@
+"""Retry module."""
+import asyncio
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AbstractSet, Callable, FrozenSet, NamedTuple, Optional
+
+from .query_sentinel_products_response import QuerySentinelProductsResponse
+
+
+def is_transient_failure(
+    response: QuerySentinelProductsResponse, status_codes: AbstractSet[int]
+) -> bool:
+    """Whether the response is a failure that may not happen again, the rule shared
+    by RetryPolicy, CircuitBreaker and EndpointPool
+
+    Args:
+        response::QuerySentinelProductsResponse
+            Result of a query
+
+        status_codes::AbstractSet[int]
+            Status codes that count as a transient failure
+
+    Returns:
+        transient::bool
+            True if the hub could not be reached, did not respond in time or
+            responded with one of the status codes
+    """
+    return (
+        isinstance(response.error, (IOError, asyncio.TimeoutError))
+        or response.status_code in status_codes
+    )
+
+
+class RetryAttempt(NamedTuple):
+    """Details of a single attempt at a query, passed to RetryPolicy.on_attempt.
+    delay is the number of seconds until the next attempt, None if the query will
+    not be retried"""
+
+    attempt: int
+    status_code: Optional[int]
+    error: Optional[BaseException]
+    delay: Optional[float]
+
+
+class RetryPolicy(NamedTuple):
+    """Policy for retrying queries that fail with a transient error, i.e. the hub
+    could not be reached or responded with one of the retryable status codes.
+
+    The delay before each retry is chosen at random between zero and an exponential
+    backoff (backoff_base * 2 ^ (attempt - 1), capped at backoff_cap) so that many
+    clients do not retry at the same moment. When the hub responds with a
+    Retry-After header the delay is at least the time it asks for, unless it asks
+    for longer than max_retry_after in which case the query is not retried.
+
+    Examples
+    ========
+    client = SentinelHubClient(
+        retry_policy=RetryPolicy(
+            max_attempts=5,
+            on_attempt=lambda attempt: print(attempt),
+        )
+    )
+    """
+
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_cap: float = 30.0
+    retryable_status_codes: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    respect_retry_after: bool = True
+    on_attempt: Optional[Callable[[RetryAttempt], None]] = None
+    max_retry_after: float = 120.0
+
+    def is_retryable(self, response: QuerySentinelProductsResponse) -> bool:
+        """Whether the response is a transient failure worth retrying
+
+        Args:
+            response::QuerySentinelProductsResponse
+                Result of an attempt
+
+        Returns:
+            retryable::bool
+                True if the hub could not be reached, did not respond in time or
+                responded with a retryable status code
+        """
+        return is_transient_failure(response, self.retryable_status_codes)
+
+    def next_delay(
+        self,
+        attempt: int,
+        response: QuerySentinelProductsResponse,
+        retry_after: Optional[str] = None,
+    ) -> Optional[float]:
+        """Decides whether to retry after an attempt, reporting the attempt to
+        on_attempt.
+
+        Args:
+            attempt::int
+                Number of the attempt, starting at 1
+
+            response::QuerySentinelProductsResponse
+                Result of the attempt
+
+            retry_after::Optional[str]
+                Value of the Retry-After header of the response if there was one
+
+        Returns:
+            delay::Optional[float]
+                Seconds to wait before the next attempt, None if it should not be
+                retried
+        """
+        delay = (
+            self.delay(attempt, retry_after)
+            if attempt < self.max_attempts
+            and self.is_retryable(response)
+            and not self.__asks_too_long(retry_after)
+            else None
+        )
+        if self.on_attempt is not None:
+            self.on_attempt(
+                RetryAttempt(attempt, response.status_code, response.error, delay)
+            )
+        return delay
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before retrying after the attempt
+
+        Args:
+            attempt::int
+                Number of the attempt that failed, starting at 1
+
+            retry_after::Optional[str]
+                Value of the Retry-After header of the response if there was one,
+                either a number of seconds or a HTTP date
+
+        Returns:
+            delay::float
+                Seconds to wait, never more than max_retry_after for a Retry-After
+        """
+        backoff = min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1))
+        delay = random.uniform(0, backoff)  # nosec - jitter, not cryptography
+        if self.respect_retry_after and retry_after:
+            delay = max(
+                delay,
+                min(RetryPolicy.__parse_retry_after(retry_after), self.max_retry_after),
+            )
+        return delay
+
+    def __asks_too_long(self, retry_after: Optional[str]) -> bool:
+        return bool(
+            self.respect_retry_after
+            and retry_after
+            and RetryPolicy.__parse_retry_after(retry_after) > self.max_retry_after
+        )
+
+    @staticmethod
+    def __parse_retry_after(retry_after: str) -> float:
+        if retry_after.strip().isdigit():
+            return float(retry_after)
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError, IndexError):
+            return 0.0
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
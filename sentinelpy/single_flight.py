@@ -0,0 +1,98 @@
+"""Single flight module."""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces identical concurrent calls, so that while a call for a key is in
+    flight later callers with the same key wait for it and share its result instead
+    of making their own call.
+
+    Threads and asyncio tasks are coalesced separately, threads through do and tasks
+    through do_async.
+
+    Examples
+    ========
+    single_flight = SingleFlight()
+    response = single_flight.do(request, lambda: client.query(request))
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__calls: Dict[Hashable, "Future[object]"] = {}
+        self.__tasks: Dict[Hashable, "asyncio.Future[object]"] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls currently in flight"""
+        with self.__lock:
+            return len(self.__calls) + len(self.__tasks)
+
+    def do(self, key: Hashable, function: Callable[[], T]) -> T:
+        """Calls function unless a call for key is already in flight, in which case
+        waits for that call instead
+
+        Args:
+            key::Hashable
+                Identifies calls that can share a result
+
+            function::Callable[[], T]
+                The call to make
+
+        Returns:
+            result::T
+                Result of the call, exceptions raised by the call are raised to
+                every caller sharing it
+        """
+        with self.__lock:
+            call = self.__calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self.__calls[key] = Future()
+        if not leader:
+            return call.result()  # type: ignore
+        try:
+            result = function()
+        except BaseException as error:
+            self.__finish(key)
+            call.set_exception(error)
+            raise
+        self.__finish(key)
+        call.set_result(result)
+        return result
+
+    async def do_async(self, key: Hashable, function: Callable[[], Awaitable[T]]) -> T:
+        """Awaits function unless a call for key is already in flight, in which case
+        waits for that call instead. The call runs in its own task, so cancelling
+        one caller does not cancel the call for the others.
+
+        Args:
+            key::Hashable
+                Identifies calls that can share a result
+
+            function::Callable[[], Awaitable[T]]
+                The call to make
+
+        Returns:
+            result::T
+                Result of the call, exceptions raised by the call are raised to
+                every caller sharing it
+        """
+        with self.__lock:
+            task = self.__tasks.get(key)
+            if task is None:
+                task = self.__tasks[key] = asyncio.ensure_future(function())
+                task.add_done_callback(lambda _: self.__finish_task(key))
+        return await asyncio.shield(task)  # type: ignore
+
+    def __finish(self, key: Hashable):
+        with self.__lock:
+            del self.__calls[key]
+
+    def __finish_task(self, key: Hashable):
+        with self.__lock:
+            del self.__tasks[key]
@@ -0,0 +1,190 @@
+"""Sink module."""
+import logging
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Optional
+
+from .cache import cache_key
+from .client import SENTINEL_HUB_MAX_ROWS, SentinelHubClient
+from .main import default_client
+from .raw_sentinel_products_response import RawSentinelProductsResponse
+from .request.model import SentinelProductRequest
+
+# Found in the bytes of the first page, so that no page has to be decoded
+__TOTAL_RESULTS = re.compile(rb'"opensearch:totalResults"\s*:\s*"?(\d+)')
+
+
+class Sink(ABC):
+    """Base class of the destinations archive_sentinel_products writes the
+    undecoded pages of a query to"""
+
+    @abstractmethod
+    def write(
+        self,
+        sentinel_product_request: SentinelProductRequest,
+        raw_response: RawSentinelProductsResponse,
+    ):
+        """Writes the body of a successful response as is
+
+        Args:
+            sentinel_product_request::SentinelProductRequest
+                Details regarding the request of the page
+
+            raw_response::RawSentinelProductsResponse
+                Response to the request
+        """
+        raise NotImplementedError()
+
+
+class DirectorySink(Sink):
+    """Writes each page to its own json file in directory, named by the cache key of
+    its request so that archiving the same query again replaces its pages. Files
+    are written atomically.
+
+    Examples
+    ========
+    archive_sentinel_products(request, DirectorySink("archive/sentinel"))
+    """
+
+    __SUFFIX = ".json"
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory::str
+                Directory to write the pages to, created if it does not exist
+        """
+        self.__directory = os.path.expanduser(directory)
+        os.makedirs(self.__directory, exist_ok=True)
+
+    @property
+    def directory(self) -> str:
+        """Directory the pages are written to"""
+        return self.__directory
+
+    def path(self, sentinel_product_request: SentinelProductRequest) -> str:
+        """Path of the file the page of a request is written to
+
+        Args:
+            sentinel_product_request::SentinelProductRequest
+                Details regarding the request of the page
+
+        Returns:
+            path::str
+                Path of the file
+        """
+        return os.path.join(
+            self.__directory,
+            cache_key(sentinel_product_request) + DirectorySink.__SUFFIX,
+        )
+
+    def write(
+        self,
+        sentinel_product_request: SentinelProductRequest,
+        raw_response: RawSentinelProductsResponse,
+    ):
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.__directory, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "wb") as page_file:
+                page_file.write(raw_response.view)
+            os.replace(temporary_path, self.path(sentinel_product_request))
+        except BaseException:
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+            raise
+
+
+class StreamSink(Sink):
+    """Writes the pages one after another to a binary stream, each followed by a
+    newline, e.g. to a file, a pipe or a socket opened with socket.makefile("wb")
+
+    Examples
+    ========
+    with open("sentinel.jsonl", "wb") as archive_file:
+        archive_sentinel_products(request, StreamSink(archive_file))
+    """
+
+    def __init__(self, stream: BinaryIO, *, flush: bool = True):
+        """
+        Args:
+            stream::BinaryIO
+                Stream to write the pages to, it is not closed by the sink
+
+            flush::bool
+                Whether to flush the stream after each page, defaults to True
+        """
+        self.__stream = stream
+        self.__flush = flush
+
+    def write(
+        self,
+        sentinel_product_request: SentinelProductRequest,
+        raw_response: RawSentinelProductsResponse,
+    ):
+        self.__stream.write(raw_response.view)
+        self.__stream.write(b"\n")
+        if self.__flush:
+            self.__stream.flush()
+
+
+def archive_sentinel_products(
+    sentinel_product_request: SentinelProductRequest,
+    sink: Sink,
+    *,
+    client: Optional[SentinelHubClient] = None,
+    logger: Optional[logging.Logger] = None,
+) -> int:
+    """Writes every page of results matching the request to the sink as returned by
+    the Sentinel Hub, without decoding or re-encoding them.
+
+    The page size is the requested rows, capped at the Sentinel Hub limit of 100.
+    `opensearch:totalResults` is read from the bytes of the first page to find the
+    number of pages.
+
+    Args:
+        sentinel_product_request::SentinelProductRequest
+            Details regarding the request
+
+        sink::Sink
+            Destination of the pages
+
+        client::Optional[SentinelHubClient]
+            Client to query with, defaults to the shared client
+
+        logger::Optional[logging.Logger]
+            Logger to log information and error message defaults to None
+
+    Returns:
+        pages::int
+            Number of pages written to the sink
+
+    Raises:
+        QuerySentinelProductsError/IOError - if a page could not be retrieved
+    """
+    if client is None:
+        client = default_client()
+    page_size = min(
+        sentinel_product_request.rows or SENTINEL_HUB_MAX_ROWS, SENTINEL_HUB_MAX_ROWS
+    )
+    start = sentinel_product_request.start
+    total_results = None
+    pages = 0
+    while total_results is None or start < total_results:
+        page_request = sentinel_product_request._replace(start=start, rows=page_size)
+        raw_response = client.query_raw(page_request, logger=logger)
+        raw_response.raise_for_failure()
+        sink.write(page_request, raw_response)
+        pages += 1
+        if total_results is None:
+            match = __TOTAL_RESULTS.search(raw_response.view)
+            if match is None:
+                break
+            total_results = int(match.group(1))
+        start += page_size
+    return pages
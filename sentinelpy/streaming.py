@@ -0,0 +1,159 @@
+"""Streaming module."""
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .json_decoder import decode_json
+from .projection import project_entry
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - ijson is optional
+    ijson = None  # type: ignore
+
+__STRUCTURE = re.compile(rb'[{}\[\]",:]')
+__STRING_END = re.compile(rb'(?:[^"\\]|\\.)*"', re.DOTALL)
+__ENTRY_PATH = ["feed", "entry"]
+
+
+def iter_feed_entries(
+    chunks: Iterable[bytes], *, fields: Optional[Iterable[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """Incrementally parses the json body of a Sentinel Hub response, yielding each
+    product (feed entry) as soon as it has been read, so that the body is never held
+    in memory as a whole.
+
+    Uses ijson if it is installed, otherwise a pure Python tokenizer that only
+    follows the structure of the body and decodes each entry on its own with the
+    current json decoder, see set_json_decoder.
+
+    Args:
+        chunks::Iterable[bytes]
+            The body of the response in chunks of any size, e.g.
+            requests.Response.iter_content
+
+        fields::Optional[Iterable[str]]
+            Names of the fields to keep of each product, the rest are dropped as
+            soon as the product is parsed, see project_entry. Defaults to None (keep
+            every field)
+
+    Returns:
+        entries::Iterator[Dict[str, Any]]
+            The products (feed entries) in the order of the body, a single product
+            is yielded the same as a list of one
+
+    Raises:
+        ValueError - if the body is not valid json
+    """
+    entries = (
+        __iter_feed_entries(chunks)
+        if ijson is None
+        else __iter_feed_entries_ijson(chunks)
+    )
+    if fields is None:
+        return entries
+    kept = frozenset(fields).union(("id",))
+    return (project_entry(entry, kept) for entry in entries)
+
+
+def __iter_feed_entries(chunks: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+    chunk_iterator = iter(chunks)
+    buffer = b""
+    position = 0
+    # Each open container, with the key being read when it is an object
+    containers: List[List[Any]] = []
+    expect_key = False
+    entry_start: Optional[int] = None
+    entry_depth = 0
+    started = False
+
+    while True:
+        match = __STRUCTURE.search(buffer, position)
+        end = None
+        if match is not None and match.group() == b'"':
+            string_end = __STRING_END.match(buffer, match.end())
+            end = None if string_end is None else string_end.end()
+        if match is None or (match.group() == b'"' and end is None):
+            chunk = next(chunk_iterator, None)
+            if chunk is None:
+                break
+            # Only keep the unread part of the buffer and the entry being read
+            keep_from = position if entry_start is None else entry_start
+            if match is not None:
+                keep_from = min(keep_from, match.start())
+            buffer = buffer[keep_from:] + chunk
+            position -= keep_from
+            if entry_start is not None:
+                entry_start -= keep_from
+            continue
+
+        token = match.group()
+        position = match.end() if end is None else end
+        if entry_start is not None:
+            if token in b"{[":
+                entry_depth += 1
+            elif token in b"}]":
+                entry_depth -= 1
+                if entry_depth == 0:
+                    yield decode_json(buffer[entry_start:position])
+                    entry_start = None
+                    containers.pop()
+                    expect_key = False
+            continue
+
+        if token in b"{[":
+            in_entries = containers == [["{", "feed"], ["{", "entry"]] or (
+                containers == [["{", "feed"], ["{", "entry"], ["[", None]]
+            )
+            if token == b"{" and in_entries and not expect_key:
+                entry_start = match.start()
+                entry_depth = 1
+            containers.append([token.decode(), None])
+            expect_key = token == b"{"
+            started = True
+        elif token in b"}]":
+            if not containers:
+                raise ValueError("Unexpected end of container")
+            containers.pop()
+            expect_key = False
+        elif token == b",":
+            expect_key = bool(containers) and containers[-1][0] == "{"
+        elif token == b":":
+            expect_key = False
+        elif expect_key:
+            # Keys are only decoded down to the entries
+            if len(containers) <= len(__ENTRY_PATH):
+                containers[-1][1] = json.loads(buffer[match.start() : position])
+            else:
+                containers[-1][1] = None
+    if not started or containers or entry_start is not None:
+        raise ValueError("Incomplete json body")
+
+
+def __iter_feed_entries_ijson(  # pragma: no cover - ijson is optional
+    chunks: Iterable[bytes],
+) -> Iterator[Dict[str, Any]]:
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+    builder = None
+    entry_prefix = None
+    try:
+        for chunk in chunks:
+            parser.send(chunk)
+            for prefix, event, value in events:
+                if builder is None:
+                    if event != "start_map" or prefix not in (
+                        "feed.entry",
+                        "feed.entry.item",
+                    ):
+                        continue
+                    builder = ijson.ObjectBuilder()
+                    entry_prefix = prefix
+                builder.event(event, value)
+                if event == "end_map" and prefix == entry_prefix:
+                    yield builder.value
+                    builder = None
+            del events[:]
+        parser.close()
+    except ijson.JSONError as json_error:
+        raise ValueError(str(json_error)) from json_error
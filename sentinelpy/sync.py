@@ -0,0 +1,282 @@
+"""Sync module."""
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .client import SENTINEL_HUB_MAX_ROWS, SentinelHubClient
+from .main import default_client
+from .pagination import iter_sentinel_products
+from .request.request_query_builder import RequestQueryBuilder
+from .request.sentinel_product_request_builder import SentinelProductRequestBuilder
+from .request.value_formatters import format_date
+
+__DATE_FORMATS = ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ")
+
+
+class SyncState(NamedTuple):
+    """Progress of a subscription, the latest ingestion date seen and the ids of the
+    products ingested within the overlap before it"""
+
+    watermark: datetime
+    overlap_ids: FrozenSet[str]
+
+
+class SyncStateStore:
+    """Small JSON file holding the SyncState of each named subscription. Every change
+    is written atomically, so the file is never left half written.
+
+    Examples
+    ========
+    store = SyncStateStore("~/.local/state/sentinelpy/sync.json")
+    print(store.get("solent-s1"))
+    """
+
+    __WATERMARK_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path::str
+                Path of the JSON file, created with its directory when first written
+        """
+        self.__path = os.path.expanduser(path)
+        self.__lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        """Path of the JSON file"""
+        return self.__path
+
+    def get(self, subscription: str) -> Optional[SyncState]:
+        """Looks up the state of a subscription
+
+        Args:
+            subscription::str
+                Name of the subscription
+
+        Returns:
+            state::Optional[SyncState]
+                State of the subscription, None if it has not been synced
+        """
+        with self.__lock:
+            state = self.__read().get(subscription)
+        if state is None:
+            return None
+        return SyncState(
+            datetime.strptime(state["watermark"], SyncStateStore.__WATERMARK_FORMAT),
+            frozenset(state["overlap_ids"]),
+        )
+
+    def put(self, subscription: str, state: SyncState):
+        """Stores the state of a subscription
+
+        Args:
+            subscription::str
+                Name of the subscription
+
+            state::SyncState
+                The new state of the subscription
+        """
+        with self.__lock:
+            states = self.__read()
+            states[subscription] = {
+                "watermark": state.watermark.astimezone(timezone.utc).strftime(
+                    SyncStateStore.__WATERMARK_FORMAT
+                ),
+                "overlap_ids": sorted(state.overlap_ids),
+            }
+            self.__write(states)
+
+    def remove(self, subscription: str):
+        """Forgets a subscription, so that its next sync starts from scratch
+
+        Args:
+            subscription::str
+                Name of the subscription
+        """
+        with self.__lock:
+            states = self.__read()
+            if states.pop(subscription, None) is not None:
+                self.__write(states)
+
+    def __read(self) -> Dict[str, Any]:
+        try:
+            with open(self.__path) as state_file:
+                return json.load(state_file)
+        except FileNotFoundError:
+            return {}
+
+    def __write(self, states: Dict[str, Any]):
+        directory = os.path.dirname(self.__path) or "."
+        os.makedirs(directory, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "w") as state_file:
+                json.dump(states, state_file, indent=2, sort_keys=True)
+            os.replace(temporary_path, self.__path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+
+def sync_sentinel_products(
+    subscription: str,
+    query: Union[str, RequestQueryBuilder],
+    *,
+    username: str,
+    password: str,
+    store: SyncStateStore,
+    overlap: timedelta = timedelta(hours=1),
+    since: Optional[datetime] = None,
+    client: Optional[SentinelHubClient] = None,
+    logger: Optional[logging.Logger] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Iterates over the products matching a query that were ingested since the
+    previous sync of the subscription, so that polling only fetches new products.
+
+    The store keeps the latest ingestion date seen by each subscription, its
+    watermark. Each sync only fetches products ingested from the watermark minus
+    overlap onwards, in ingestion date order. The overlap catches products that
+    become visible on the hub after products with a later ingestion date, and the
+    products in it that were already yielded by the previous sync are skipped.
+
+    The new state is stored once the last product has been yielded, a sync that
+    fails or is not iterated to the end is repeated in full by the next sync.
+
+    Args:
+        subscription::str
+            Name of the subscription the progress is stored under
+
+        query::Union[str, RequestQueryBuilder]
+            The query to sync, it should not filter on ingestiondate itself
+
+        username::str
+            The username for the Sentinel Hub API
+
+        password::str
+            The password for the Sentinel Hub API
+
+        store::SyncStateStore
+            Store holding the progress of each subscription
+
+        overlap::timedelta
+            How far before the watermark each sync starts, defaults to 1 hour
+
+        since::Optional[datetime]
+            Ingestion date the first sync of the subscription starts from, naive
+            datetimes are treated as UTC, defaults to None (every product)
+
+        client::Optional[SentinelHubClient]
+            Client to query with, defaults to the shared client
+
+        logger::Optional[logging.Logger]
+            Logger to log information and error message defaults to None
+
+    Returns:
+        products::Iterator[Dict[str, Any]]
+            The new products (feed entries) in ingestion date order
+
+    Raises:
+        QuerySentinelProductsError/IOError - if a page could not be retrieved
+        ValueError - if subscription is empty, overlap is negative or username or
+        password missing
+    """
+    if not subscription:
+        raise ValueError("subscription must not be empty")
+    if overlap < timedelta(0):
+        raise ValueError("overlap must not be negative")
+    if client is None:
+        client = default_client()
+    state = store.get(subscription)
+    start = since if state is None else state.watermark - overlap
+    query_builder = RequestQueryBuilder()
+    query_string = query if isinstance(query, str) else query.build()
+    if start is not None:
+        if query_string != "*":
+            query_builder.group_(query_string).and_()
+        query_string = query_builder.ingestion_date(format_date(start), "NOW").build()
+    sentinel_product_request = (
+        SentinelProductRequestBuilder()
+        .with_username(username)
+        .with_password(password)
+        .with_query(query_string)
+        .with_rows(SENTINEL_HUB_MAX_ROWS)
+        .with_order_by("ingestiondate asc")
+        .build()
+    )
+    return __iter_new_products(
+        subscription,
+        iter_sentinel_products(sentinel_product_request, client=client, logger=logger),
+        store,
+        state,
+        overlap,
+    )
+
+
+def __iter_new_products(
+    subscription: str,
+    products: Iterator[Dict[str, Any]],
+    store: SyncStateStore,
+    state: Optional[SyncState],
+    overlap: timedelta,
+) -> Iterator[Dict[str, Any]]:
+    previous_ids = frozenset() if state is None else state.overlap_ids
+    watermark = None if state is None else state.watermark
+    # Products arrive in ingestion date order, so the ids that fall out of the
+    # overlap as the watermark moves are dropped from the front
+    overlap_products: Deque[Tuple[datetime, str]] = deque()
+    for product in products:
+        ingestion_date = __ingestion_date(product)
+        if ingestion_date is not None:
+            if watermark is None or ingestion_date > watermark:
+                watermark = ingestion_date
+            overlap_start = watermark - overlap
+            if ingestion_date >= overlap_start:
+                overlap_products.append((ingestion_date, product["id"]))
+            while overlap_products and overlap_products[0][0] < overlap_start:
+                overlap_products.popleft()
+        if product.get("id") not in previous_ids:
+            yield product
+    if watermark is None:
+        return
+    overlap_start = watermark - overlap
+    store.put(
+        subscription,
+        SyncState(
+            watermark,
+            frozenset(
+                product_id
+                for ingestion_date, product_id in overlap_products
+                if ingestion_date >= overlap_start
+            ),
+        ),
+    )
+
+
+def __ingestion_date(product: Dict[str, Any]) -> Optional[datetime]:
+    dates = product.get("date", [])
+    for date in dates if isinstance(dates, list) else [dates]:
+        if date.get("name") == "ingestiondate":
+            for date_format in __DATE_FORMATS:
+                try:
+                    return datetime.strptime(date["content"], date_format).replace(
+                        tzinfo=timezone.utc
+                    )
+                except ValueError:
+                    continue
+    return None
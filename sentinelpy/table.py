@@ -0,0 +1,514 @@
+"""Table module."""
+import math
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timezone
+from enum import Enum
+from functools import lru_cache
+from itertools import compress
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .query_sentinel_products_response import QuerySentinelProductsResponse
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - numpy is optional
+    numpy = None  # type: ignore
+
+Range = Tuple[Any, Any]
+
+
+class ProductTable:
+    """Columnar container of products (feed entries), for filtering, sorting and
+    grouping large result sets one column at a time instead of product by product.
+
+    Dates (as seconds since the epoch) and other numeric fields are stored in
+    typed arrays, a missing value is NaN for float columns and -1 for integer
+    columns. Fields with few distinct values, e.g. platform_name, are dictionary
+    encoded, stored as an array of codes into a list of the distinct values with -1
+    for a missing value. The arrays can be viewed as NumPy arrays without copying
+    when NumPy is installed.
+
+    Filtering, sorting and grouping return new tables sharing the entries and
+    dictionaries of this one, and are done on NumPy views of the arrays when NumPy
+    is installed.
+
+    Examples
+    ========
+    table = ProductTable.from_responses(responses)
+    clear = table.filter(
+        platform_name=PlatformName.SENTINEL_2, cloud_cover_percentage=(0, 10)
+    ).sort("begin_position")
+    for orbit, products in clear.group_by("relative_orbit_number").items():
+        print(orbit, len(products))
+    """
+
+    __DICTIONARY_COLUMNS = {
+        "platform_name": "platformname",
+        "product_type": "producttype",
+        "orbit_direction": "orbitdirection",
+        "polarisation_mode": "polarisationmode",
+        "sensor_operational_mode": "sensoroperationalmode",
+    }
+    __DATE_COLUMNS = {
+        "begin_position": "beginposition",
+        "end_position": "endposition",
+        "ingestion_date": "ingestiondate",
+    }
+    __INTEGER_COLUMNS = {
+        "orbit_number": "orbitnumber",
+        "relative_orbit_number": "relativeorbitnumber",
+    }
+    __FLOAT_COLUMNS = {"cloud_cover_percentage": "cloudcoverpercentage"}
+    __EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+    def __init__(self, products: Iterable[Dict[str, Any]] = ()):
+        """
+        Args:
+            products::Iterable[Dict[str, Any]]
+                The products (feed entries) of the table, e.g. from
+                iter_sentinel_products
+        """
+        self.__entries: List[Dict[str, Any]] = []
+        self.__dictionaries: Dict[str, List[str]] = {
+            column: [] for column in ProductTable.__DICTIONARY_COLUMNS
+        }
+        self.__arrays: Dict[str, array] = {
+            column: array("l")
+            for column in (
+                *ProductTable.__DICTIONARY_COLUMNS,
+                *ProductTable.__INTEGER_COLUMNS,
+            )
+        }
+        for column in (*ProductTable.__DATE_COLUMNS, *ProductTable.__FLOAT_COLUMNS):
+            self.__arrays[column] = array("d")
+        self.__extend(products)
+
+    @classmethod
+    def from_responses(
+        cls, responses: Iterable[QuerySentinelProductsResponse]
+    ) -> "ProductTable":
+        """Table of the products of every response, e.g. each page of a query
+
+        Args:
+            responses::Iterable[QuerySentinelProductsResponse]
+                The responses
+
+        Returns:
+            table::ProductTable
+                Table of the products in the order of the responses
+
+        Raises:
+            QuerySentinelProductsError/IOError - if a response is unsuccessful
+        """
+
+        def entries(response: QuerySentinelProductsResponse):
+            response.raise_for_failure()
+            return response.entries
+
+        return cls(entry for response in responses for entry in entries(response))
+
+    @property
+    def columns(self) -> List[str]:
+        """Names of the columns"""
+        return list(self.__arrays)
+
+    @property
+    def entries(self) -> List[Dict[str, Any]]:
+        """The products (feed entries) in the order of the table"""
+        return self.__entries
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def column(self, name: str) -> List[Any]:
+        """Values of a column, decoded to str, datetime, int or float with None for
+        missing values
+
+        Args:
+            name::str
+                Name of the column e.g. begin_position
+
+        Returns:
+            values::List[Any]
+                Value of the column of each product
+
+        Raises:
+            KeyError - if there is no such column
+        """
+        values = self.__arrays[name]
+        if name in ProductTable.__DICTIONARY_COLUMNS:
+            dictionary = self.__dictionaries[name]
+            return [dictionary[code] if code >= 0 else None for code in values]
+        if name in ProductTable.__DATE_COLUMNS:
+            return [
+                None
+                if math.isnan(value)
+                else datetime.fromtimestamp(value, timezone.utc)
+                for value in values
+            ]
+        if name in ProductTable.__INTEGER_COLUMNS:
+            return [None if value < 0 else value for value in values]
+        return [None if math.isnan(value) else value for value in values]
+
+    def values(self, name: str) -> array:
+        """Typed array of a column, dictionary encoded columns as their codes and
+        dates as seconds since the epoch
+
+        Args:
+            name::str
+                Name of the column
+
+        Returns:
+            values::array
+                The array of the column, shared with the table
+
+        Raises:
+            KeyError - if there is no such column
+        """
+        return self.__arrays[name]
+
+    def codes(self, name: str) -> Tuple[array, List[str]]:
+        """Dictionary encoding of a column
+
+        Args:
+            name::str
+                Name of a dictionary encoded column e.g. platform_name
+
+        Returns:
+            encoding::Tuple[array, List[str]]
+                Code of each product, -1 if missing, and the value of each code
+
+        Raises:
+            KeyError - if there is no such dictionary encoded column
+        """
+        return self.__arrays[name], self.__dictionaries[name]
+
+    def to_numpy(self, name: str) -> Any:
+        """NumPy view of the array of a column, without copying. Dictionary encoded
+        columns are viewed as their codes and dates as seconds since the epoch
+
+        Args:
+            name::str
+                Name of the column
+
+        Returns:
+            view::numpy.ndarray
+                View of the array of the column
+
+        Raises:
+            ImportError - if NumPy is not installed
+            KeyError - if there is no such column
+        """
+        if numpy is None:
+            raise ImportError("to_numpy requires NumPy to be installed")
+        return ProductTable.__view(self.__arrays[name])
+
+    def where(self, mask: Iterable[Any]) -> "ProductTable":
+        """Products whose mask value is true, e.g. computed with to_numpy
+
+        Args:
+            mask::Iterable[Any]
+                Whether to keep each product, in the order of the table
+
+        Returns:
+            table::ProductTable
+                Table of the kept products
+        """
+        if numpy is not None and isinstance(mask, numpy.ndarray):
+            return self.__take(numpy.flatnonzero(mask))
+        return self.__take(list(compress(range(len(self)), mask)))
+
+    def filter(
+        self,
+        *,
+        platform_name: Union[Enum, str, None] = None,
+        product_type: Union[Enum, str, None] = None,
+        orbit_direction: Union[Enum, str, None] = None,
+        relative_orbit_number: Optional[int] = None,
+        cloud_cover_percentage: Optional[Range] = None,
+        begin_position: Optional[Range] = None,
+        end_position: Optional[Range] = None,
+        ingestion_date: Optional[Range] = None,
+    ) -> "ProductTable":
+        """Products matching every filter given. Ranges are inclusive and dates
+        naive datetimes are treated as UTC
+
+        Args:
+            platform_name::Union[Enum, str, None]
+                Platform e.g. PlatformName.SENTINEL_1
+
+            product_type::Union[Enum, str, None]
+                Product type e.g. Sentinel1ProductType.GRD
+
+            orbit_direction::Union[Enum, str, None]
+                Orbit direction, matched ignoring case
+
+            relative_orbit_number::Optional[int]
+                Relative orbit
+
+            cloud_cover_percentage::Optional[Tuple[float, float]]
+                Range of the cloud cover percentage
+
+            begin_position::Optional[Tuple[datetime, datetime]]
+                Range of the sensing start
+
+            end_position::Optional[Tuple[datetime, datetime]]
+                Range of the sensing end
+
+            ingestion_date::Optional[Tuple[datetime, datetime]]
+                Range of the ingestion date
+
+        Returns:
+            table::ProductTable
+                Table of the matching products
+        """
+        masks: List[Any] = []
+        for name, value in (
+            ("platform_name", platform_name),
+            ("product_type", product_type),
+            ("orbit_direction", orbit_direction),
+        ):
+            if value is not None:
+                masks.append(self.__equals(name, value))
+        if relative_orbit_number is not None:
+            relative_orbit_numbers = self.__arrays["relative_orbit_number"]
+            masks.append(
+                map(relative_orbit_number.__eq__, relative_orbit_numbers)
+                if numpy is None
+                else ProductTable.__view(relative_orbit_numbers)
+                == relative_orbit_number
+            )
+        if cloud_cover_percentage is not None:
+            masks.append(
+                self.__between("cloud_cover_percentage", *cloud_cover_percentage)
+            )
+        for name, date_range in (
+            ("begin_position", begin_position),
+            ("end_position", end_position),
+            ("ingestion_date", ingestion_date),
+        ):
+            if date_range is not None:
+                masks.append(
+                    self.__between(
+                        name, *(ProductTable.__timestamp(date) for date in date_range)
+                    )
+                )
+        if not masks:
+            return self.__take(list(range(len(self))))
+        if numpy is not None:
+            return self.where(numpy.logical_and.reduce(masks))
+        return self.where(map(all, zip(*masks)))
+
+    def sort(self, name: str, *, descending: bool = False) -> "ProductTable":
+        """Products ordered by a column, products missing the value last
+
+        Args:
+            name::str
+                Name of the column to order by
+
+            descending::bool
+                Whether to order from the largest value, defaults to False
+
+        Returns:
+            table::ProductTable
+                Table of the ordered products
+
+        Raises:
+            KeyError - if there is no such column
+        """
+        values = self.__arrays[name]
+        if name in ProductTable.__DICTIONARY_COLUMNS:
+            dictionary = self.__dictionaries[name]
+            ranks = array("l", [0] * len(dictionary))
+            for rank, code in enumerate(
+                sorted(range(len(dictionary)), key=dictionary.__getitem__)
+            ):
+                ranks[code] = rank
+            # The code -1 of a missing value picks this last rank of -1
+            ranks.append(-1)
+            keys: Any = (
+                [ranks[code] for code in values]
+                if numpy is None
+                else ProductTable.__view(ranks)[ProductTable.__view(values)]
+            )
+        else:
+            keys = values if numpy is None else ProductTable.__view(values)
+        has_nan = name in ProductTable.__DATE_COLUMNS
+        has_nan = has_nan or name in ProductTable.__FLOAT_COLUMNS
+        if numpy is not None:
+            missing = numpy.isnan(keys) if has_nan else keys == -1
+            present = numpy.flatnonzero(~missing)
+            order = numpy.argsort(
+                -keys[present] if descending else keys[present], kind="stable"
+            )
+            return self.__take(
+                numpy.concatenate((present[order], numpy.flatnonzero(missing)))
+            )
+        is_missing: Callable[[Any], bool] = math.isnan if has_nan else (-1).__eq__
+        present = [index for index in range(len(keys)) if not is_missing(keys[index])]
+        missing = [index for index in range(len(keys)) if is_missing(keys[index])]
+        present.sort(key=keys.__getitem__, reverse=descending)
+        return self.__take(present + missing)
+
+    def group_by(self, name: str) -> "OrderedDict[Any, ProductTable]":
+        """Products grouped by the value of a dictionary encoded or integer column
+
+        Args:
+            name::str
+                Name of the column e.g. relative_orbit_number
+
+        Returns:
+            groups::OrderedDict[Any, ProductTable]
+                Table of the products of each value, in order of first appearance,
+                products missing the value are grouped under None
+
+        Raises:
+            KeyError - if there is no such dictionary encoded or integer column
+        """
+        if name not in ProductTable.__DICTIONARY_COLUMNS:
+            if name not in ProductTable.__INTEGER_COLUMNS:
+                raise KeyError(name)
+        values = self.__arrays[name]
+        groups: "OrderedDict[int, Any]" = OrderedDict()
+        if numpy is None:
+            for index, value in enumerate(values):
+                groups.setdefault(value, []).append(index)
+        else:
+            distinct, first, inverse = numpy.unique(
+                ProductTable.__view(values), return_index=True, return_inverse=True
+            )
+            # Indices of the products ordered by group, split at the end of each
+            indices = numpy.split(
+                numpy.argsort(inverse.ravel(), kind="stable"),
+                numpy.cumsum(numpy.bincount(inverse.ravel()))[:-1],
+            )
+            for group in numpy.argsort(first).tolist():
+                groups[int(distinct[group])] = indices[group]
+        dictionary = self.__dictionaries.get(name)
+        return OrderedDict(
+            (
+                None
+                if value < 0
+                else (dictionary[value] if dictionary is not None else value),
+                self.__take(indices),
+            )
+            for value, indices in groups.items()
+        )
+
+    def __equals(self, name: str, value: Union[Enum, str]) -> Any:
+        text = value.value if isinstance(value, Enum) else value
+        dictionary = self.__dictionaries[name]
+        matching = {
+            code
+            for code, candidate in enumerate(dictionary)
+            if candidate == text
+            or (name == "orbit_direction" and candidate.upper() == text.upper())
+        }
+        if numpy is not None:
+            return numpy.isin(ProductTable.__view(self.__arrays[name]), list(matching))
+        return map(matching.__contains__, self.__arrays[name])
+
+    def __between(self, name: str, low: float, high: float) -> Any:
+        if numpy is not None:
+            values = ProductTable.__view(self.__arrays[name])
+            return (values >= low) & (values <= high)
+        return (low <= value <= high for value in self.__arrays[name])
+
+    def __take(self, indices: Any) -> "ProductTable":
+        table = ProductTable()
+        table.__dictionaries = self.__dictionaries
+        if numpy is None:
+            table.__entries = [self.__entries[index] for index in indices]
+            table.__arrays = {
+                name: array(values.typecode, [values[index] for index in indices])
+                for name, values in self.__arrays.items()
+            }
+            return table
+        indices = numpy.asarray(indices, dtype=numpy.intp)
+        table.__entries = [self.__entries[index] for index in indices.tolist()]
+        table.__arrays = {
+            name: array(values.typecode, ProductTable.__view(values)[indices].tobytes())
+            for name, values in self.__arrays.items()
+        }
+        return table
+
+    @staticmethod
+    def __view(values: array) -> Any:
+        return numpy.frombuffer(values, dtype=values.typecode)
+
+    def __extend(self, products: Iterable[Dict[str, Any]]):
+        # The fields of each product are gathered in a single pass, then each column
+        # is converted at once rather than product by product
+        rows = []
+        for product in products:
+            self.__entries.append(product)
+            fields = {}
+            for field_type in ("str", "date", "int", "double"):
+                values = product.get(field_type)
+                if values is None:
+                    continue
+                if isinstance(values, list):
+                    for value in values:
+                        fields[value.get("name")] = value.get("content")
+                else:
+                    fields[values.get("name")] = values.get("content")
+            rows.append(fields)
+        for column, field in ProductTable.__DICTIONARY_COLUMNS.items():
+            codes: Dict[Optional[str], int] = {None: -1}
+            self.__arrays[column].extend(
+                [codes.setdefault(row.get(field), len(codes) - 1) for row in rows]
+            )
+            self.__dictionaries[column].extend(
+                value for value in codes if value is not None
+            )
+        for column, field in ProductTable.__DATE_COLUMNS.items():
+            self.__arrays[column].extend(
+                [ProductTable.__parse_date(row.get(field)) for row in rows]
+            )
+        for column, field in ProductTable.__INTEGER_COLUMNS.items():
+            self.__arrays[column].extend(
+                [
+                    -1 if value is None else int(value)
+                    for value in (row.get(field) for row in rows)
+                ]
+            )
+        for column, field in ProductTable.__FLOAT_COLUMNS.items():
+            self.__arrays[column].extend(
+                [
+                    math.nan if value is None else float(value)
+                    for value in (row.get(field) for row in rows)
+                ]
+            )
+
+    @staticmethod
+    def __parse_date(value: Optional[str]) -> float:
+        # Dates are yyyy-mm-ddThh:mm:ss[.fff]Z, sliced rather than parsed with
+        # strptime as tables are built from many products
+        if value is None:
+            return math.nan
+        try:
+            return (
+                ProductTable.__day_timestamp(value[0:10])
+                + int(value[11:13]) * 3600
+                + int(value[14:16]) * 60
+                + int(value[17:19])
+                + (float(value[19:-1]) if value[19:20] == "." else 0.0)
+            )
+        except ValueError:
+            return math.nan
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def __day_timestamp(day: str) -> float:
+        # Products of a table mostly share a few days
+        return (
+            datetime(int(day[0:4]), int(day[5:7]), int(day[8:10]), tzinfo=timezone.utc)
+            - ProductTable.__EPOCH
+        ).total_seconds()
+
+    @staticmethod
+    def __timestamp(value: datetime) -> float:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
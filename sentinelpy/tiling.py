@@ -0,0 +1,247 @@
+"""Tiling module."""
+import logging
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .client import SentinelHubClient
+from .main import default_client
+from .pagination import iter_merged_sentinel_products
+from .request.request_query_builder import RequestQueryBuilder
+from .request.sentinel_product_request_builder import SentinelProductRequestBuilder
+
+Point = Tuple[float, float]
+
+__POLYGON_PATTERN = re.compile(r"(?si)POLYGON\s*\(\((.+?)\)")
+
+
+def tile_footprint(footprint: str, rows: int, columns: int) -> List[str]:
+    """Splits the bounding box of a WKT polygon into a grid of rows x columns
+    rectangular cells, cells that do not overlap the polygon are dropped.
+
+    The cells are not clipped to the polygon, as clipping a concave polygon can give
+    invalid (self-overlapping) polygons, so products in the returned cells may lie
+    outside the polygon. Query each cell together with the polygon itself, as
+    iter_tiled_sentinel_products does.
+
+    Args:
+        footprint::str
+            WKT polygon without cut outs as accepted by RequestQueryBuilder.footprint
+            e.g. POLYGON((30 10, 40 40, 20 40, 10 20, 30 10))
+
+        rows::int
+            Number of rows (latitude bands) in the grid
+
+        columns::int
+            Number of columns (longitude bands) in the grid
+
+    Returns:
+        tiles::List[str]
+            WKT polygons of the cells covering the footprint, ordered by row then
+            column
+
+    Raises:
+        ValueError - if footprint is not a WKT polygon or rows/columns less than 1
+    """
+    if rows < 1 or columns < 1:
+        raise ValueError("rows and columns must be at least 1")
+    polygon = __parse_polygon(footprint)
+    min_x = min(x for x, _ in polygon)
+    max_x = max(x for x, _ in polygon)
+    min_y = min(y for _, y in polygon)
+    max_y = max(y for _, y in polygon)
+    cell_width = (max_x - min_x) / columns
+    cell_height = (max_y - min_y) / rows
+
+    tiles = []
+    for row in range(rows):
+        for column in range(columns):
+            cell_min_x = min_x + column * cell_width
+            cell_min_y = min_y + row * cell_height
+            cell_max_x = (
+                max_x if column == columns - 1 else min_x + (column + 1) * cell_width
+            )
+            cell_max_y = max_y if row == rows - 1 else min_y + (row + 1) * cell_height
+            overlap = __clip(polygon, cell_min_x, cell_min_y, cell_max_x, cell_max_y)
+            if __area(overlap) > 0:
+                tiles.append(
+                    __format_polygon(
+                        [
+                            (cell_min_x, cell_min_y),
+                            (cell_max_x, cell_min_y),
+                            (cell_max_x, cell_max_y),
+                            (cell_min_x, cell_max_y),
+                        ]
+                    )
+                )
+    return tiles
+
+
+def iter_tiled_sentinel_products(
+    query: Union[str, RequestQueryBuilder],
+    footprint: str,
+    *,
+    rows: int,
+    columns: int,
+    username: str,
+    password: str,
+    client: Optional[SentinelHubClient] = None,
+    max_workers: int = 4,
+    fields: Optional[Iterable[str]] = None,
+    logger: Optional[logging.Logger] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Iterates over every product matching a query within a large footprint by
+    splitting the footprint into tiles (see tile_footprint), querying the tiles in
+    parallel and merging them into a single stream. Each tile is queried together
+    with the footprint itself, so only products intersecting the footprint are
+    returned. Products intersecting more than one tile are only yielded once.
+
+    Args:
+        query::Union[str, RequestQueryBuilder]
+            The query to run for each tile, it should not filter on footprint itself
+
+        footprint::str
+            WKT polygon to tile
+
+        rows::int
+            Number of rows (latitude bands) in the grid
+
+        columns::int
+            Number of columns (longitude bands) in the grid
+
+        username::str
+            The username for the Sentinel Hub API
+
+        password::str
+            The password for the Sentinel Hub API
+
+        client::Optional[SentinelHubClient]
+            Client to query with, defaults to the shared client. Its pool_size
+            should be at least max_workers
+
+        max_workers::int
+            Maximum number of tiles queried at once, defaults to 4
+
+        fields::Optional[Iterable[str]]
+            Names of the fields to keep of each product, e.g. footprint, the rest
+            are dropped as each page is received, see project_entry. Defaults to
+            None (keep every field)
+
+        logger::Optional[logging.Logger]
+            Logger to log information and error message defaults to None
+
+    Returns:
+        products::Iterator[Dict[str, Any]]
+            The unique products (feed entries) in no defined order
+
+    Raises:
+        QuerySentinelProductsError/IOError - if a page could not be retrieved
+        ValueError - if the arguments are invalid or username or password missing
+    """
+    if client is None:
+        client = default_client()
+    query_string = query if isinstance(query, str) else query.build()
+    sentinel_product_requests = []
+    for tile in tile_footprint(footprint, rows, columns):
+        query_builder = RequestQueryBuilder()
+        if query_string != "*":
+            query_builder.group_(query_string).and_()
+        sentinel_product_requests.append(
+            SentinelProductRequestBuilder()
+            .with_username(username)
+            .with_password(password)
+            .with_query(query_builder.footprint(tile).and_().footprint(footprint))
+            .build()
+        )
+    return iter_merged_sentinel_products(
+        sentinel_product_requests,
+        client=client,
+        max_workers=max_workers,
+        fields=fields,
+        logger=logger,
+    )
+
+
+def __parse_polygon(footprint: str) -> List[Point]:
+    match = __POLYGON_PATTERN.search(footprint)
+    try:
+        if match is None:
+            raise ValueError(footprint)
+        polygon = [
+            (float(x), float(y))
+            for x, y in (point.split() for point in match.group(1).split(","))
+        ]
+    except ValueError:
+        raise ValueError("footprint must be a WKT polygon")
+    if polygon[0] == polygon[-1]:
+        polygon = polygon[:-1]
+    if len(polygon) < 3:
+        raise ValueError("footprint must be a WKT polygon")
+    return polygon
+
+
+def __clip(
+    polygon: List[Point], min_x: float, min_y: float, max_x: float, max_y: float
+) -> List[Point]:
+    # Sutherland-Hodgman clipping against each edge of the cell in turn. A concave
+    # polygon can give degenerate edges along the cell, so only the area of the
+    # result is meaningful
+    edges: List[Tuple[Callable[[Point], bool], Callable[[Point, Point], Point]]] = [
+        (lambda p: p[0] >= min_x, lambda a, b: __intersect_x(a, b, min_x)),
+        (lambda p: p[0] <= max_x, lambda a, b: __intersect_x(a, b, max_x)),
+        (lambda p: p[1] >= min_y, lambda a, b: __intersect_y(a, b, min_y)),
+        (lambda p: p[1] <= max_y, lambda a, b: __intersect_y(a, b, max_y)),
+    ]
+    clipped = polygon
+    for inside, intersect in edges:
+        points, clipped = clipped, []
+        for index, current in enumerate(points):
+            previous = points[index - 1]
+            if inside(current):
+                if not inside(previous):
+                    clipped.append(intersect(previous, current))
+                clipped.append(current)
+            elif inside(previous):
+                clipped.append(intersect(previous, current))
+    return clipped
+
+
+def __area(polygon: List[Point]) -> float:
+    return abs(
+        sum(
+            polygon[index - 1][0] * y - x * polygon[index - 1][1]
+            for index, (x, y) in enumerate(polygon)
+        )
+        / 2
+    )
+
+
+def __intersect_x(a: Point, b: Point, x: float) -> Point:
+    return x, a[1] + (b[1] - a[1]) * (x - a[0]) / (b[0] - a[0])
+
+
+def __intersect_y(a: Point, b: Point, y: float) -> Point:
+    return a[0] + (b[0] - a[0]) * (y - a[1]) / (b[1] - a[1]), y
+
+
+def __format_polygon(polygon: List[Point]) -> str:
+    points: List[str] = []
+    for x, y in polygon + [polygon[0]]:
+        point = f"{__format_number(x)} {__format_number(y)}"
+        if not points or points[-1] != point:
+            points.append(point)
+    return f"POLYGON(({', '.join(points)}))"
+
+
+def __format_number(value: float) -> str:
+    formatted = f"{value:.6f}".rstrip("0").rstrip(".")
+    return "0" if formatted == "-0" else formatted
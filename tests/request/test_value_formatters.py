@@ -1,6 +1,12 @@
+from datetime import datetime, timedelta, timezone
+
 from assertpy import assert_that
 
-from sentinelpy.request.value_formatters import format_footprint, format_number_or_range
+from sentinelpy.request.value_formatters import (
+    format_date,
+    format_footprint,
+    format_number_or_range,
+)
 
 
 class TestValueFormatters:
@@ -63,3 +69,15 @@ class TestValueFormatters:
         result = format_number_or_range("350 TO 405")
 
         assert_that(result).is_equal_to("[350 TO 405]")
+
+    def test_when_format_date_naive_then_returns_utc_millisecond_value(self):
+        result = format_date(datetime(2020, 1, 2, 3, 4, 5, 678999))
+
+        assert_that(result).is_equal_to("2020-01-02T03:04:05.678Z")
+
+    def test_when_format_date_aware_then_converts_to_utc(self):
+        result = format_date(
+            datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=2)))
+        )
+
+        assert_that(result).is_equal_to("2020-01-02T01:04:05.000Z")
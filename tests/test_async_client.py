@@ -0,0 +1,543 @@
+import asyncio
+import base64
+import gzip
+import json
+import os
+import sys
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from unittest.mock import Mock, patch
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import (
+    AsyncSentinelHubClient,
+    CircuitBreaker,
+    DiskCache,
+    EndpointPool,
+    LazyQuerySentinelProductsResponse,
+    QuerySentinelProductsResponse,
+    RetryAttempt,
+    RetryPolicy,
+    SentinelProductRequest,
+    query_sentinel_hub_async,
+)
+from sentinelpy.exceptions import CircuitOpenError, QuerySentinelProductsError
+from tests.utils import get_query_parameters_of_url, page, product_ids, run_async
+
+pytest.importorskip("aiohttp")
+
+Handler = Callable[[str, Dict[str, str]], Awaitable[Optional[bytes]]]
+
+
+def http_response(
+    body: bytes, status: int = 200, headers: Optional[Dict[str, str]] = None
+) -> bytes:
+    all_headers = {"Content-Length": str(len(body)), **(headers or {})}
+    head = "".join(f"{name}: {value}\r\n" for name, value in all_headers.items())
+    return f"HTTP/1.1 {status} OK\r\n{head}\r\n".encode() + body
+
+
+def json_response(body: dict, status: int = 200) -> bytes:
+    return http_response(json.dumps(body).encode(), status)
+
+
+class FakeHub:
+    def __init__(self, handler: Handler):
+        self.handler = handler
+        self.connections = 0
+        self.requests: List[Tuple[str, Dict[str, str]]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.writers: List[asyncio.StreamWriter] = []
+
+    async def __aenter__(self) -> "FakeHub":
+        self.released = asyncio.Event()
+        self.server = await asyncio.start_server(self.serve, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/dhus"
+        self.url_patch = patch("sentinelpy.client.SENTINEL_HUB_BASE_URL", self.base_url)
+        self.url_patch.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.url_patch.stop()
+        self.released.set()
+        self.server.close()
+        for writer in self.writers:
+            writer.close()
+        await asyncio.sleep(0.01)
+
+    async def serve(self, reader, writer):
+        self.connections += 1
+        self.writers.append(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line == b"\r\n":
+                        break
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                self.requests.append((request_line.split()[1].decode(), headers))
+                self.in_flight += 1
+                self.max_in_flight = max(self.in_flight, self.max_in_flight)
+                try:
+                    raw_response = await self.handler(*self.requests[-1])
+                finally:
+                    self.in_flight -= 1
+                if raw_response is None:
+                    break
+                writer.write(raw_response)
+                await writer.drain()
+                if b"Content-Length" not in raw_response:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def respond_with(*raw_responses: bytes) -> Handler:
+    remaining = list(raw_responses)
+
+    async def handler(target, headers):
+        return remaining.pop(0) if len(remaining) > 1 else remaining[0]
+
+    return handler
+
+
+class TestAsyncSentinelHubClient:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.sentinel_product_request = SentinelProductRequest(
+            "platformname:Sentinel-1", 30, None, 0, "test-user", "test-password"
+        )
+
+    def test_when_max_concurrency_less_than_one_then_raises_value_error(self):
+        with pytest.raises(ValueError):
+            AsyncSentinelHubClient(max_concurrency=0)
+
+    def test_when_aiohttp_not_installed_then_raises_import_error(self):
+        with patch.dict(sys.modules, {"aiohttp": None}):
+            with pytest.raises(ImportError):
+                AsyncSentinelHubClient()
+
+    def test_when_queried_then_returns_decoded_body(self):
+        async def scenario():
+            async with FakeHub(respond_with(json_response({"feed": {}}))):
+                async with AsyncSentinelHubClient() as client:
+                    return await client.query(self.sentinel_product_request)
+
+        result = run_async(scenario())
+
+        assert_that(result).is_equal_to(
+            QuerySentinelProductsResponse(200, {"feed": {}}, None)
+        )
+
+    def test_when_queried_then_sends_query_and_authentication(self):
+        expected_credentials = base64.b64encode(b"test-user:test-password").decode()
+
+        async def scenario():
+            async with FakeHub(respond_with(json_response({}))) as hub:
+                async with AsyncSentinelHubClient() as client:
+                    await client.query(self.sentinel_product_request)
+                return hub.requests
+
+        [(target, headers)] = run_async(scenario())
+
+        assert_that(get_query_parameters_of_url(target)).is_equal_to(
+            {
+                "q": ["platformname:Sentinel-1"],
+                "start": ["0"],
+                "rows": ["30"],
+                "format": ["json"],
+            }
+        )
+        assert_that(headers["authorization"]).is_equal_to(
+            f"Basic {expected_credentials}"
+        )
+
+    def test_when_queried_multiple_times_then_reuses_connection(self):
+        async def scenario():
+            async with FakeHub(respond_with(json_response({}))) as hub:
+                async with AsyncSentinelHubClient() as client:
+                    for _ in range(3):
+                        await client.query(self.sentinel_product_request)
+                return hub.connections
+
+        assert_that(run_async(scenario())).is_equal_to(1)
+
+    def test_when_new_connection_closed_by_hub_then_returns_error(self):
+        async def handler(target, headers):
+            return None
+
+        hub = FakeHub(handler)
+
+        async def scenario():
+            async with hub:
+                async with AsyncSentinelHubClient() as client:
+                    return await client.query(self.sentinel_product_request)
+
+        result = run_async(scenario())
+
+        assert_that(result.error).is_instance_of(IOError)
+
+    def test_when_proxy_in_environment_then_sends_query_through_proxy(self):
+        async def scenario():
+            async with FakeHub(respond_with(json_response({}))) as hub:
+                proxy = hub.base_url[: -len("/dhus")]
+                with patch.dict(os.environ, {"HTTP_PROXY": proxy, "NO_PROXY": ""}):
+                    async with AsyncSentinelHubClient(
+                        base_url="http://sentinel.example/dhus"
+                    ) as client:
+                        result = await client.query(self.sentinel_product_request)
+                return result, hub.requests
+
+        result, requests = run_async(scenario())
+
+        target, headers = requests[0]
+        assert_that(result.success).is_true()
+        assert_that(target).starts_with("http://sentinel.example/dhus/search?")
+        assert_that(headers["host"]).is_equal_to("sentinel.example")
+
+    def test_when_response_chunked_and_gzipped_then_decodes_body(self):
+        body = gzip.compress(json.dumps({"feed": {"entry": []}}).encode())
+        chunked = b"".join(
+            f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n"
+            for chunk in (body[:10], body[10:])
+        )
+        raw = (
+            b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n"
+            b"Content-Encoding: gzip\r\n\r\n" + chunked + b"0\r\n\r\n"
+        )
+
+        async def scenario():
+            async with FakeHub(respond_with(raw)):
+                async with AsyncSentinelHubClient() as client:
+                    return await client.query(self.sentinel_product_request)
+
+        assert_that(run_async(scenario()).body).is_equal_to({"feed": {"entry": []}})
+
+    def test_when_response_is_not_json_then_returns_content_with_error(self):
+        async def scenario():
+            async with FakeHub(respond_with(http_response(b"Not json", 401))):
+                async with AsyncSentinelHubClient() as client:
+                    return await client.query(self.sentinel_product_request)
+
+        result = run_async(scenario())
+
+        assert_that(result.status_code).is_equal_to(401)
+        assert_that(result.error).is_instance_of(QuerySentinelProductsError)
+        assert_that(result.error.response_data).is_equal_to("Not json")
+
+    def test_when_response_is_malformed_then_returns_error(self):
+        async def scenario():
+            async with FakeHub(respond_with(b"garbage\r\n\r\n")):
+                async with AsyncSentinelHubClient() as client:
+                    return await client.query(self.sentinel_product_request)
+
+        result = run_async(scenario())
+
+        assert_that(result.success).is_false()
+        assert_that(result.error).is_instance_of(IOError)
+
+    def test_when_gzip_body_is_malformed_then_returns_error(self):
+        raw = http_response(b"not gzip", headers={"Content-Encoding": "gzip"})
+
+        async def scenario():
+            async with FakeHub(respond_with(raw)):
+                async with AsyncSentinelHubClient() as client:
+                    return await client.query(self.sentinel_product_request)
+
+        assert_that(run_async(scenario()).error).is_instance_of(IOError)
+
+    def test_when_hub_unreachable_then_returns_error(self):
+        async def scenario():
+            async with FakeHub(respond_with(json_response({}))):
+                pass
+            async with AsyncSentinelHubClient(
+                base_url="http://127.0.0.1:1/dhus"
+            ) as client:
+                return await client.query(self.sentinel_product_request)
+
+        result = run_async(scenario())
+
+        assert_that(result.status_code).is_none()
+        assert_that(result.error).is_instance_of(IOError)
+
+    def test_when_query_exceeds_timeout_then_returns_error(self):
+        async def handler(target, headers):
+            await hub.released.wait()
+            return json_response({})
+
+        hub = FakeHub(handler)
+
+        async def scenario():
+            async with hub:
+                async with AsyncSentinelHubClient(timeout=0.05) as client:
+                    return await client.query(self.sentinel_product_request)
+
+        result = run_async(scenario())
+
+        assert_that(result.status_code).is_none()
+        assert_that(result.error).is_instance_of(asyncio.TimeoutError)
+
+    def test_when_many_queries_then_limits_queries_in_flight(self):
+        async def handler(target, headers):
+            await asyncio.sleep(0.01)
+            return json_response({})
+
+        async def scenario():
+            async with FakeHub(handler) as hub:
+                async with AsyncSentinelHubClient(max_concurrency=3) as client:
+                    results = await asyncio.gather(
+                        *(client.query(self.sentinel_product_request) for _ in range(9))
+                    )
+                return results, hub.max_in_flight
+
+        results, max_in_flight = run_async(scenario())
+
+        assert_that([result.success for result in results]).is_equal_to([True] * 9)
+        assert_that(max_in_flight).is_equal_to(3)
+
+    def test_when_query_cancelled_then_client_can_still_query(self):
+        async def handler(target, headers):
+            if len(hub.requests) == 1:
+                await hub.released.wait()
+            return json_response({})
+
+        hub = FakeHub(handler)
+
+        async def scenario():
+            async with hub:
+                async with AsyncSentinelHubClient(max_concurrency=1) as client:
+                    task = asyncio.ensure_future(
+                        client.query(self.sentinel_product_request)
+                    )
+                    await asyncio.sleep(0.05)
+                    task.cancel()
+                    with pytest.raises(asyncio.CancelledError):
+                        await task
+                    return await client.query(self.sentinel_product_request)
+
+        assert_that(run_async(scenario()).success).is_true()
+
+    def test_when_iterating_products_then_paginates_until_total_results(self):
+        async def handler(target, headers):
+            start = int(get_query_parameters_of_url(target)["start"][0])
+            return json_response(page(product_ids(5)[start : start + 2], 5).body)
+
+        async def scenario():
+            async with FakeHub(handler) as hub:
+                async with AsyncSentinelHubClient() as client:
+                    products = [
+                        product
+                        async for product in client.iter_products(
+                            self.sentinel_product_request._replace(rows=2)
+                        )
+                    ]
+                return products, hub.requests
+
+        products, requests = run_async(scenario())
+
+        assert_that([product["id"] for product in products]).is_equal_to(
+            ["0", "1", "2", "3", "4"]
+        )
+        assert_that(
+            [get_query_parameters_of_url(target)["start"] for target, _ in requests]
+        ).is_equal_to([["0"], ["2"], ["4"]])
+
+    def test_when_iterating_products_and_page_fails_then_raises(self):
+        async def scenario():
+            async with FakeHub(respond_with(json_response({}, 503))):
+                async with AsyncSentinelHubClient() as client:
+                    async for _ in client.iter_products(self.sentinel_product_request):
+                        pass
+
+        with pytest.raises(QuerySentinelProductsError):
+            run_async(scenario())
+
+    def test_when_query_sentinel_hub_async_called_then_returns_response(self):
+        async def scenario():
+            async with FakeHub(respond_with(json_response({"feed": {}}))):
+                return await query_sentinel_hub_async(self.sentinel_product_request)
+
+        assert_that(run_async(scenario()).body).is_equal_to({"feed": {}})
+
+    def test_when_transient_failure_then_retries_with_retry_policy(self):
+        hub = FakeHub(
+            respond_with(
+                http_response(b"{}", 503, headers={"Retry-After": "0"}),
+                json_response({"feed": {}}),
+            )
+        )
+        attempts: List[RetryAttempt] = []
+
+        async def scenario():
+            async with hub:
+                async with AsyncSentinelHubClient(
+                    retry_policy=RetryPolicy(
+                        backoff_base=0.01, on_attempt=attempts.append
+                    )
+                ) as client:
+                    return await client.query(self.sentinel_product_request)
+
+        result = run_async(scenario())
+
+        assert_that(result.status_code).is_equal_to(200)
+        assert_that(len(hub.requests)).is_equal_to(2)
+        assert_that([attempt.status_code for attempt in attempts]).is_equal_to(
+            [503, 200]
+        )
+
+    def test_when_retry_policy_max_attempts_less_than_one_then_raises_value_error(
+        self,
+    ):
+        with pytest.raises(ValueError):
+            AsyncSentinelHubClient(retry_policy=RetryPolicy(max_attempts=0))
+
+    def test_when_rate_limiter_given_then_waits_for_token_before_query(self):
+        rate_limiter = Mock()
+        rate_limiter.reserve.return_value = 0.01
+
+        async def scenario():
+            async with FakeHub(respond_with(json_response({}))):
+                async with AsyncSentinelHubClient(rate_limiter=rate_limiter) as client:
+                    return await client.query(self.sentinel_product_request)
+
+        assert_that(run_async(scenario()).success).is_true()
+        rate_limiter.reserve.assert_called_once_with()
+
+    def test_when_circuit_open_then_fails_fast_with_circuit_open_error(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=1)
+
+        async def scenario():
+            async with FakeHub(respond_with(json_response({}, 503))) as hub:
+                async with AsyncSentinelHubClient(
+                    circuit_breaker=circuit_breaker
+                ) as client:
+                    results = [
+                        await client.query(self.sentinel_product_request)
+                        for _ in range(2)
+                    ]
+                return results, len(hub.requests)
+
+        results, request_count = run_async(scenario())
+
+        assert_that(results[0].status_code).is_equal_to(503)
+        assert_that(results[1].error).is_instance_of(CircuitOpenError)
+        assert_that(request_count).is_equal_to(1)
+
+    def test_when_query_cancelled_then_records_cancellation_with_circuit_breaker(
+        self,
+    ):
+        circuit_breaker = Mock()
+        circuit_breaker.allow_request.return_value = True
+
+        async def handler(target, headers):
+            await hub.released.wait()
+            return json_response({})
+
+        hub = FakeHub(handler)
+
+        async def scenario():
+            async with hub:
+                async with AsyncSentinelHubClient(
+                    circuit_breaker=circuit_breaker
+                ) as client:
+                    task = asyncio.ensure_future(
+                        client.query(self.sentinel_product_request)
+                    )
+                    await asyncio.sleep(0.05)
+                    task.cancel()
+                    with pytest.raises(asyncio.CancelledError):
+                        await task
+
+        run_async(scenario())
+
+        circuit_breaker.record_cancelled.assert_called_once_with()
+        circuit_breaker.record.assert_not_called()
+
+    def test_when_endpoint_fails_then_fails_over_to_next_endpoint(self):
+        async def scenario():
+            async with FakeHub(respond_with(json_response({}, 503))) as failing_hub:
+                async with FakeHub(respond_with(json_response({}))) as hub:
+                    endpoints = EndpointPool([failing_hub.base_url, hub.base_url])
+                    async with AsyncSentinelHubClient(endpoints=endpoints) as client:
+                        result = await client.query(self.sentinel_product_request)
+                return result, len(failing_hub.requests), len(hub.requests)
+
+        result, failing_requests, requests = run_async(scenario())
+
+        assert_that(result.success).is_true()
+        assert_that([failing_requests, requests]).is_equal_to([1, 1])
+
+    def test_when_query_repeated_with_cache_then_served_from_cache(self, tmp_path):
+        async def scenario():
+            async with FakeHub(respond_with(json_response({"feed": {}}))) as hub:
+                async with AsyncSentinelHubClient(
+                    cache=DiskCache(str(tmp_path))
+                ) as client:
+                    results = [
+                        await client.query(self.sentinel_product_request)
+                        for _ in range(2)
+                    ]
+                return results, len(hub.requests)
+
+        results, request_count = run_async(scenario())
+
+        assert_that(results[1]).is_equal_to(results[0])
+        assert_that(request_count).is_equal_to(1)
+
+    def test_when_fields_given_then_products_projected(self):
+        body = {
+            "feed": {
+                "opensearch:totalResults": "1",
+                "entry": [{"id": "a", "title": "S1A", "summary": "..."}],
+            }
+        }
+
+        async def scenario():
+            async with FakeHub(respond_with(json_response(body))):
+                async with AsyncSentinelHubClient() as client:
+                    return [
+                        product
+                        async for product in client.iter_products(
+                            self.sentinel_product_request, fields=["title"]
+                        )
+                    ]
+
+        products = run_async(scenario())
+
+        assert_that(products).is_equal_to([{"id": "a", "title": "S1A"}])
+
+    def test_when_lazy_decoding_then_returns_undecoded_response(self):
+        async def scenario():
+            async with FakeHub(respond_with(json_response({"feed": {}}))):
+                async with AsyncSentinelHubClient(lazy_decoding=True) as client:
+                    return await client.query(self.sentinel_product_request)
+
+        result = run_async(scenario())
+
+        assert_that(result).is_instance_of(LazyQuerySentinelProductsResponse)
+        assert_that(result.decoded).is_false()
+        assert_that(result.body).is_equal_to({"feed": {}})
+
+    def test_when_coalesce_then_concurrent_identical_queries_share_one_request(self):
+        async def scenario():
+            async with FakeHub(respond_with(json_response({"feed": {}}))) as hub:
+                async with AsyncSentinelHubClient(coalesce=True) as client:
+                    results = await asyncio.gather(
+                        *(client.query(self.sentinel_product_request) for _ in range(3))
+                    )
+                return results, len(hub.requests)
+
+        results, request_count = run_async(scenario())
+
+        assert_that(request_count).is_equal_to(1)
+        assert_that(results[1]).is_same_as(results[0])
@@ -0,0 +1,322 @@
+import json
+import os
+import zlib
+from unittest.mock import Mock, patch
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import (
+    CacheStats,
+    DiskCache,
+    LazyQuerySentinelProductsResponse,
+    MemoryCache,
+    QuerySentinelProductsResponse,
+    ResponseCache,
+    SentinelHubClient,
+    SentinelProductRequest,
+    cache_key,
+)
+
+BODY = {"feed": {"opensearch:totalResults": "1", "entry": {"id": "a"}}}
+
+
+class TestCacheKey:
+    def test_when_only_password_differs_then_keys_equal(self):
+        first = SentinelProductRequest("*", 30, None, 0, "user", "password")
+
+        assert_that(cache_key(first)).is_equal_to(
+            cache_key(first._replace(password="other-password"))
+        )
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            {"query": "platformname:Sentinel-1"},
+            {"rows": 100},
+            {"order_by": "beginposition desc"},
+            {"start": 30},
+            {"username": "other-user"},
+        ],
+    )
+    def test_when_request_differs_then_keys_differ(self, change):
+        request = SentinelProductRequest("*", 30, None, 0, "user", "password")
+
+        assert_that(cache_key(request)).is_not_equal_to(
+            cache_key(request._replace(**change))
+        )
+
+
+class TestResponseCache:
+    def test_when_instantiated_then_raises_type_error(self):
+        with pytest.raises(TypeError):
+            ResponseCache()  # type: ignore
+
+    def test_when_subclass_does_not_implement_put_then_raises_type_error(self):
+        class GetOnlyCache(ResponseCache):
+            def get(self, sentinel_product_request):
+                return None
+
+        with pytest.raises(TypeError):
+            GetOnlyCache()  # type: ignore
+
+
+class TestDiskCache:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        self.directory = tmp_path / "cache"
+        self.cache = DiskCache(str(self.directory), ttl=60.0)
+        self.request = SentinelProductRequest("*", 30, None, 0, "user", "password")
+        self.response = QuerySentinelProductsResponse(200, BODY)
+
+    def files(self):
+        return sorted(os.listdir(self.directory))
+
+    @pytest.mark.parametrize(
+        "arguments",
+        [{"ttl": 0}, {"max_bytes": 0}, {"compression_level": 0}],
+    )
+    def test_when_arguments_invalid_then_raises_value_error(self, arguments):
+        with pytest.raises(ValueError):
+            DiskCache(str(self.directory), **arguments)
+
+    def test_when_response_put_then_get_returns_it(self):
+        self.cache.put(self.request, self.response)
+
+        assert_that(self.cache.get(self.request)).is_equal_to(self.response)
+
+    def test_when_lazy_response_put_then_stored_as_received(self):
+        content = json.dumps(BODY, indent=2).encode()
+        response = LazyQuerySentinelProductsResponse(200, content)
+
+        self.cache.put(self.request, response)
+
+        with open(self.directory / self.files()[0], "rb") as entry_file:
+            assert_that(zlib.decompress(entry_file.read()[10:])).is_equal_to(content)
+        assert_that(self.cache.get(self.request)).is_equal_to(self.response)
+
+    def test_when_lazy_response_invalid_then_not_cached(self):
+        self.cache.put(self.request, LazyQuerySentinelProductsResponse(200, b"nope"))
+
+        assert_that(self.files()).is_empty()
+
+    def test_when_response_put_then_stored_compressed_without_password(self):
+        self.cache.put(self.request, self.response)
+
+        [file_name] = self.files()
+        content = (self.directory / file_name).read_bytes()
+        assert_that(content).does_not_contain(b"opensearch")
+        assert_that(content).does_not_contain(b"password")
+
+    def test_when_nothing_put_then_get_returns_none(self):
+        assert_that(self.cache.get(self.request)).is_none()
+
+    def test_when_response_failed_then_not_cached(self):
+        self.cache.put(self.request, QuerySentinelProductsResponse(503, None))
+
+        assert_that(self.files()).is_empty()
+
+    def test_when_entry_expired_then_get_returns_none_and_removes_it(self):
+        self.cache.put(self.request, self.response)
+
+        with patch("sentinelpy.cache.time") as time_mock:
+            time_mock.time.return_value = 10**12
+            result = self.cache.get(self.request)
+
+        assert_that(result).is_none()
+        assert_that(self.files()).is_empty()
+
+    def test_when_entry_corrupt_then_get_returns_none_and_removes_it(self):
+        self.cache.put(self.request, self.response)
+        [file_name] = self.files()
+        (self.directory / file_name).write_bytes(b"corrupt")
+
+        assert_that(self.cache.get(self.request)).is_none()
+        assert_that(self.files()).is_empty()
+
+    def test_when_over_max_bytes_then_evicts_least_recently_used(self):
+        requests = [self.request._replace(start=start) for start in range(3)]
+        self.cache.put(requests[0], self.response)
+        entry_size = os.path.getsize(self.directory / self.files()[0])
+        cache = DiskCache(str(self.directory), max_bytes=2 * entry_size)
+        cache.put(requests[1], self.response)
+        os.utime(self.directory / self.files()[0], (0, 0))
+        os.utime(self.directory / f"{cache_key(requests[1])}.cache", (1, 1))
+        cache.get(requests[0])
+
+        cache.put(requests[2], self.response)
+
+        assert_that(cache.get(requests[0])).is_not_none()
+        assert_that(cache.get(requests[1])).is_none()
+        assert_that(cache.get(requests[2])).is_not_none()
+
+    def test_when_cleared_then_removes_every_entry(self):
+        self.cache.put(self.request, self.response)
+
+        self.cache.clear()
+
+        assert_that(self.files()).is_empty()
+
+    def test_when_under_max_bytes_then_put_does_not_scan_directory(self):
+        self.cache.put(self.request, self.response)
+        entry_size = os.path.getsize(self.directory / self.files()[0])
+        cache = DiskCache(str(self.directory), max_bytes=entry_size + 1)
+
+        with patch("sentinelpy.cache.os.scandir", wraps=os.scandir) as scandir_mock:
+            for _ in range(3):
+                cache.put(self.request, self.response)
+
+        scandir_mock.assert_not_called()
+        assert_that(self.files()).is_length(1)
+
+    def test_when_opened_then_removes_stale_temporary_files(self):
+        (self.directory / "stale.tmp").write_bytes(b"partial")
+        (self.directory / "writing.tmp").write_bytes(b"partial")
+        os.utime(self.directory / "stale.tmp", (0, 0))
+
+        DiskCache(str(self.directory))
+
+        assert_that(self.files()).is_equal_to(["writing.tmp"])
+
+
+class TestSentinelHubClientCache:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        self.request = SentinelProductRequest("*", 30, None, 0, "user", "password")
+        with patch("sentinelpy.client.requests") as requests_mock:
+            self.session_mock = requests_mock.Session.return_value
+            response = Mock(status_code=200, headers={})
+            response.content = json.dumps(BODY).encode()
+            self.session_mock.get.return_value = response
+            self.client = SentinelHubClient(cache=DiskCache(str(tmp_path)))
+            yield
+
+    def test_when_query_repeated_then_served_from_cache(self):
+        first = self.client.query(self.request)
+        second = self.client.query(self.request)
+
+        assert_that(second).is_equal_to(first)
+        assert_that(self.session_mock.get.call_count).is_equal_to(1)
+
+    def test_when_query_projected_then_full_response_cached(self):
+        entry = {"id": "a", "title": "S1A", "str": [{"name": "size", "content": "1"}]}
+        body = {"feed": {"opensearch:totalResults": "1", "entry": [entry]}}
+        self.session_mock.get.return_value.content = json.dumps(body).encode()
+
+        projected = self.client.query(self.request, fields=["title"])
+        cached = self.client.query(self.request)
+
+        assert_that(projected.entries).is_equal_to([{"id": "a", "title": "S1A"}])
+        assert_that(cached.entries).is_equal_to([entry])
+        assert_that(self.session_mock.get.call_count).is_equal_to(1)
+
+    def test_when_query_fails_then_not_cached(self):
+        self.session_mock.get.return_value.status_code = 503
+
+        self.client.query(self.request)
+        self.client.query(self.request)
+
+        assert_that(self.session_mock.get.call_count).is_equal_to(2)
+
+
+class TestMemoryCache:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.now = 1_000_000.0
+        with patch("sentinelpy.cache.time") as time_mock:
+            time_mock.time.side_effect = lambda: self.now
+            self.cache = MemoryCache(ttl=600.0, max_entries=2, now_bucket=300.0)
+            self.request = SentinelProductRequest(
+                "ingestiondate:[NOW-1DAY TO NOW]", 30, None, 0, "user", "password"
+            )
+            self.response = QuerySentinelProductsResponse(200, BODY)
+            yield
+
+    @pytest.mark.parametrize(
+        "arguments", [{"ttl": 0}, {"max_entries": 0}, {"now_bucket": 0}]
+    )
+    def test_when_arguments_invalid_then_raises_value_error(self, arguments):
+        with pytest.raises(ValueError):
+            MemoryCache(**arguments)
+
+    def test_when_response_put_then_get_returns_it_and_counts_hit(self):
+        self.cache.put(self.request, self.response)
+
+        assert_that(self.cache.get(self.request)).is_same_as(self.response)
+        assert_that(self.cache.stats).is_equal_to(CacheStats(1, 0, 0, 0, 1))
+
+    def test_when_nothing_put_then_get_returns_none_and_counts_miss(self):
+        assert_that(self.cache.get(self.request)).is_none()
+        assert_that(self.cache.stats.misses).is_equal_to(1)
+
+    def test_when_response_failed_then_not_cached(self):
+        self.cache.put(self.request, QuerySentinelProductsResponse(503, None))
+
+        assert_that(self.cache.stats.size).is_equal_to(0)
+
+    def test_when_lazy_response_invalid_then_not_cached(self):
+        self.cache.put(self.request, LazyQuerySentinelProductsResponse(200, b"<html>"))
+
+        assert_that(self.cache.stats.size).is_equal_to(0)
+
+    def test_when_now_moves_within_bucket_then_relative_query_hits(self):
+        self.now = 1_000_200.0
+        self.cache.put(self.request, self.response)
+
+        self.now = 1_000_499.0
+        assert_that(self.cache.get(self.request)).is_same_as(self.response)
+
+    def test_when_now_moves_to_next_bucket_then_relative_query_misses(self):
+        self.cache.put(self.request, self.response)
+
+        self.now += 300
+        assert_that(self.cache.get(self.request)).is_none()
+
+    @pytest.mark.parametrize(
+        "query", ["ingestiondate:[NOW-1YEAR TO NOW]", "ingestiondate:[NOW/DAY TO NOW]"]
+    )
+    def test_when_date_math_after_now_then_bucketed_like_now(self, query):
+        request = self.request._replace(query=query)
+        self.now = 1_000_200.0
+        self.cache.put(request, self.response)
+
+        self.now = 1_000_499.0
+        assert_that(self.cache.get(request)).is_same_as(self.response)
+        self.now = 1_000_500.0
+        assert_that(self.cache.get(request)).is_none()
+
+    def test_when_absolute_query_and_bucket_changes_then_still_hits(self):
+        request = self.request._replace(query="platformname:Sentinel-1")
+        self.cache.put(request, self.response)
+
+        self.now += 300
+        assert_that(self.cache.get(request)).is_same_as(self.response)
+
+    def test_when_entry_expired_then_misses_and_counts_expiration(self):
+        request = self.request._replace(query="platformname:Sentinel-1")
+        self.cache.put(request, self.response)
+
+        self.now += 600
+        result = self.cache.get(request)
+
+        assert_that(result).is_none()
+        assert_that(self.cache.stats).is_equal_to(CacheStats(0, 1, 0, 1, 0))
+
+    def test_when_over_max_entries_then_evicts_least_recently_used(self):
+        requests = [self.request._replace(start=start) for start in range(3)]
+        self.cache.put(requests[0], self.response)
+        self.cache.put(requests[1], self.response)
+        self.cache.get(requests[0])
+
+        self.cache.put(requests[2], self.response)
+
+        assert_that(self.cache.get(requests[1])).is_none()
+        assert_that(self.cache.get(requests[0])).is_not_none()
+        assert_that(self.cache.stats.evictions).is_equal_to(1)
+
+    def test_when_cleared_then_removes_every_entry(self):
+        self.cache.put(self.request, self.response)
+
+        self.cache.clear()
+
+        assert_that(self.cache.get(self.request)).is_none()
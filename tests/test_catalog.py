@@ -0,0 +1,111 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import (
+    PlatformName,
+    ProductCatalog,
+    QuerySentinelProductsResponse,
+    Sentinel1ProductType,
+)
+from sentinelpy.exceptions import QuerySentinelProductsError
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+class TestProductCatalog:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        self.path = str(tmp_path / "products.db")
+        self.catalog = ProductCatalog(self.path, batch_size=3)
+        with open(f"{DATA_DIR}/sentinel.api.json", "r") as sentinel_data:
+            self.response = QuerySentinelProductsResponse(200, json.load(sentinel_data))
+        yield
+        self.catalog.close()
+
+    def test_when_batch_size_invalid_then_raises_value_error(self):
+        with pytest.raises(ValueError):
+            ProductCatalog(self.path, batch_size=0)
+
+    def test_when_response_upserted_then_every_product_stored(self):
+        assert_that(self.catalog.upsert(self.response)).is_equal_to(10)
+
+        assert_that(self.catalog.count()).is_equal_to(10)
+        assert_that(
+            self.catalog.get("a0ac0971-080d-49d9-bdac-00a6e35c9c03")
+        ).is_equal_to(self.response.entries[2])
+
+    def test_when_upserted_again_then_products_replaced(self):
+        self.catalog.upsert(self.response)
+        changed = dict(self.response.entries[0], summary="changed")
+
+        self.catalog.upsert([changed])
+
+        assert_that(self.catalog.count()).is_equal_to(10)
+        assert_that(self.catalog.get(changed["id"])["summary"]).is_equal_to("changed")
+
+    def test_when_response_failed_then_raises_error(self):
+        with pytest.raises(QuerySentinelProductsError):
+            self.catalog.upsert(QuerySentinelProductsResponse(503, None))
+
+    def test_when_uuid_unknown_then_get_returns_none(self):
+        assert_that(self.catalog.get("unknown")).is_none()
+
+    def test_when_found_by_platform_and_product_type_then_returns_matches(self):
+        self.catalog.upsert(self.response)
+
+        products = self.catalog.find(
+            platform_name=PlatformName.SENTINEL_1,
+            product_type=Sentinel1ProductType.GRD,
+            relative_orbit_number=155,
+        )
+
+        assert_that([product["id"] for product in products]).is_equal_to(
+            ["a0ac0971-080d-49d9-bdac-00a6e35c9c03"]
+        )
+
+    def test_when_found_by_date_range_then_returns_matches_in_begin_order(self):
+        self.catalog.upsert(self.response)
+
+        products = self.catalog.find(
+            platform_name="Sentinel-2",
+            begin_position=(datetime(2020, 10, 20), datetime(2020, 10, 20, 9)),
+            ingestion_date=(
+                datetime(2020, 10, 20, 13, 20, 34, 100000),
+                datetime(2020, 10, 20, 13, 20, 36, 860000),
+            ),
+            limit=5,
+        )
+
+        assert_that([product["id"] for product in products]).is_equal_to(
+            [
+                "de48270a-cfb6-4c4a-80d6-658072a5c5da",
+                "10fb86db-c579-4415-9387-1dfed1dfe616",
+            ]
+        )
+
+    def test_when_counted_with_filter_then_counts_matches(self):
+        self.catalog.upsert(self.response)
+
+        assert_that(self.catalog.count(relative_orbit_number=94)).is_equal_to(3)
+
+    def test_when_created_then_uses_write_ahead_logging_and_indexes(self):
+        with sqlite3.connect(self.path) as connection:
+            journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+            indexes = [
+                row[1] for row in connection.execute("PRAGMA index_list(products)")
+            ]
+
+        assert_that(journal_mode).is_equal_to("wal")
+        assert_that(indexes).contains(
+            "products_platform_name",
+            "products_product_type",
+            "products_begin_position",
+            "products_end_position",
+            "products_ingestion_date",
+            "products_relative_orbit_number",
+        )
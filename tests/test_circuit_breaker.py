@@ -0,0 +1,194 @@
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+from assertpy import assert_that
+
+from sentinelpy import (
+    CircuitBreaker,
+    CircuitState,
+    QuerySentinelProductsResponse,
+    SentinelHubClient,
+    SentinelProductRequest,
+)
+from sentinelpy.exceptions import CircuitOpenError
+
+FAILURE = QuerySentinelProductsResponse(None, None, IOError("connection refused"))
+SUCCESS = QuerySentinelProductsResponse(200, {}, None)
+
+
+class TestCircuitBreaker:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.now = 1000.0
+        with patch("sentinelpy.circuit_breaker.time") as time_mock:
+            time_mock.monotonic.side_effect = lambda: self.now
+            self.circuit_breaker = CircuitBreaker(
+                failure_threshold=2, recovery_timeout=10.0
+            )
+            yield
+
+    def open_circuit(self):
+        for _ in range(2):
+            self.circuit_breaker.allow_request()
+            self.circuit_breaker.record(FAILURE)
+
+    @pytest.mark.parametrize(
+        "arguments",
+        [
+            {"failure_threshold": 0},
+            {"recovery_timeout": -1.0},
+            {"half_open_max_calls": 0},
+        ],
+    )
+    def test_when_arguments_invalid_then_raises_value_error(self, arguments):
+        with pytest.raises(ValueError):
+            CircuitBreaker(**arguments)
+
+    @pytest.mark.parametrize(
+        "response,expected",
+        [
+            (FAILURE, True),
+            (QuerySentinelProductsResponse(503, {}, None), True),
+            (QuerySentinelProductsResponse(429, {}, None), False),
+            (QuerySentinelProductsResponse(401, {}, None), False),
+            (SUCCESS, False),
+        ],
+    )
+    def test_when_is_failure_called_then_only_hub_failures_count(
+        self, response, expected
+    ):
+        assert_that(self.circuit_breaker.is_failure(response)).is_equal_to(expected)
+
+    def test_when_failures_below_threshold_then_stays_closed(self):
+        self.circuit_breaker.record(FAILURE)
+        self.circuit_breaker.record(SUCCESS)
+        self.circuit_breaker.record(FAILURE)
+
+        assert_that(self.circuit_breaker.state).is_equal_to(CircuitState.CLOSED)
+        assert_that(self.circuit_breaker.failure_count).is_equal_to(1)
+        assert_that(self.circuit_breaker.allow_request()).is_true()
+
+    def test_when_failures_reach_threshold_then_opens(self):
+        self.open_circuit()
+
+        assert_that(self.circuit_breaker.state).is_equal_to(CircuitState.OPEN)
+        assert_that(self.circuit_breaker.allow_request()).is_false()
+        assert_that(self.circuit_breaker.retry_after).is_equal_to(10.0)
+
+    def test_when_recovery_timeout_elapsed_then_lets_one_trial_through(self):
+        self.open_circuit()
+
+        self.now += 10
+        allowed = [self.circuit_breaker.allow_request() for _ in range(2)]
+
+        assert_that(self.circuit_breaker.state).is_equal_to(CircuitState.HALF_OPEN)
+        assert_that(allowed).is_equal_to([True, False])
+        assert_that(self.circuit_breaker.retry_after).is_equal_to(0.0)
+
+    def test_when_trial_succeeds_then_closes(self):
+        self.open_circuit()
+        self.now += 10
+        self.circuit_breaker.allow_request()
+
+        self.circuit_breaker.record(SUCCESS)
+
+        assert_that(self.circuit_breaker.state).is_equal_to(CircuitState.CLOSED)
+        assert_that(self.circuit_breaker.failure_count).is_equal_to(0)
+
+    def test_when_trial_fails_then_opens_again(self):
+        self.open_circuit()
+        self.now += 10
+        self.circuit_breaker.allow_request()
+
+        self.circuit_breaker.record(FAILURE)
+
+        assert_that(self.circuit_breaker.state).is_equal_to(CircuitState.OPEN)
+        assert_that(self.circuit_breaker.retry_after).is_equal_to(10.0)
+
+    def test_when_trial_cancelled_then_lets_another_trial_through(self):
+        self.open_circuit()
+        self.now += 10
+        self.circuit_breaker.allow_request()
+
+        self.circuit_breaker.record_cancelled()
+
+        assert_that(self.circuit_breaker.allow_request()).is_true()
+
+    def test_when_reset_then_closes(self):
+        self.open_circuit()
+
+        self.circuit_breaker.reset()
+
+        assert_that(self.circuit_breaker.state).is_equal_to(CircuitState.CLOSED)
+
+
+class TestSentinelHubClientCircuitBreaker:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.sentinel_product_request = SentinelProductRequest(
+            "*", 30, None, 0, "test-user", "test-password"
+        )
+        with patch("sentinelpy.client.requests") as requests_mock:
+            self.session_mock = requests_mock.Session.return_value
+            yield
+
+    def test_when_circuit_open_then_fails_fast_with_circuit_open_error(self):
+        circuit_breaker = Mock()
+        circuit_breaker.allow_request.return_value = False
+        circuit_breaker.retry_after = 5.0
+        client = SentinelHubClient(circuit_breaker=circuit_breaker)
+
+        result = client.query(self.sentinel_product_request)
+
+        assert_that(result.error).is_equal_to(CircuitOpenError(5.0))
+        self.session_mock.get.assert_not_called()
+
+    def test_when_hub_unreachable_then_records_failures_and_opens(self):
+        self.session_mock.get.side_effect = ConnectionError("connection refused")
+        circuit_breaker = CircuitBreaker(failure_threshold=2)
+        client = SentinelHubClient(circuit_breaker=circuit_breaker)
+
+        results = [client.query(self.sentinel_product_request) for _ in range(3)]
+
+        assert_that(self.session_mock.get.call_count).is_equal_to(2)
+        assert_that(results[2].error).is_instance_of(CircuitOpenError)
+        assert_that(circuit_breaker.state).is_equal_to(CircuitState.OPEN)
+
+    def test_when_query_times_out_then_records_failure(self):
+        self.session_mock.get.side_effect = requests.Timeout("read timed out")
+        circuit_breaker = CircuitBreaker(failure_threshold=1)
+        client = SentinelHubClient(timeout=5.0, circuit_breaker=circuit_breaker)
+
+        result = client.query(self.sentinel_product_request)
+
+        assert_that(self.session_mock.get.call_args[1]["timeout"]).is_equal_to(5.0)
+        assert_that(result.error).is_instance_of(requests.Timeout)
+        assert_that(circuit_breaker.state).is_equal_to(CircuitState.OPEN)
+
+    def test_when_query_interrupted_then_records_cancellation(self):
+        self.session_mock.get.side_effect = KeyboardInterrupt()
+        circuit_breaker = Mock()
+        circuit_breaker.allow_request.return_value = True
+        client = SentinelHubClient(circuit_breaker=circuit_breaker)
+
+        with pytest.raises(KeyboardInterrupt):
+            client.query(self.sentinel_product_request)
+
+        circuit_breaker.record_cancelled.assert_called_once_with()
+        circuit_breaker.record.assert_not_called()
+
+    def test_when_hub_responds_then_records_success(self):
+        self.session_mock.get.return_value = Mock(
+            status_code=200, headers={}, content=b"{}"
+        )
+        circuit_breaker = Mock()
+        circuit_breaker.allow_request.return_value = True
+        client = SentinelHubClient(circuit_breaker=circuit_breaker)
+
+        client.query(self.sentinel_product_request)
+
+        circuit_breaker.record.assert_called_once()
+        recorded = circuit_breaker.record.call_args[0][0]
+        assert_that(recorded.status_code).is_equal_to(200)
+        assert_that(recorded.error).is_none()
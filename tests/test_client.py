@@ -0,0 +1,185 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import (
+    LazyQuerySentinelProductsResponse,
+    RetryPolicy,
+    SentinelHubClient,
+    SentinelProductRequest,
+    iter_sentinel_products,
+)
+from sentinelpy.exceptions import QuerySentinelProductsError
+from sentinelpy.main import default_client, set_default_client
+
+
+@pytest.fixture()
+def requests_mock():
+    with patch("sentinelpy.client.requests") as mock:
+        yield mock
+
+
+class TestSentinelHubClient:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, requests_mock):
+        self.requests_mock = requests_mock
+        self.session_mock = requests_mock.Session.return_value
+        self.sentinel_product_request = SentinelProductRequest(
+            "*", 30, None, 0, "test-user", "test-password"
+        )
+
+    def test_when_pool_size_less_than_one_then_raises_value_error(self):
+        with pytest.raises(ValueError):
+            SentinelHubClient(pool_size=0)
+
+    @patch("sentinelpy.client.HTTPAdapter")
+    def test_when_created_then_mounts_adapter_with_pool_size(self, adapter_mock):
+        SentinelHubClient(pool_size=25)
+
+        adapter_mock.assert_called_once_with(pool_connections=25, pool_maxsize=25)
+        self.session_mock.mount.assert_any_call("https://", adapter_mock.return_value)
+        self.session_mock.mount.assert_any_call("http://", adapter_mock.return_value)
+
+    def test_when_queried_multiple_times_then_reuses_session(self):
+        client = SentinelHubClient()
+
+        client.query(self.sentinel_product_request)
+        client.query(self.sentinel_product_request._replace(start=30))
+
+        self.requests_mock.Session.assert_called_once()
+        assert_that(self.session_mock.get.call_count).is_equal_to(2)
+
+    def test_when_used_as_context_manager_then_closes_session(self):
+        with SentinelHubClient() as client:
+            client.query(self.sentinel_product_request)
+
+        self.session_mock.close.assert_called_once()
+
+    def test_when_lazy_decoding_then_returns_undecoded_response(self):
+        self.session_mock.get.return_value = Mock(
+            status_code=200, headers={}, content=b'{"feed": {}}'
+        )
+        client = SentinelHubClient(lazy_decoding=True)
+
+        result = client.query(self.sentinel_product_request)
+
+        assert_that(result).is_instance_of(LazyQuerySentinelProductsResponse)
+        assert_that(result.decoded).is_false()
+        assert_that(result.body).is_equal_to({"feed": {}})
+
+    def test_when_lazy_decoding_and_fields_then_projects_once_decoded(self):
+        self.session_mock.get.return_value = Mock(
+            status_code=200,
+            headers={},
+            content=b'{"feed": {"entry": [{"id": "a", "title": "b", "link": []}]}}',
+        )
+        client = SentinelHubClient(lazy_decoding=True)
+
+        result = client.query(self.sentinel_product_request, fields=["title"])
+
+        assert_that(result.decoded).is_false()
+        assert_that(result.entries).is_equal_to([{"id": "a", "title": "b"}])
+
+    def test_when_lazy_decoding_and_body_invalid_then_iteration_raises(self):
+        self.session_mock.get.return_value = Mock(
+            status_code=200, headers={}, content=b"<html>Maintenance</html>"
+        )
+        client = SentinelHubClient(lazy_decoding=True)
+
+        with pytest.raises(QuerySentinelProductsError) as error:
+            list(iter_sentinel_products(self.sentinel_product_request, client=client))
+
+        assert_that(error.value.response_data).is_equal_to("<html>Maintenance</html>")
+
+    def test_when_default_client_called_then_returns_same_client(self):
+        with patch("sentinelpy.main.__DEFAULT_CLIENT", None):
+            first = default_client()
+            second = default_client()
+
+        assert_that(first).is_same_as(second)
+
+    def test_when_set_default_client_called_then_default_client_replaced(self):
+        client = SentinelHubClient()
+
+        with patch("sentinelpy.main.__DEFAULT_CLIENT", None):
+            set_default_client(client)
+
+            assert_that(default_client()).is_same_as(client)
+
+
+class TestSentinelHubClientRetry:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, requests_mock):
+        self.session_mock = requests_mock.Session.return_value
+        self.sentinel_product_request = SentinelProductRequest(
+            "*", 30, None, 0, "test-user", "test-password"
+        )
+        with patch("sentinelpy.client.time") as time_mock:
+            self.time_mock = time_mock
+            yield
+
+    def respond_with(self, *status_codes, retry_after=None):
+        responses = []
+        for status_code in status_codes:
+            response = Mock(status_code=status_code, headers={})
+            response.content = b"{}"
+            if retry_after is not None:
+                response.headers["Retry-After"] = retry_after
+            responses.append(response)
+        self.session_mock.get.side_effect = responses
+
+    def test_when_retry_policy_max_attempts_less_than_one_then_raises_value_error(
+        self,
+    ):
+        with pytest.raises(ValueError):
+            SentinelHubClient(retry_policy=RetryPolicy(max_attempts=0))
+
+    def test_when_no_retry_policy_then_does_not_retry(self):
+        self.respond_with(503, 200)
+
+        result = SentinelHubClient().query(self.sentinel_product_request)
+
+        assert_that(result.status_code).is_equal_to(503)
+        assert_that(self.session_mock.get.call_count).is_equal_to(1)
+
+    def test_when_transient_failure_then_retries_until_success(self):
+        self.respond_with(503, 429, 200)
+
+        result = SentinelHubClient(retry_policy=RetryPolicy()).query(
+            self.sentinel_product_request
+        )
+
+        assert_that(result.status_code).is_equal_to(200)
+        assert_that(self.session_mock.get.call_count).is_equal_to(3)
+        assert_that(self.time_mock.sleep.call_count).is_equal_to(2)
+
+    def test_when_attempts_exhausted_then_returns_last_failure(self):
+        self.respond_with(503, 503, 503)
+
+        result = SentinelHubClient(retry_policy=RetryPolicy(max_attempts=2)).query(
+            self.sentinel_product_request
+        )
+
+        assert_that(result.status_code).is_equal_to(503)
+        assert_that(self.session_mock.get.call_count).is_equal_to(2)
+
+    def test_when_connection_fails_then_retries(self):
+        success = Mock(status_code=200, headers={})
+        success.content = b"{}"
+        self.session_mock.get.side_effect = [ConnectionError("reset"), success]
+
+        result = SentinelHubClient(retry_policy=RetryPolicy()).query(
+            self.sentinel_product_request
+        )
+
+        assert_that(result.success).is_true()
+
+    def test_when_hub_sends_retry_after_then_waits_at_least_that_long(self):
+        self.respond_with(429, 200, retry_after="7")
+
+        SentinelHubClient(retry_policy=RetryPolicy()).query(
+            self.sentinel_product_request
+        )
+
+        self.time_mock.sleep.assert_called_once_with(7.0)
@@ -0,0 +1,124 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import (
+    PlatformName,
+    QuerySentinelProductsResponse,
+    RequestQueryBuilder,
+    SentinelProductRequest,
+    count_sentinel_products,
+    count_sentinel_products_batch,
+)
+from sentinelpy.exceptions import QuerySentinelProductsError
+
+
+def count_response(total_results: int) -> QuerySentinelProductsResponse:
+    return QuerySentinelProductsResponse(
+        200, {"feed": {"opensearch:totalResults": str(total_results)}}
+    )
+
+
+class TestCountSentinelProducts:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.client = Mock()
+        self.sentinel_product_request = SentinelProductRequest(
+            "*", 30, "ingestiondate desc", 60, "test-user", "test-password"
+        )
+
+    def test_when_counted_then_returns_total_results(self):
+        self.client.query.return_value = count_response(1234)
+
+        count = count_sentinel_products(
+            self.sentinel_product_request, client=self.client
+        )
+
+        assert_that(count).is_equal_to(1234)
+
+    def test_when_counted_then_requests_no_rows(self):
+        self.client.query.return_value = count_response(1234)
+
+        count_sentinel_products(self.sentinel_product_request, client=self.client)
+
+        self.client.query.assert_called_once_with(
+            SentinelProductRequest("*", 0, None, 0, "test-user", "test-password"),
+            logger=None,
+        )
+
+    def test_when_no_client_supplied_then_uses_default_client(self):
+        self.client.query.return_value = count_response(5)
+
+        with patch("sentinelpy.count.default_client", return_value=self.client):
+            count = count_sentinel_products(self.sentinel_product_request)
+
+        assert_that(count).is_equal_to(5)
+
+    def test_when_query_fails_then_raises(self):
+        self.client.query.return_value = QuerySentinelProductsResponse(401, None)
+
+        with pytest.raises(QuerySentinelProductsError):
+            count_sentinel_products(self.sentinel_product_request, client=self.client)
+
+    def test_when_response_has_no_total_results_then_raises(self):
+        self.client.query.return_value = QuerySentinelProductsResponse(200, {})
+
+        with pytest.raises(QuerySentinelProductsError):
+            count_sentinel_products(self.sentinel_product_request, client=self.client)
+
+
+class TestCountSentinelProductsBatch:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.client = Mock()
+        self.client.query.side_effect = lambda request, logger=None: count_response(
+            len(request.query)
+        )
+
+    def test_when_counted_then_returns_counts_in_query_order(self):
+        queries = [
+            "*",
+            RequestQueryBuilder().platform_name(PlatformName.SENTINEL_1),
+            "platformname:Sentinel-2",
+        ]
+
+        counts = count_sentinel_products_batch(
+            queries, username="test-user", password="test-password", client=self.client
+        )
+
+        assert_that(counts).is_equal_to([1, 23, 23])
+
+    def test_when_no_client_supplied_then_uses_default_client(self):
+        with patch("sentinelpy.count.default_client", return_value=self.client):
+            counts = count_sentinel_products_batch(
+                ["*"], username="test-user", password="test-password"
+            )
+
+        assert_that(counts).is_equal_to([1])
+
+    def test_when_counted_then_builds_requests_with_credentials(self):
+        count_sentinel_products_batch(
+            ["*"], username="test-user", password="test-password", client=self.client
+        )
+
+        self.client.query.assert_called_once_with(
+            SentinelProductRequest("*", 0, None, 0, "test-user", "test-password"),
+            logger=None,
+        )
+
+    def test_when_credentials_missing_then_raises_value_error(self):
+        with pytest.raises(ValueError):
+            count_sentinel_products_batch(
+                ["*"], username="", password="", client=self.client
+            )
+
+    def test_when_max_workers_less_than_one_then_raises_value_error(self):
+        with pytest.raises(ValueError):
+            count_sentinel_products_batch(
+                ["*"],
+                username="test-user",
+                password="test-password",
+                client=self.client,
+                max_workers=0,
+            )
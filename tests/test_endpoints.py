@@ -0,0 +1,145 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import (
+    EndpointPool,
+    EndpointStats,
+    QuerySentinelProductsResponse,
+    SentinelHubClient,
+    SentinelProductRequest,
+)
+
+FAILURE = QuerySentinelProductsResponse(None, None, IOError("connection refused"))
+SUCCESS = QuerySentinelProductsResponse(200, {}, None)
+PRIMARY = "https://primary.example.com/dhus"
+MIRROR = "https://mirror.example.com/dhus"
+
+
+class TestEndpointPool:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.now = 1000.0
+        with patch("sentinelpy.endpoints.time") as time_mock:
+            time_mock.monotonic.side_effect = lambda: self.now
+            self.endpoints = EndpointPool(
+                [PRIMARY, MIRROR], smoothing=0.5, probe_interval=30.0
+            )
+            yield
+
+    @pytest.mark.parametrize(
+        "base_urls,smoothing",
+        [([], 0.2), ([PRIMARY, PRIMARY], 0.2), ([PRIMARY], 0.0), ([PRIMARY], 1.5)],
+    )
+    def test_when_arguments_invalid_then_raises_value_error(self, base_urls, smoothing):
+        with pytest.raises(ValueError):
+            EndpointPool(base_urls, smoothing=smoothing)
+
+    def test_when_no_endpoint_queried_then_selects_first(self):
+        assert_that(self.endpoints.select()).is_equal_to(PRIMARY)
+
+    def test_when_endpoint_untried_then_selected_before_measured_endpoints(self):
+        self.endpoints.record(PRIMARY, 0.1, SUCCESS)
+
+        assert_that(self.endpoints.select()).is_equal_to(MIRROR)
+
+    def test_when_both_measured_then_selects_lowest_average_latency(self):
+        self.endpoints.record(PRIMARY, 0.1, SUCCESS)
+        self.endpoints.record(MIRROR, 0.4, SUCCESS)
+        self.endpoints.record(PRIMARY, 0.9, SUCCESS)
+
+        assert_that(self.endpoints.select()).is_equal_to(MIRROR)
+        assert_that(self.endpoints.stats[0].latency).is_close_to(0.5, 1e-9)
+
+    def test_when_endpoint_excluded_then_not_selected(self):
+        assert_that(self.endpoints.select(exclude=[PRIMARY])).is_equal_to(MIRROR)
+        assert_that(self.endpoints.select(exclude=[PRIMARY, MIRROR])).is_none()
+
+    def test_when_failures_recorded_then_tracks_error_rate(self):
+        self.endpoints.record(PRIMARY, 0.1, FAILURE)
+        self.endpoints.record(
+            PRIMARY, 0.1, QuerySentinelProductsResponse(503, {}, None)
+        )
+
+        assert_that(self.endpoints.stats[0]).is_equal_to(
+            EndpointStats(PRIMARY, None, 0.75, 2, False)
+        )
+
+    def test_when_endpoint_unhealthy_then_fails_over_to_healthy_endpoint(self):
+        self.endpoints.record(MIRROR, 0.5, SUCCESS)
+        self.endpoints.select()
+        self.endpoints.record(PRIMARY, 0.1, FAILURE)
+
+        assert_that(self.endpoints.select()).is_equal_to(MIRROR)
+
+    def test_when_probe_interval_elapsed_then_probes_unhealthy_endpoint(self):
+        self.endpoints.record(PRIMARY, 0.1, SUCCESS)
+        self.endpoints.record(MIRROR, 0.5, SUCCESS)
+        self.endpoints.select()
+        self.endpoints.record(PRIMARY, 0.1, FAILURE)
+        self.endpoints.record(PRIMARY, 0.1, FAILURE)
+
+        before_interval = self.endpoints.select()
+        self.now += 30
+        after_interval = self.endpoints.select()
+
+        assert_that([before_interval, after_interval]).is_equal_to([MIRROR, PRIMARY])
+
+    def test_when_every_endpoint_unhealthy_then_still_selects_one(self):
+        for base_url in (PRIMARY, MIRROR):
+            self.endpoints.select(
+                exclude=[b for b in (PRIMARY, MIRROR) if b != base_url]
+            )
+            self.endpoints.record(base_url, 0.1, FAILURE)
+
+        assert_that(self.endpoints.select()).is_not_none()
+
+
+class TestSentinelHubClientEndpoints:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.sentinel_product_request = SentinelProductRequest(
+            "*", 30, None, 0, "test-user", "test-password"
+        )
+        with patch("sentinelpy.client.requests") as requests_mock:
+            self.session_mock = requests_mock.Session.return_value
+            yield
+
+    def response(self, status_code):
+        response = Mock(status_code=status_code, headers={})
+        response.content = b"{}"
+        return response
+
+    def test_when_both_base_url_and_endpoints_given_then_raises_value_error(self):
+        with pytest.raises(ValueError):
+            SentinelHubClient(base_url=PRIMARY, endpoints=EndpointPool([MIRROR]))
+
+    def test_when_base_url_given_then_queries_base_url(self):
+        SentinelHubClient(base_url=f"{MIRROR}/").query(self.sentinel_product_request)
+
+        url = self.session_mock.get.call_args[0][0]
+        assert_that(url).starts_with(f"{MIRROR}/search?")
+
+    def test_when_endpoint_fails_then_fails_over_to_next_endpoint(self):
+        self.session_mock.get.side_effect = [self.response(503), self.response(200)]
+        endpoints = EndpointPool([PRIMARY, MIRROR])
+
+        result = SentinelHubClient(endpoints=endpoints).query(
+            self.sentinel_product_request
+        )
+
+        urls = [call[0][0] for call in self.session_mock.get.call_args_list]
+        assert_that(result.status_code).is_equal_to(200)
+        assert_that(urls[0]).starts_with(PRIMARY)
+        assert_that(urls[1]).starts_with(MIRROR)
+        assert_that([stats.requests for stats in endpoints.stats]).is_equal_to([1, 1])
+
+    def test_when_every_endpoint_fails_then_returns_last_failure(self):
+        self.session_mock.get.side_effect = [self.response(503), self.response(502)]
+
+        result = SentinelHubClient(endpoints=EndpointPool([PRIMARY, MIRROR])).query(
+            self.sentinel_product_request
+        )
+
+        assert_that(result.status_code).is_equal_to(502)
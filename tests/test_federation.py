@@ -0,0 +1,125 @@
+import threading
+import time
+from typing import Dict, List
+from unittest.mock import Mock
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import (
+    QuerySentinelProductsResponse,
+    SentinelProductRequest,
+    iter_federated_sentinel_products,
+)
+from sentinelpy.exceptions import QuerySentinelProductsError
+from tests.utils import hub_client
+
+
+def products(*identifiers: str, prefix: str = "") -> List[Dict[str, str]]:
+    return [
+        {"id": f"{prefix}{identifier}", "title": identifier}
+        for identifier in identifiers
+    ]
+
+
+class TestIterFederatedSentinelProducts:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.sentinel_product_request = SentinelProductRequest(
+            "*", 2, None, 0, "test-user", "test-password"
+        )
+
+    def titles(self, clients) -> List[str]:
+        return sorted(
+            product["title"]
+            for product in iter_federated_sentinel_products(
+                self.sentinel_product_request, clients
+            )
+        )
+
+    def test_when_no_clients_then_raises_value_error(self):
+        with pytest.raises(ValueError):
+            iter_federated_sentinel_products(self.sentinel_product_request, [])
+
+    def test_when_hub_timeout_negative_then_raises_value_error(self):
+        with pytest.raises(ValueError):
+            iter_federated_sentinel_products(
+                self.sentinel_product_request, [Mock()], hub_timeout=-1
+            )
+
+    def test_when_hubs_overlap_then_yields_union_once(self):
+        clients = [
+            hub_client(products("a", "b", "c")),
+            hub_client(products("b", "c", "d", "e")),
+        ]
+
+        assert_that(self.titles(clients)).is_equal_to(["a", "b", "c", "d", "e"])
+
+    def test_when_mirror_assigns_own_uuid_then_deduplicates_by_identifier(self):
+        clients = [
+            hub_client(products("a", "b")),
+            hub_client(products("a", "b", prefix="mirror-")),
+        ]
+
+        assert_that(self.titles(clients)).is_equal_to(["a", "b"])
+
+    def test_when_quick_hubs_cover_result_set_then_does_not_wait_for_slow_hub(self):
+        slow_hub_released = threading.Event()
+        slow_hub = hub_client(products("a", "b", "c", "d"))
+
+        def slow_query(request, logger=None):
+            if request.start > 0:
+                slow_hub_released.wait(5)
+            return slow_hub.query(request)
+
+        slow_client = Mock()
+        slow_client.query.side_effect = slow_query
+        quick_client = hub_client(products("a", "b", "c", "d"))
+
+        titles = self.titles([quick_client, slow_client])
+        slow_hub_released.set()
+
+        assert_that(titles).is_equal_to(["a", "b", "c", "d"])
+        assert_that(quick_client.query.call_count).is_equal_to(2)
+
+    def test_when_quick_hub_returns_everything_then_does_not_wait_for_hung_hub(self):
+        hung_hub_released = threading.Event()
+        hung_client = Mock()
+        hung_client.query.side_effect = lambda request, logger=None: (
+            hung_hub_released.wait(5)
+        )
+        quick_client = hub_client(products("a", "b"))
+
+        started = time.monotonic()
+        titles = sorted(
+            product["title"]
+            for product in iter_federated_sentinel_products(
+                self.sentinel_product_request,
+                [quick_client, hung_client],
+                hub_timeout=0.2,
+            )
+        )
+        elapsed = time.monotonic() - started
+        hung_hub_released.set()
+
+        assert_that(titles).is_equal_to(["a", "b"])
+        assert_that(elapsed).is_less_than(1.0)
+
+    def test_when_one_hub_fails_then_yields_products_of_other_hubs(self):
+        failing_client = Mock()
+        failing_client.query.return_value = QuerySentinelProductsResponse(
+            503, None, None
+        )
+
+        titles = self.titles([failing_client, hub_client(products("a", "b", "c"))])
+
+        assert_that(titles).is_equal_to(["a", "b", "c"])
+
+    def test_when_every_hub_fails_then_raises_error(self):
+        failing_client = Mock()
+        failing_client.query.return_value = QuerySentinelProductsResponse(
+            503, None, None
+        )
+
+        with pytest.raises(QuerySentinelProductsError):
+            self.titles([failing_client, failing_client])
@@ -0,0 +1,61 @@
+import json
+import os
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import (
+    available_json_decoders,
+    get_json_decoder,
+    set_json_decoder,
+)
+from sentinelpy.client import decode_response_content
+from sentinelpy.exceptions import QuerySentinelProductsError
+from sentinelpy.json_decoder import decode_json
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+class TestJsonDecoder:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        decoder = get_json_decoder()
+        with open(f"{DATA_DIR}/sentinel.api.json", "rb") as sentinel_data:
+            self.content = sentinel_data.read()
+        yield
+        set_json_decoder(decoder)
+
+    def test_when_listed_then_stdlib_json_always_available_and_last(self):
+        assert_that(available_json_decoders()[-1]).is_equal_to("json")
+
+    def test_when_not_set_then_uses_fastest_available(self):
+        assert_that(get_json_decoder()).is_equal_to(available_json_decoders()[0])
+
+    @pytest.mark.parametrize("name", available_json_decoders())
+    def test_when_decoding_feed_then_every_decoder_matches_json(self, name):
+        set_json_decoder(name)
+
+        assert_that(get_json_decoder()).is_equal_to(name)
+        assert_that(decode_json(self.content)).is_equal_to(json.loads(self.content))
+
+    @pytest.mark.parametrize("name", available_json_decoders())
+    def test_when_content_invalid_then_response_has_query_error(self, name):
+        set_json_decoder(name)
+
+        result = decode_response_content(502, b"<html>Bad Gateway</html>")
+
+        assert_that(result.body).is_none()
+        assert_that(result.error).is_instance_of(QuerySentinelProductsError)
+        assert_that(result.error.source).is_instance_of(ValueError)
+        assert_that(result.error.status_code).is_equal_to(502)
+        assert_that(result.error.response_data).is_equal_to("<html>Bad Gateway</html>")
+
+    def test_when_set_to_function_then_used_to_decode(self):
+        set_json_decoder(lambda content: {"decoded": content})
+
+        assert_that(get_json_decoder()).is_equal_to("custom")
+        assert_that(decode_json(b"{}")).is_equal_to({"decoded": b"{}"})
+
+    def test_when_set_to_unknown_name_then_raises_value_error(self):
+        with pytest.raises(ValueError):
+            set_json_decoder("not-installed")
@@ -0,0 +1,429 @@
+import re
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+import responses
+from assertpy import assert_that
+
+from sentinelpy import (
+    QuerySentinelProductsResponse,
+    SentinelProductRequest,
+    fetch_sentinel_products_parallel,
+    iter_merged_sentinel_products,
+    iter_sentinel_products,
+)
+from sentinelpy.exceptions import QuerySentinelProductsError
+from tests.utils import hub_client, page, product_ids
+
+
+class TestIterSentinelProducts:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.sentinel_product_request = SentinelProductRequest(
+            "*", None, "ingestiondate asc", 0, "test-user", "test-password"
+        )
+
+    def _requested_pages(self, client: Mock):
+        return [
+            (call[0][0].start, call[0][0].rows) for call in client.query.call_args_list
+        ]
+
+    @pytest.mark.parametrize("read_ahead", [0, 2])
+    def test_when_fields_given_then_yields_projected_products(self, read_ahead):
+        def query(request, logger=None):
+            return QuerySentinelProductsResponse(
+                200,
+                {
+                    "feed": {
+                        "opensearch:totalResults": "150",
+                        "entry": [
+                            {"id": str(i), "title": "S1A", "summary": "..."}
+                            for i in range(request.start, request.start + 75)
+                        ],
+                    }
+                },
+            )
+
+        client = Mock()
+        client.query.side_effect = query
+
+        products = list(
+            iter_sentinel_products(
+                self.sentinel_product_request._replace(rows=75),
+                client=client,
+                read_ahead=read_ahead,
+                fields=["title"],
+            )
+        )
+
+        assert_that(products).is_length(150)
+        assert_that(products[-1]).is_equal_to({"id": "149", "title": "S1A"})
+
+    def test_when_iterated_then_yields_all_products_in_order(self):
+        client = hub_client(product_ids(250))
+
+        products = list(
+            iter_sentinel_products(self.sentinel_product_request, client=client)
+        )
+
+        assert_that([product["id"] for product in products]).is_equal_to(
+            [str(i) for i in range(250)]
+        )
+        assert_that(self._requested_pages(client)).is_equal_to(
+            [(0, 100), (100, 100), (200, 100)]
+        )
+
+    def test_when_rows_exceeds_hub_limit_then_pages_are_capped(self):
+        client = hub_client(product_ids(150))
+
+        list(
+            iter_sentinel_products(
+                self.sentinel_product_request._replace(rows=500), client=client
+            )
+        )
+
+        assert_that(self._requested_pages(client)).is_equal_to([(0, 100), (100, 100)])
+
+    def test_when_rows_and_start_set_then_used_as_page_size_and_offset(self):
+        client = hub_client(product_ids(50))
+
+        products = list(
+            iter_sentinel_products(
+                self.sentinel_product_request._replace(rows=20, start=15),
+                client=client,
+            )
+        )
+
+        assert_that(products).is_length(35)
+        assert_that(self._requested_pages(client)).is_equal_to([(15, 20), (35, 20)])
+
+    def test_when_iterated_lazily_then_only_fetches_pages_as_needed(self):
+        client = hub_client(product_ids(1000))
+
+        products = iter_sentinel_products(self.sentinel_product_request, client=client)
+        next(products)
+
+        client.query.assert_called_once()
+
+    def test_when_hub_returns_empty_page_then_stops(self):
+        client = Mock()
+        client.query.return_value = page([], 10)
+
+        assert_that(
+            list(iter_sentinel_products(self.sentinel_product_request, client=client))
+        ).is_empty()
+
+    def test_when_page_fails_then_raises(self):
+        client = Mock()
+        client.query.side_effect = [
+            page(["0"], 2),
+            QuerySentinelProductsResponse(503, None),
+        ]
+
+        products = iter_sentinel_products(self.sentinel_product_request, client=client)
+
+        assert_that(next(products)).is_equal_to({"id": "0"})
+        with pytest.raises(QuerySentinelProductsError):
+            next(products)
+
+    @responses.activate
+    def test_when_no_client_supplied_then_uses_default_client(self):
+        responses.add(
+            responses.GET,
+            re.compile(r"https://scihub\.copernicus\.eu/dhus/.+"),
+            json=page(["0"], 1).body,
+            status=200,
+        )
+
+        with patch("sentinelpy.main.__DEFAULT_CLIENT", None):
+            products = list(iter_sentinel_products(self.sentinel_product_request))
+
+        assert_that(products).is_equal_to([{"id": "0"}])
+
+
+class TestFetchSentinelProductsParallel:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.sentinel_product_request = SentinelProductRequest(
+            "*", None, "ingestiondate asc", 0, "test-user", "test-password"
+        )
+
+    def test_when_fetched_then_returns_all_products_in_server_order(self):
+        client = hub_client(product_ids(1050))
+
+        products = fetch_sentinel_products_parallel(
+            self.sentinel_product_request, client=client, max_workers=4
+        )
+
+        assert_that([product["id"] for product in products]).is_equal_to(
+            [str(i) for i in range(1050)]
+        )
+        assert_that(client.query.call_count).is_equal_to(11)
+
+    def test_when_pages_complete_out_of_order_then_returns_server_order(self):
+        def query(request, logger=None):
+            time.sleep(0.05 if request.start == 100 else 0)
+            return page([str(request.start)], 300)
+
+        client = Mock()
+        client.query.side_effect = query
+
+        products = fetch_sentinel_products_parallel(
+            self.sentinel_product_request, client=client, max_workers=2
+        )
+
+        assert_that([product["id"] for product in products]).is_equal_to(
+            ["0", "100", "200"]
+        )
+
+    def test_when_page_fails_then_retries_only_that_page(self):
+        failures = {200: 2}
+
+        def query(request, logger=None):
+            if failures.get(request.start, 0) > 0:
+                failures[request.start] -= 1
+                return QuerySentinelProductsResponse(None, None, IOError())
+            return page([str(request.start)], 300)
+
+        client = Mock()
+        client.query.side_effect = query
+
+        with patch("sentinelpy.pagination.time.sleep") as sleep_mock:
+            products = fetch_sentinel_products_parallel(
+                self.sentinel_product_request, client=client, max_page_retries=2
+            )
+
+        assert_that(products).is_length(3)
+        starts = [call[0][0].start for call in client.query.call_args_list]
+        assert_that(sorted(starts)).is_equal_to([0, 100, 200, 200, 200])
+        delays = [call[0][0] for call in sleep_mock.call_args_list]
+        assert_that(delays).is_length(2)
+        assert_that(delays[0]).is_between(0, 0.5)
+        assert_that(delays[1]).is_between(0, 1.0)
+
+    def test_when_page_fails_after_retries_then_raises(self):
+        def query(request, logger=None):
+            if request.start == 100:
+                return QuerySentinelProductsResponse(503, None)
+            return page([str(request.start)], 300)
+
+        client = Mock()
+        client.query.side_effect = query
+
+        with pytest.raises(QuerySentinelProductsError), patch(
+            "sentinelpy.pagination.time.sleep"
+        ):
+            fetch_sentinel_products_parallel(
+                self.sentinel_product_request, client=client, max_page_retries=1
+            )
+
+    def test_when_page_fails_with_non_transient_error_then_raises_without_retry(
+        self,
+    ):
+        def query(request, logger=None):
+            if request.start == 100:
+                return QuerySentinelProductsResponse(401, None)
+            return page([str(request.start)], 300)
+
+        client = Mock()
+        client.query.side_effect = query
+
+        with pytest.raises(QuerySentinelProductsError), patch(
+            "sentinelpy.pagination.time.sleep"
+        ) as sleep_mock:
+            fetch_sentinel_products_parallel(
+                self.sentinel_product_request, client=client, max_page_retries=2
+            )
+
+        starts = [call[0][0].start for call in client.query.call_args_list]
+        assert_that(starts.count(100)).is_equal_to(1)
+        sleep_mock.assert_not_called()
+
+    def test_when_first_page_is_empty_then_returns_no_products(self):
+        client = Mock()
+        client.query.return_value = page([], 0)
+
+        assert_that(
+            fetch_sentinel_products_parallel(
+                self.sentinel_product_request, client=client
+            )
+        ).is_empty()
+
+    def test_when_invalid_arguments_then_raises_value_error(self):
+        with pytest.raises(ValueError):
+            fetch_sentinel_products_parallel(
+                self.sentinel_product_request, client=Mock(), max_workers=0
+            )
+        with pytest.raises(ValueError):
+            fetch_sentinel_products_parallel(
+                self.sentinel_product_request, client=Mock(), max_page_retries=-1
+            )
+
+
+class TestIterSentinelProductsReadingAhead:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.sentinel_product_request = SentinelProductRequest(
+            "*", None, "ingestiondate asc", 0, "test-user", "test-password"
+        )
+
+    def test_when_negative_read_ahead_then_raises_value_error(self):
+        with pytest.raises(ValueError):
+            iter_sentinel_products(
+                self.sentinel_product_request, client=Mock(), read_ahead=-1
+            )
+
+    def test_when_reading_ahead_then_yields_all_products_in_order(self):
+        client = hub_client(product_ids(1050))
+
+        products = list(
+            iter_sentinel_products(
+                self.sentinel_product_request, client=client, read_ahead=3
+            )
+        )
+
+        assert_that([product["id"] for product in products]).is_equal_to(
+            [str(i) for i in range(1050)]
+        )
+        assert_that(client.query.call_count).is_equal_to(11)
+
+    def test_when_consuming_page_then_following_pages_are_fetched(self):
+        fetched = threading.Semaphore(0)
+        client = hub_client(product_ids(1000))
+        query = client.query.side_effect
+
+        def query_and_signal(request, logger=None):
+            response = query(request, logger)
+            fetched.release()
+            return response
+
+        client.query.side_effect = query_and_signal
+
+        products = iter_sentinel_products(
+            self.sentinel_product_request, client=client, read_ahead=2
+        )
+        next(products)
+        for _ in range(3):
+            assert_that(fetched.acquire(timeout=1)).is_true()
+
+        starts = sorted(call[0][0].start for call in client.query.call_args_list)
+        assert_that(starts).is_equal_to([0, 100, 200])
+        products.close()
+
+    def test_when_first_page_is_last_page_then_yields_it(self):
+        client = hub_client(product_ids(40))
+
+        products = list(
+            iter_sentinel_products(
+                self.sentinel_product_request, client=client, read_ahead=2
+            )
+        )
+
+        assert_that(products).is_length(40)
+        client.query.assert_called_once()
+
+    def test_when_page_ahead_fails_then_raises_when_reached(self):
+        def query(request, logger=None):
+            if request.start == 200:
+                return QuerySentinelProductsResponse(503, None)
+            return page([str(request.start)], 400)
+
+        client = Mock()
+        client.query.side_effect = query
+
+        products = iter_sentinel_products(
+            self.sentinel_product_request, client=client, read_ahead=2
+        )
+
+        assert_that(next(products)).is_equal_to({"id": "0"})
+        assert_that(next(products)).is_equal_to({"id": "100"})
+        with pytest.raises(QuerySentinelProductsError):
+            next(products)
+
+
+class TestIterMergedSentinelProducts:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.sentinel_product_requests = [
+            SentinelProductRequest(query, None, None, 0, "test-user", "test-password")
+            for query in ("a", "b", "c")
+        ]
+
+    def test_when_iterated_then_yields_each_product_once(self):
+        ids_by_query = {"a": ["1", "2", "3"], "b": ["3", "4"], "c": ["1", "5"]}
+        client = Mock()
+        client.query.side_effect = lambda request, logger=None: page(
+            ids_by_query[request.query], len(ids_by_query[request.query])
+        )
+
+        products = list(
+            iter_merged_sentinel_products(
+                self.sentinel_product_requests, client=client, max_workers=2
+            )
+        )
+
+        assert_that(sorted(product["id"] for product in products)).is_equal_to(
+            ["1", "2", "3", "4", "5"]
+        )
+
+    def test_when_a_request_fails_then_raises(self):
+        client = Mock()
+        client.query.side_effect = lambda request, logger=None: (
+            QuerySentinelProductsResponse(503, None)
+            if request.query == "b"
+            else page([request.query], 1)
+        )
+
+        with pytest.raises(QuerySentinelProductsError):
+            list(
+                iter_merged_sentinel_products(
+                    self.sentinel_product_requests, client=client
+                )
+            )
+
+    def test_when_consumer_stops_early_then_requests_stop(self):
+        client = hub_client(product_ids(100000))
+
+        products = iter_merged_sentinel_products(
+            self.sentinel_product_requests, client=client, max_workers=3
+        )
+        next(products)
+        products.close()
+
+        assert_that(client.query.call_count).is_less_than(30)
+
+    def test_when_consumer_stops_early_then_queued_requests_not_fetched(self):
+        def query(request, logger=None):
+            if request.query == "b":
+                time.sleep(0.1)
+            return page([request.query], 1)
+
+        client = Mock()
+        client.query.side_effect = query
+
+        products = iter_merged_sentinel_products(
+            self.sentinel_product_requests, client=client, max_workers=1
+        )
+        next(products)
+        products.close()
+
+        queries = [call[0][0].query for call in client.query.call_args_list]
+        assert_that(queries).does_not_contain("c")
+
+    def test_when_max_workers_less_than_one_then_raises_value_error(self):
+        with pytest.raises(ValueError):
+            iter_merged_sentinel_products(
+                self.sentinel_product_requests, client=Mock(), max_workers=0
+            )
+
+    def test_when_no_client_supplied_then_uses_default_client(self):
+        client = hub_client(product_ids(3))
+
+        with patch("sentinelpy.pagination.default_client", return_value=client):
+            products = list(
+                iter_merged_sentinel_products(self.sentinel_product_requests[:1])
+            )
+
+        assert_that(products).is_length(3)
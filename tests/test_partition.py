@@ -0,0 +1,177 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+from unittest.mock import Mock
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import (
+    PlatformName,
+    RequestQueryBuilder,
+    SentinelProductRequest,
+    iter_partitioned_sentinel_products,
+    partition_sentinel_product_request,
+)
+from sentinelpy.request.model import FilterKeyword
+from tests.utils import hub_client
+
+RANGE_PATTERN = re.compile(r"(ingestiondate|beginposition):\[(\S+) TO (\S+)\]")
+WINDOW_START = datetime(2020, 1, 1)
+
+
+def parse_date(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def products_in_window(
+    ingestion_dates: List[datetime],
+) -> Callable[[SentinelProductRequest], List[Dict[str, str]]]:
+    def matching(request):
+        _, start, end = RANGE_PATTERN.findall(request.query)[0]
+        return [
+            {"id": f"product-{index}"}
+            for index, ingestion_date in enumerate(ingestion_dates)
+            if parse_date(start) <= ingestion_date <= parse_date(end)
+        ]
+
+    return matching
+
+
+def windows(requests) -> List[List[datetime]]:
+    return [
+        [parse_date(value) for value in RANGE_PATTERN.findall(request.query)[0][1:]]
+        for request in requests
+    ]
+
+
+class TestPartitionSentinelProductRequest:
+    def test_when_window_small_enough_then_returns_single_partition(self):
+        client = hub_client(products_in_window([WINDOW_START + timedelta(hours=1)]))
+
+        partitions = partition_sentinel_product_request(
+            "*",
+            WINDOW_START,
+            WINDOW_START + timedelta(days=1),
+            username="test-user",
+            password="test-password",
+            client=client,
+        )
+
+        assert_that(partitions).is_length(1)
+        assert_that(partitions[0].query).is_equal_to(
+            "ingestiondate:[2020-01-01T00:00:00.000Z TO 2020-01-02T00:00:00.000Z]"
+        )
+        assert_that(partitions[0].username).is_equal_to("test-user")
+        assert_that(partitions[0].password).is_equal_to("test-password")
+
+    def test_when_window_too_large_then_bisects_until_under_max_size(self):
+        ingestion_dates = [WINDOW_START + timedelta(hours=hour) for hour in range(40)]
+        client = hub_client(products_in_window(ingestion_dates))
+
+        partitions = partition_sentinel_product_request(
+            "*",
+            WINDOW_START,
+            WINDOW_START + timedelta(days=2),
+            username="test-user",
+            password="test-password",
+            max_partition_size=10,
+            client=client,
+        )
+
+        partition_windows = windows(partitions)
+        assert_that(partition_windows[0][0]).is_equal_to(WINDOW_START)
+        assert_that(partition_windows[-1][1]).is_equal_to(
+            WINDOW_START + timedelta(days=2)
+        )
+        for (_, previous_end), (next_start, _) in zip(
+            partition_windows, partition_windows[1:]
+        ):
+            assert_that(next_start - previous_end).is_less_than_or_equal_to(
+                timedelta(milliseconds=1)
+            )
+        for start, end in partition_windows:
+            count = len([date for date in ingestion_dates if start <= date <= end])
+            assert_that(count).is_between(1, 10)
+
+    def test_when_partition_cannot_be_split_then_returned_oversized(self):
+        client = hub_client(products_in_window([WINDOW_START] * 5))
+
+        partitions = partition_sentinel_product_request(
+            "*",
+            WINDOW_START,
+            WINDOW_START + timedelta(milliseconds=3),
+            username="test-user",
+            password="test-password",
+            max_partition_size=2,
+            client=client,
+        )
+
+        assert_that(windows(partitions)).is_equal_to(
+            [[WINDOW_START, WINDOW_START + timedelta(milliseconds=1)]]
+        )
+
+    def test_when_query_and_begin_position_then_partitions_on_begin_position(self):
+        client = hub_client(products_in_window([WINDOW_START]))
+
+        partitions = partition_sentinel_product_request(
+            RequestQueryBuilder().platform_name(PlatformName.SENTINEL_1),
+            datetime(2020, 1, 1, 1, tzinfo=timezone(timedelta(hours=1))),
+            datetime(2020, 1, 1, 1, 0, 0, 5000, tzinfo=timezone(timedelta(hours=1))),
+            username="test-user",
+            password="test-password",
+            date_field=FilterKeyword.BEGIN_POSITION,
+            client=client,
+        )
+
+        assert_that(partitions[0].query).is_equal_to(
+            "(platformname:Sentinel-1) AND beginposition:"
+            "[2020-01-01T00:00:00.000Z TO 2020-01-01T00:00:00.005Z]"
+        )
+
+    @pytest.mark.parametrize(
+        "arguments",
+        [
+            {"date_field": FilterKeyword.FOOTPRINT},
+            {"window_end": WINDOW_START - timedelta(days=1)},
+            {"max_partition_size": 0},
+            {"max_workers": 0},
+        ],
+    )
+    def test_when_invalid_arguments_then_raises_value_error(self, arguments):
+        all_arguments = {
+            "query": "*",
+            "window_start": WINDOW_START,
+            "window_end": WINDOW_START + timedelta(days=1),
+            "username": "test-user",
+            "password": "test-password",
+            "client": Mock(),
+            **arguments,
+        }
+
+        with pytest.raises(ValueError):
+            partition_sentinel_product_request(**all_arguments)
+
+
+class TestIterPartitionedSentinelProducts:
+    def test_when_iterated_then_yields_every_product_once(self):
+        ingestion_dates = [
+            WINDOW_START + timedelta(minutes=minute) for minute in range(0, 3000, 7)
+        ]
+        client = hub_client(products_in_window(ingestion_dates))
+
+        products = list(
+            iter_partitioned_sentinel_products(
+                "*",
+                WINDOW_START,
+                WINDOW_START + timedelta(days=3),
+                username="test-user",
+                password="test-password",
+                max_partition_size=50,
+                client=client,
+            )
+        )
+
+        assert_that(sorted(product["id"] for product in products)).is_equal_to(
+            sorted(f"product-{index}" for index in range(len(ingestion_dates)))
+        )
@@ -0,0 +1,96 @@
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import (
+    OrbitDirection,
+    PlatformName,
+    PolarisationMode,
+    Product,
+    QuerySentinelProductsResponse,
+    SensorOperationalMode,
+    Sentinel1ProductType,
+    Sentinel2ProductType,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+class TestProduct:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        with open(f"{DATA_DIR}/sentinel.api.json", "r") as sentinel_data:
+            self.response = QuerySentinelProductsResponse(200, json.load(sentinel_data))
+        self.sentinel_1 = self.response.products[2]
+        self.sentinel_2 = self.response.products[0]
+
+    def test_when_response_has_entries_then_products_wrap_each(self):
+        assert_that(self.response.products).is_length(10)
+        assert_that(self.sentinel_1.entry).is_same_as(self.response.entries[2])
+
+    def test_when_fields_read_then_decoded_to_python_types(self):
+        assert_that(self.sentinel_1.uuid).is_equal_to(
+            "a0ac0971-080d-49d9-bdac-00a6e35c9c03"
+        )
+        assert_that(self.sentinel_1.identifier).starts_with("S1A_IW_GRDH_1SDV")
+        assert_that(self.sentinel_1.begin_position).is_equal_to(
+            datetime(2020, 10, 20, 9, 4, 24, 416000, timezone.utc)
+        )
+        assert_that(self.sentinel_1.relative_orbit_number).is_equal_to(155)
+        assert_that(self.sentinel_1["slicenumber"]).is_equal_to(5)
+        assert_that(self.sentinel_2.cloud_cover_percentage).is_equal_to(0.0)
+        assert_that(self.sentinel_2.footprint).starts_with("MULTIPOLYGON")
+
+    def test_when_enum_fields_read_then_mapped_to_enums(self):
+        assert_that(self.sentinel_1.platform_name).is_equal_to(PlatformName.SENTINEL_1)
+        assert_that(self.sentinel_1.product_type).is_equal_to(Sentinel1ProductType.GRD)
+        assert_that(self.sentinel_1.polarisation_mode).is_equal_to(
+            PolarisationMode.VV_VH
+        )
+        assert_that(self.sentinel_1.orbit_direction).is_equal_to(
+            OrbitDirection.ASCENDING
+        )
+        assert_that(self.sentinel_1.sensor_operational_mode).is_equal_to(
+            SensorOperationalMode.IW
+        )
+        assert_that(self.sentinel_2.product_type).is_equal_to(
+            Sentinel2ProductType.S2MSI1C
+        )
+
+    def test_when_enum_value_unknown_then_returns_text(self):
+        product = Product({"str": {"name": "platformname", "content": "Sentinel-6"}})
+
+        assert_that(product.platform_name).is_equal_to("Sentinel-6")
+
+    def test_when_field_missing_then_get_returns_default_and_item_raises(self):
+        assert_that(self.sentinel_2.get("slicenumber")).is_none()
+        assert_that(self.sentinel_2.get("slicenumber", 0)).is_equal_to(0)
+        with pytest.raises(KeyError):
+            self.sentinel_2["slicenumber"]
+
+    def test_when_iterated_then_yields_field_names(self):
+        assert_that(list(self.sentinel_1)).contains("uuid", "beginposition")
+        assert_that(self.sentinel_1).is_length(len(set(self.sentinel_1)))
+        assert_that("missing" in self.sentinel_1).is_false()
+
+    def test_when_field_read_twice_then_decoded_once(self):
+        first = self.sentinel_1.begin_position
+
+        assert_that(self.sentinel_1.begin_position).is_same_as(first)
+
+    def test_when_date_invalid_then_raises_value_error(self):
+        product = Product({"date": [{"name": "beginposition", "content": "today"}]})
+
+        with pytest.raises(ValueError):
+            product.begin_position
+
+    def test_when_entries_equal_then_products_equal(self):
+        assert_that(Product(self.sentinel_1.entry)).is_equal_to(self.sentinel_1)
+        assert_that(self.sentinel_1).is_not_equal_to(self.sentinel_2)
+        assert_that(repr(self.sentinel_1)).contains(self.sentinel_1.uuid)
+
+    def test_when_created_then_has_no_instance_dict(self):
+        assert_that(hasattr(self.sentinel_1, "__dict__")).is_false()
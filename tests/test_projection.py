@@ -0,0 +1,112 @@
+import json
+import os
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import (
+    LazyQuerySentinelProductsResponse,
+    Product,
+    QuerySentinelProductsResponse,
+    project_entry,
+    project_response,
+)
+from sentinelpy.exceptions import QuerySentinelProductsError
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+FIELDS = ["uuid", "title", "footprint", "beginposition", "cloudcoverpercentage"]
+
+
+class TestProjectEntry:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        with open(f"{DATA_DIR}/sentinel.api.json") as sentinel_data:
+            self.body = json.load(sentinel_data)
+        self.entry = self.body["feed"]["entry"][0]
+
+    def test_when_projected_then_keeps_only_requested_fields(self):
+        projected = project_entry(self.entry, FIELDS)
+
+        assert_that(projected).contains_only("id", "title", "str", "date", "double")
+        assert_that([field["name"] for field in projected["str"]]).is_equal_to(
+            ["footprint", "uuid"]
+        )
+        assert_that(projected["date"]).is_length(1)
+        assert_that(projected["double"]).is_length(1)
+
+    def test_when_projected_then_fields_decode_as_before(self):
+        product = Product(self.entry)
+
+        projected = Product(project_entry(self.entry, FIELDS))
+
+        assert_that(projected.uuid).is_equal_to(product.uuid)
+        assert_that(projected.identifier).is_equal_to(product.identifier)
+        assert_that(projected.footprint).is_equal_to(product.footprint)
+        assert_that(projected.begin_position).is_equal_to(product.begin_position)
+        assert_that(projected.cloud_cover_percentage).is_equal_to(
+            product.cloud_cover_percentage
+        )
+        assert_that(projected.platform_name).is_none()
+
+    def test_when_typed_field_single_object_then_kept_as_list(self):
+        entry = {"id": "1", "double": {"name": "cloudcoverpercentage", "content": "2"}}
+
+        projected = project_entry(entry, frozenset(["cloudcoverpercentage"]))
+
+        assert_that(projected).is_equal_to(
+            {"id": "1", "double": [{"name": "cloudcoverpercentage", "content": "2"}]}
+        )
+
+    def test_when_no_fields_then_keeps_id(self):
+        assert_that(project_entry(self.entry, [])).is_equal_to({"id": self.entry["id"]})
+
+    def test_when_response_projected_then_keeps_rest_of_body(self):
+        response = QuerySentinelProductsResponse(200, self.body)
+
+        projected = project_response(response, FIELDS)
+
+        assert_that(projected.total_results).is_equal_to(response.total_results)
+        assert_that(projected.entries).is_equal_to(
+            [project_entry(entry, FIELDS) for entry in response.entries]
+        )
+        assert_that(self.body["feed"]["entry"][0]).is_same_as(self.entry)
+
+    def test_when_lazy_response_projected_then_projected_once_decoded(self):
+        response = LazyQuerySentinelProductsResponse(
+            200, json.dumps(self.body).encode()
+        )
+
+        projected = project_response(response, FIELDS)
+
+        assert_that(projected.decoded).is_false()
+        assert_that(response.decoded).is_false()
+        assert_that(projected.entries).is_equal_to(
+            [project_entry(entry, FIELDS) for entry in self.body["feed"]["entry"]]
+        )
+        assert_that(projected.total_results).is_equal_to(
+            QuerySentinelProductsResponse(200, self.body).total_results
+        )
+
+    def test_when_lazy_response_invalid_then_projected_response_fails(self):
+        response = LazyQuerySentinelProductsResponse(200, b"not json")
+
+        projected = project_response(response, FIELDS)
+
+        assert_that(projected.success).is_false()
+        assert_that(projected.error).is_instance_of(QuerySentinelProductsError)
+
+    @pytest.mark.parametrize(
+        "response",
+        [
+            QuerySentinelProductsResponse(200, {"feed": {}}),
+            QuerySentinelProductsResponse(500, {}),
+            QuerySentinelProductsResponse(None, None, IOError()),
+        ],
+    )
+    def test_when_response_has_no_products_then_returned_as_is(self, response):
+        assert_that(project_response(response, FIELDS)).is_same_as(response)
+
+    def test_when_fields_none_then_response_returned_as_is(self):
+        response = QuerySentinelProductsResponse(200, self.body)
+
+        assert_that(project_response(response, None)).is_same_as(response)
@@ -13,8 +13,10 @@ from tests.utils import get_query_parameters_of_url
 
 @pytest.fixture()
 def requests_mock():
-    with patch("sentinelpy.main.requests") as mock:
-        yield mock
+    with patch("sentinelpy.main.__DEFAULT_CLIENT", None), patch(
+        "sentinelpy.client.requests"
+    ) as mock:
+        yield mock.Session.return_value
 
 
 class TestQuerySentinelHub:
@@ -129,7 +131,7 @@ class TestQuerySentinelHub:
 
     def test_when_request_successful_then_returns_status_code_and_json(self):
         self.requests_mock.get.return_value.status_code = 200
-        self.requests_mock.get.return_value.json.return_value = {"content": {}}
+        self.requests_mock.get.return_value.content = b'{"content": {}}'
 
         result = query_sentinel_hub(self.sentinel_product_request)
 
@@ -141,7 +143,7 @@ class TestQuerySentinelHub:
         self,
     ):
         self.requests_mock.get.return_value.status_code = 400
-        self.requests_mock.get.return_value.json.return_value = {"content": {}}
+        self.requests_mock.get.return_value.content = b'{"content": {}}'
 
         result = query_sentinel_hub(self.sentinel_product_request)
 
@@ -162,10 +164,10 @@ class TestQuerySentinelHub:
     def test_when_response_is_not_json_then_returns_content_as_string_with_error(self):
         original_error = ValueError()
         self.requests_mock.get.return_value.status_code = 200
-        self.requests_mock.get.return_value.json.side_effect = original_error
         self.requests_mock.get.return_value.content = "Not json".encode()
 
-        result = query_sentinel_hub(self.sentinel_product_request)
+        with patch("sentinelpy.client.decode_json", side_effect=original_error):
+            result = query_sentinel_hub(self.sentinel_product_request)
 
         assert_that(result).is_equal_to(
             QuerySentinelProductsResponse(
@@ -173,7 +175,7 @@ class TestQuerySentinelHub:
             )
         )
 
-    @patch("sentinelpy.main.urlencode")
+    @patch("sentinelpy.client.urlencode")
     def test_when_called_then_encodes_parameters(self, urlencode_mock):
         query_sentinel_hub(self.sentinel_product_request_with_query)
 
@@ -1,9 +1,14 @@
-from unittest.mock import Mock
+import pickle
+from unittest.mock import Mock, patch
 
+import pytest
 from assertpy import assert_that, fail
 
 from sentinelpy.exceptions import QuerySentinelProductsError
-from sentinelpy.query_sentinel_products_response import QuerySentinelProductsResponse
+from sentinelpy.query_sentinel_products_response import (
+    LazyQuerySentinelProductsResponse,
+    QuerySentinelProductsResponse,
+)
 
 
 class TestQuerySentinelProductsResponse:
@@ -176,3 +181,149 @@ class TestQuerySentinelProductsResponse:
 
         correct_cb.assert_called_once()
         incorrect_cb.assert_not_called()
+
+    def test_when_body_has_entries_then_entries_returns_them(self):
+        response = QuerySentinelProductsResponse(
+            200, {"feed": {"entry": [{"id": "1"}, {"id": "2"}]}}
+        )
+
+        assert_that(response.entries).is_equal_to([{"id": "1"}, {"id": "2"}])
+
+    def test_when_body_has_single_entry_then_entries_returns_list(self):
+        response = QuerySentinelProductsResponse(200, {"feed": {"entry": {"id": "1"}}})
+
+        assert_that(response.entries).is_equal_to([{"id": "1"}])
+
+    def test_when_body_has_no_entries_then_entries_is_empty(self):
+        assert_that(QuerySentinelProductsResponse(200, {"feed": {}}).entries).is_empty()
+        assert_that(QuerySentinelProductsResponse(400, None).entries).is_empty()
+
+    def test_when_body_has_total_results_then_returns_it_as_int(self):
+        response = QuerySentinelProductsResponse(
+            200, {"feed": {"opensearch:totalResults": "42"}}
+        )
+
+        assert_that(response.total_results).is_equal_to(42)
+
+    def test_when_body_has_no_total_results_then_total_results_is_none(self):
+        no_total = QuerySentinelProductsResponse(200, {"feed": {}})
+
+        assert_that(no_total.total_results).is_none()
+        assert_that(QuerySentinelProductsResponse(400, None).total_results).is_none()
+
+    def test_when_success_then_raise_for_failure_does_nothing(self):
+        QuerySentinelProductsResponse(200, {}).raise_for_failure()
+
+    def test_when_error_then_raise_for_failure_raises_error(self):
+        error = QuerySentinelProductsError(ValueError(), 200, "not json")
+
+        response = QuerySentinelProductsResponse(200, None, error)
+
+        assert_that(response.raise_for_failure).raises(
+            QuerySentinelProductsError
+        ).when_called_with()
+
+    def test_when_unsuccessful_status_then_raise_for_failure_raises(self):
+        response = QuerySentinelProductsResponse(401, {"error": "unauthorised"})
+
+        try:
+            response.raise_for_failure()
+            fail("Expected QuerySentinelProductsError")
+        except QuerySentinelProductsError as error:
+            assert_that(error.status_code).is_equal_to(401)
+            assert_that(error.response_data).is_equal_to("{'error': 'unauthorised'}")
+
+
+class TestLazyQuerySentinelProductsResponse:
+    def test_when_status_checked_then_body_not_decoded(self):
+        with patch(
+            "sentinelpy.query_sentinel_products_response.decode_json"
+        ) as decode_json_mock:
+            response = LazyQuerySentinelProductsResponse(200, b"{}")
+
+            assert_that(response.status_code).is_equal_to(200)
+            assert_that(response.error).is_none()
+
+        assert_that(response.decoded).is_false()
+        decode_json_mock.assert_not_called()
+
+    def test_when_body_invalid_then_success_is_false(self):
+        response = LazyQuerySentinelProductsResponse(200, b"<html></html>")
+
+        assert_that(response.success).is_false()
+        assert_that(response.error).is_instance_of(QuerySentinelProductsError)
+
+    def test_when_body_invalid_then_raise_for_failure_raises_json_error(self):
+        response = LazyQuerySentinelProductsResponse(200, b"<html></html>")
+
+        with pytest.raises(QuerySentinelProductsError) as error:
+            response.raise_for_failure()
+
+        assert_that(error.value.response_data).is_equal_to("<html></html>")
+        assert_that(response.raise_error).raises(
+            QuerySentinelProductsError
+        ).when_called_with()
+
+    def test_when_body_read_then_decoded_once(self):
+        with patch(
+            "sentinelpy.query_sentinel_products_response.decode_json",
+            return_value={"feed": {"opensearch:totalResults": "3"}},
+        ) as decode_json_mock:
+            response = LazyQuerySentinelProductsResponse(200, b"{}")
+
+            assert_that(response.total_results).is_equal_to(3)
+            assert_that(response.body).is_same_as(response.body)
+
+        assert_that(response.decoded).is_true()
+        decode_json_mock.assert_called_once_with(b"{}")
+
+    def test_when_decoded_then_equal_to_eager_response(self):
+        response = LazyQuerySentinelProductsResponse(200, b'{"feed": {}}')
+        eager_response = QuerySentinelProductsResponse(200, {"feed": {}})
+
+        assert_that(response == eager_response).is_true()
+        assert_that(eager_response == response).is_true()
+        assert_that(tuple(response)).is_equal_to((200, {"feed": {}}, None))
+        assert_that(response[1]).is_equal_to({"feed": {}})
+        assert_that(response._asdict()["body"]).is_equal_to({"feed": {}})
+
+    def test_when_replaced_then_returns_eager_response(self):
+        response = LazyQuerySentinelProductsResponse(200, b"{}")
+
+        replaced = response._replace(status_code=201)
+
+        assert_that(replaced).is_type_of(QuerySentinelProductsResponse)
+        assert_that(replaced).is_equal_to(QuerySentinelProductsResponse(201, {}))
+
+    def test_when_pickled_then_keeps_content(self):
+        response = LazyQuerySentinelProductsResponse(200, b'{"feed": {}}')
+
+        unpickled = pickle.loads(pickle.dumps(response))
+
+        assert_that(unpickled.content).is_equal_to(b'{"feed": {}}')
+        assert_that(unpickled).is_equal_to(response)
+        assert_that(repr(unpickled)).contains("content=<12 bytes>")
+
+    def test_when_body_invalid_then_on_failure_called_with_error(self):
+        on_success = Mock()
+        on_failure = Mock()
+        response = LazyQuerySentinelProductsResponse(200, b"not json")
+
+        response.on_success(on_success).on_failure(on_failure)
+
+        on_success.assert_not_called()
+        on_failure.assert_called_once_with(response)
+        assert_that(response.body).is_none()
+        assert_that(response.success).is_false()
+        assert_that(response.error).is_instance_of(QuerySentinelProductsError)
+        assert_that(response.error.response_data).is_equal_to("not json")
+
+    def test_when_body_valid_then_on_success_called_with_body(self):
+        on_success = Mock()
+        on_failure = Mock()
+        response = LazyQuerySentinelProductsResponse(200, b'{"feed": {}}')
+
+        response.on_success(on_success).on_failure(on_failure)
+
+        on_success.assert_called_once_with({"feed": {}})
+        on_failure.assert_not_called()
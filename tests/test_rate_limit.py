@@ -0,0 +1,103 @@
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import RateLimiter, SentinelHubClient, SentinelProductRequest
+
+
+class TestRateLimiter:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.now = 1000.0
+        with patch("sentinelpy.rate_limit.time") as time_mock:
+            time_mock.monotonic.side_effect = lambda: self.now
+            time_mock.time.side_effect = lambda: self.now
+            self.time_mock = time_mock
+            yield
+
+    @pytest.mark.parametrize("rate,burst", [(0, 1), (-1.0, 1), (1.0, 0)])
+    def test_when_arguments_invalid_then_raises_value_error(self, rate, burst):
+        with pytest.raises(ValueError):
+            RateLimiter(rate, burst)
+
+    def test_when_within_burst_then_does_not_wait(self):
+        rate_limiter = RateLimiter(2.0, burst=3)
+
+        delays = [rate_limiter.reserve() for _ in range(3)]
+
+        assert_that(delays).is_equal_to([0.0, 0.0, 0.0])
+
+    def test_when_burst_exhausted_then_waits_for_refill(self):
+        rate_limiter = RateLimiter(2.0, burst=2)
+
+        delays = [rate_limiter.reserve() for _ in range(4)]
+
+        assert_that(delays).is_equal_to([0.0, 0.0, 0.5, 1.0])
+
+    def test_when_idle_then_refills_up_to_burst(self):
+        rate_limiter = RateLimiter(2.0, burst=2)
+        for _ in range(2):
+            rate_limiter.reserve()
+
+        self.now += 60
+        delays = [rate_limiter.reserve() for _ in range(3)]
+
+        assert_that(delays).is_equal_to([0.0, 0.0, 0.5])
+
+    def test_when_acquire_called_then_sleeps_for_delay(self):
+        rate_limiter = RateLimiter(4.0)
+
+        rate_limiter.acquire()
+        rate_limiter.acquire()
+
+        self.time_mock.sleep.assert_called_once_with(0.25)
+
+    def test_when_shared_between_threads_then_each_token_taken_once(self):
+        rate_limiter = RateLimiter(1.0, burst=1)
+        delays = []
+
+        def reserve():
+            for _ in range(50):
+                delays.append(rate_limiter.reserve())
+
+        threads = [threading.Thread(target=reserve) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert_that(sorted(delays)).is_equal_to([float(n) for n in range(200)])
+
+    def test_when_lock_file_given_then_bucket_shared_between_limiters(self, tmp_path):
+        lock_file = str(tmp_path / "bucket")
+        first = RateLimiter(2.0, burst=2, lock_file=lock_file)
+        second = RateLimiter(2.0, burst=2, lock_file=lock_file)
+
+        delays = [first.reserve(), second.reserve(), first.reserve()]
+        self.now += 10
+        delays.append(second.reserve())
+
+        assert_that(delays).is_equal_to([0.0, 0.0, 0.5, 0.0])
+
+    def test_when_lock_file_corrupt_then_starts_with_full_bucket(self, tmp_path):
+        lock_file = tmp_path / "bucket"
+        lock_file.write_text("corrupt")
+
+        rate_limiter = RateLimiter(2.0, burst=1, lock_file=str(lock_file))
+
+        assert_that(rate_limiter.reserve()).is_equal_to(0.0)
+        assert_that(rate_limiter.reserve()).is_equal_to(0.5)
+
+
+class TestSentinelHubClientRateLimit:
+    @patch("sentinelpy.client.requests")
+    def test_when_rate_limiter_given_then_acquires_token_per_query(self, requests_mock):
+        rate_limiter = Mock()
+        client = SentinelHubClient(rate_limiter=rate_limiter)
+
+        client.query(SentinelProductRequest("*", 30, None, 0, "user", "password"))
+
+        rate_limiter.acquire.assert_called_once_with()
+        requests_mock.Session.return_value.get.assert_called_once()
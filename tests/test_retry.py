@@ -0,0 +1,138 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import Mock, patch
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import (
+    CircuitBreaker,
+    EndpointPool,
+    QuerySentinelProductsResponse,
+    RetryAttempt,
+    RetryPolicy,
+)
+from sentinelpy.exceptions import QuerySentinelProductsError
+from sentinelpy.retry import is_transient_failure
+
+
+class TestIsTransientFailure:
+    @pytest.mark.parametrize(
+        "response,expected",
+        [
+            (QuerySentinelProductsResponse(None, None, IOError("reset")), True),
+            (QuerySentinelProductsResponse(None, None, asyncio.TimeoutError()), True),
+            (QuerySentinelProductsResponse(503, {}, None), True),
+            (QuerySentinelProductsResponse(500, {}, None), False),
+            (QuerySentinelProductsResponse(200, {}, None), False),
+        ],
+    )
+    def test_when_called_then_matches_errors_and_status_codes(self, response, expected):
+        assert_that(is_transient_failure(response, {503})).is_equal_to(expected)
+
+    def test_when_timeout_then_every_component_treats_it_as_failure(self):
+        response = QuerySentinelProductsResponse(None, None, asyncio.TimeoutError())
+
+        assert_that(RetryPolicy().is_retryable(response)).is_true()
+        assert_that(CircuitBreaker().is_failure(response)).is_true()
+        assert_that(EndpointPool(["https://hub"]).is_failure(response)).is_true()
+
+
+class TestRetryPolicy:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.policy = RetryPolicy(max_attempts=3, backoff_base=1.0, backoff_cap=3.0)
+        self.unavailable = QuerySentinelProductsResponse(503, {}, None)
+
+    @pytest.mark.parametrize(
+        "response,expected",
+        [
+            (QuerySentinelProductsResponse(429, {}, None), True),
+            (QuerySentinelProductsResponse(502, {}, None), True),
+            (QuerySentinelProductsResponse(None, None, IOError("reset")), True),
+            (
+                QuerySentinelProductsResponse(None, None, asyncio.TimeoutError()),
+                True,
+            ),
+            (QuerySentinelProductsResponse(200, {}, None), False),
+            (QuerySentinelProductsResponse(401, {}, None), False),
+            (
+                QuerySentinelProductsResponse(
+                    200, None, QuerySentinelProductsError(ValueError(), 200, "")
+                ),
+                False,
+            ),
+        ],
+    )
+    def test_when_is_retryable_called_then_only_transient_failures_retryable(
+        self, response, expected
+    ):
+        assert_that(self.policy.is_retryable(response)).is_equal_to(expected)
+
+    @patch("sentinelpy.retry.random")
+    def test_when_delay_called_then_jitters_up_to_capped_exponential_backoff(
+        self, random_mock
+    ):
+        random_mock.uniform.side_effect = lambda low, high: high
+
+        delays = [self.policy.delay(attempt) for attempt in range(1, 5)]
+
+        assert_that(delays).is_equal_to([1.0, 2.0, 3.0, 3.0])
+        random_mock.uniform.assert_called_with(0, 3.0)
+
+    def test_when_retry_after_seconds_then_delay_at_least_retry_after(self):
+        assert_that(self.policy.delay(1, "10")).is_equal_to(10.0)
+
+    def test_when_retry_after_http_date_then_delay_until_date(self):
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=20)
+
+        delay = self.policy.delay(1, format_datetime(retry_at, usegmt=True))
+
+        assert_that(delay).is_between(15.0, 20.0)
+
+    def test_when_retry_after_invalid_then_uses_backoff(self):
+        assert_that(self.policy.delay(1, "soon")).is_less_than_or_equal_to(1.0)
+
+    def test_when_retry_after_not_respected_then_uses_backoff(self):
+        policy = self.policy._replace(respect_retry_after=False)
+
+        assert_that(policy.delay(1, "10")).is_less_than_or_equal_to(1.0)
+
+    def test_when_retry_after_over_max_then_delay_capped(self):
+        policy = self.policy._replace(max_retry_after=5.0)
+
+        assert_that(policy.delay(1, "3600")).is_equal_to(5.0)
+
+    def test_when_retry_after_over_max_then_next_delay_none(self):
+        on_attempt = Mock()
+        policy = self.policy._replace(max_retry_after=5.0, on_attempt=on_attempt)
+
+        delay = policy.next_delay(1, self.unavailable, "3600")
+
+        assert_that(delay).is_none()
+        on_attempt.assert_called_once_with(RetryAttempt(1, 503, None, None))
+
+    def test_when_retry_after_over_max_not_respected_then_next_delay_backoff(self):
+        policy = self.policy._replace(max_retry_after=5.0, respect_retry_after=False)
+
+        assert_that(
+            policy.next_delay(1, self.unavailable, "3600")
+        ).is_less_than_or_equal_to(1.0)
+
+    def test_when_response_not_retryable_then_next_delay_none(self):
+        response = QuerySentinelProductsResponse(200, {}, None)
+
+        assert_that(self.policy.next_delay(1, response)).is_none()
+
+    def test_when_attempts_exhausted_then_next_delay_none(self):
+        assert_that(self.policy.next_delay(3, self.unavailable)).is_none()
+
+    def test_when_next_delay_called_then_reports_attempt(self):
+        on_attempt = Mock()
+        policy = self.policy._replace(on_attempt=on_attempt)
+
+        delay = policy.next_delay(1, self.unavailable, "5")
+
+        on_attempt.assert_called_once_with(RetryAttempt(1, 503, None, delay))
+        assert_that(delay).is_equal_to(5.0)
@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import SentinelHubClient, SentinelProductRequest
+from sentinelpy.single_flight import SingleFlight
+from tests.utils import run_async
+
+
+class TestSingleFlight:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.single_flight = SingleFlight()
+        self.released = threading.Event()
+        self.calls = 0
+
+    def blocking_call(self):
+        self.calls += 1
+        self.released.wait(5)
+        return object()
+
+    def test_when_identical_calls_concurrent_then_called_once_and_result_shared(
+        self,
+    ):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(self.single_flight.do, "key", self.blocking_call)
+                for _ in range(4)
+            ]
+            while self.single_flight.in_flight == 0:
+                pass
+            time.sleep(0.1)
+            self.released.set()
+            results = [future.result() for future in futures]
+
+        assert_that(self.calls).is_equal_to(1)
+        assert_that(set(map(id, results))).is_length(1)
+        assert_that(self.single_flight.in_flight).is_equal_to(0)
+
+    def test_when_keys_differ_then_each_called(self):
+        self.released.set()
+
+        first = self.single_flight.do("first", self.blocking_call)
+        second = self.single_flight.do("second", self.blocking_call)
+
+        assert_that(first).is_not_same_as(second)
+        assert_that(self.calls).is_equal_to(2)
+
+    def test_when_calls_sequential_then_each_called(self):
+        self.released.set()
+
+        self.single_flight.do("key", self.blocking_call)
+        self.single_flight.do("key", self.blocking_call)
+
+        assert_that(self.calls).is_equal_to(2)
+
+    def test_when_call_raises_then_error_raised_to_every_caller(self):
+        def failing_call():
+            self.released.wait(5)
+            raise IOError("connection reset")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(self.single_flight.do, "key", failing_call)
+                for _ in range(2)
+            ]
+            while self.single_flight.in_flight == 0:
+                pass
+            self.released.set()
+            errors = [future.exception() for future in futures]
+
+        assert_that([type(error) for error in errors]).is_equal_to([OSError] * 2)
+        assert_that(self.single_flight.in_flight).is_equal_to(0)
+
+    def test_when_identical_tasks_concurrent_then_called_once_and_result_shared(
+        self,
+    ):
+        async def call():
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            return object()
+
+        async def scenario():
+            return await asyncio.gather(
+                *(self.single_flight.do_async("key", call) for _ in range(4))
+            )
+
+        results = run_async(scenario())
+
+        assert_that(self.calls).is_equal_to(1)
+        assert_that(set(map(id, results))).is_length(1)
+        assert_that(self.single_flight.in_flight).is_equal_to(0)
+
+    def test_when_one_task_cancelled_then_others_still_get_result(self):
+        async def call():
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def scenario():
+            first = asyncio.ensure_future(self.single_flight.do_async("key", call))
+            second = asyncio.ensure_future(self.single_flight.do_async("key", call))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+
+        assert_that(run_async(scenario())).is_equal_to("result")
+
+
+class TestSentinelHubClientCoalesce:
+    @patch("sentinelpy.client.requests")
+    def test_when_coalesce_then_concurrent_identical_queries_share_one_call(
+        self, requests_mock
+    ):
+        released = threading.Event()
+
+        def get(url, auth, timeout):
+            released.wait(5)
+            response = Mock(status_code=200, headers={})
+            response.content = b"{}"
+            return response
+
+        session_mock = requests_mock.Session.return_value
+        session_mock.get.side_effect = get
+        client = SentinelHubClient(coalesce=True)
+        request = SentinelProductRequest("*", 30, None, 0, "user", "password")
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(client.query, request) for _ in range(3)]
+            while session_mock.get.call_count == 0:
+                pass
+            time.sleep(0.1)
+            released.set()
+            results = [future.result() for future in futures]
+
+        assert_that(session_mock.get.call_count).is_equal_to(1)
+        assert_that(results[1]).is_same_as(results[0])
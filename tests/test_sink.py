@@ -0,0 +1,185 @@
+import io
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import (
+    DirectorySink,
+    RawSentinelProductsResponse,
+    RetryPolicy,
+    SentinelHubClient,
+    SentinelProductRequest,
+    Sink,
+    StreamSink,
+    archive_sentinel_products,
+    cache_key,
+)
+from sentinelpy.exceptions import QuerySentinelProductsError
+from tests.utils import hub_client, product_ids, raw_page
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+class TestSink:
+    def test_when_instantiated_then_raises_type_error(self):
+        with pytest.raises(TypeError):
+            Sink()  # type: ignore
+
+
+class TestRawSentinelProductsResponse:
+    def test_when_successful_then_view_is_content(self):
+        raw_response = RawSentinelProductsResponse(200, {}, b"{}")
+
+        assert_that(raw_response.success).is_true()
+        assert_that(raw_response.view.tobytes()).is_equal_to(b"{}")
+        raw_response.raise_for_failure()
+
+    def test_when_error_then_raise_for_failure_raises_error(self):
+        raw_response = RawSentinelProductsResponse(None, {}, None, IOError("reset"))
+
+        assert_that(raw_response.success).is_false()
+        assert_that(raw_response.view.tobytes()).is_empty()
+        with pytest.raises(IOError):
+            raw_response.raise_for_failure()
+
+    def test_when_status_unsuccessful_then_raise_for_failure_raises_error(self):
+        raw_response = RawSentinelProductsResponse(503, {}, b"Service Unavailable")
+
+        with pytest.raises(QuerySentinelProductsError) as error:
+            raw_response.raise_for_failure()
+
+        assert_that(error.value.status_code).is_equal_to(503)
+        assert_that(error.value.response_data).is_equal_to("Service Unavailable")
+
+
+class TestSentinelHubClientQueryRaw:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.sentinel_product_request = SentinelProductRequest(
+            "*", 30, None, 0, "test-user", "test-password"
+        )
+        with open(f"{DATA_DIR}/sentinel.api.json", "rb") as sentinel_data:
+            self.content = sentinel_data.read()
+        with patch("sentinelpy.client.requests") as requests_mock, patch(
+            "sentinelpy.client.decode_json"
+        ) as self.decode_json_mock, patch("sentinelpy.client.time.sleep"):
+            self.session_mock = requests_mock.Session.return_value
+            self.session_mock.get.return_value = Mock(
+                status_code=200,
+                headers={"Content-Type": "application/json"},
+                content=self.content,
+            )
+            yield
+
+    def test_when_queried_raw_then_returns_content_without_decoding(self):
+        raw_response = SentinelHubClient().query_raw(self.sentinel_product_request)
+
+        assert_that(raw_response.status_code).is_equal_to(200)
+        assert_that(raw_response.headers["Content-Type"]).is_equal_to(
+            "application/json"
+        )
+        assert_that(raw_response.content).is_same_as(self.content)
+        self.decode_json_mock.assert_not_called()
+
+    def test_when_unreachable_then_returns_error(self):
+        self.session_mock.get.side_effect = ConnectionError("connection refused")
+
+        raw_response = SentinelHubClient().query_raw(self.sentinel_product_request)
+
+        assert_that(raw_response.status_code).is_none()
+        assert_that(raw_response.error).is_instance_of(ConnectionError)
+
+    def test_when_retry_policy_then_retries_raw_query(self):
+        unavailable = Mock(status_code=503, headers={}, content=b"")
+        self.session_mock.get.side_effect = [
+            unavailable,
+            self.session_mock.get.return_value,
+        ]
+        client = SentinelHubClient(retry_policy=RetryPolicy(max_attempts=2))
+
+        raw_response = client.query_raw(self.sentinel_product_request)
+
+        assert_that(raw_response.status_code).is_equal_to(200)
+        assert_that(self.session_mock.get.call_count).is_equal_to(2)
+
+
+class TestArchiveSentinelProducts:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.sentinel_product_request = SentinelProductRequest(
+            "*", None, None, 0, "test-user", "test-password"
+        )
+
+    def test_when_archived_then_writes_every_page_to_stream(self):
+        client = hub_client(product_ids(250))
+        stream = io.BytesIO()
+
+        pages = archive_sentinel_products(
+            self.sentinel_product_request, StreamSink(stream), client=client
+        )
+
+        assert_that(pages).is_equal_to(3)
+        assert_that(stream.getvalue().splitlines()).is_equal_to(
+            [
+                raw_page(product_ids(250)[start : start + 100], 250).content
+                for start in (0, 100, 200)
+            ]
+        )
+
+    def test_when_archived_then_writes_each_page_to_directory(self, tmp_path):
+        client = hub_client(product_ids(150))
+        sink = DirectorySink(str(tmp_path / "archive"))
+
+        archive_sentinel_products(
+            self.sentinel_product_request._replace(rows=50), sink, client=client
+        )
+
+        requests = [call[0][0] for call in client.query_raw.call_args_list]
+        assert_that([request.start for request in requests]).is_equal_to([0, 50, 100])
+        for request in requests:
+            assert_that(sink.path(request)).ends_with(cache_key(request) + ".json")
+            with open(sink.path(request), "rb") as page_file:
+                assert_that(page_file.read()).is_equal_to(
+                    raw_page(
+                        product_ids(150)[request.start : request.start + 50], 150
+                    ).content
+                )
+        assert_that(os.listdir(sink.directory)).is_length(3)
+
+    def test_when_total_results_missing_then_writes_first_page_only(self):
+        client = Mock()
+        client.query_raw.return_value = RawSentinelProductsResponse(200, {}, b"{}")
+        stream = io.BytesIO()
+
+        pages = archive_sentinel_products(
+            self.sentinel_product_request, StreamSink(stream), client=client
+        )
+
+        assert_that(pages).is_equal_to(1)
+        assert_that(stream.getvalue()).is_equal_to(b"{}\n")
+
+    def test_when_page_fails_then_raises_error(self):
+        client = Mock()
+        client.query_raw.return_value = RawSentinelProductsResponse(
+            500, {}, b"Internal Server Error"
+        )
+        stream = io.BytesIO()
+
+        with pytest.raises(QuerySentinelProductsError):
+            archive_sentinel_products(
+                self.sentinel_product_request, StreamSink(stream), client=client
+            )
+
+        assert_that(stream.getvalue()).is_empty()
+
+    def test_when_no_client_then_uses_default_client(self):
+        client = hub_client(product_ids(1))
+
+        with patch("sentinelpy.sink.default_client", return_value=client):
+            pages = archive_sentinel_products(
+                self.sentinel_product_request, StreamSink(io.BytesIO(), flush=False)
+            )
+
+        assert_that(pages).is_equal_to(1)
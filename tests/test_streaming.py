@@ -0,0 +1,189 @@
+import json
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import (
+    EndpointPool,
+    SentinelHubClient,
+    SentinelProductRequest,
+    project_entry,
+)
+from sentinelpy.exceptions import CircuitOpenError, QuerySentinelProductsError
+from sentinelpy.streaming import iter_feed_entries
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+def chunked(content: bytes, size: int):
+    return [content[start : start + size] for start in range(0, len(content), size)]
+
+
+class TestIterFeedEntries:
+    @pytest.fixture(autouse=True, params=["tokenizer", "ijson"])
+    def setup_fixtures(self, request):
+        with open(f"{DATA_DIR}/sentinel.api.json", "rb") as sentinel_data:
+            self.content = sentinel_data.read()
+        self.entries = json.loads(self.content)["feed"]["entry"]
+        if request.param == "ijson":
+            with patch("sentinelpy.streaming.ijson", pytest.importorskip("ijson")):
+                yield
+        else:
+            with patch("sentinelpy.streaming.ijson", None):
+                yield
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1000, 10**7])
+    def test_when_body_chunked_then_yields_every_entry(self, chunk_size):
+        entries = list(iter_feed_entries(chunked(self.content, chunk_size)))
+
+        assert_that(entries).is_equal_to(self.entries)
+
+    def test_when_fields_given_then_yields_projected_entries(self):
+        fields = ["footprint", "beginposition"]
+
+        entries = list(iter_feed_entries(chunked(self.content, 1000), fields=fields))
+
+        assert_that(entries).is_equal_to(
+            [project_entry(entry, fields) for entry in self.entries]
+        )
+
+    def test_when_entries_read_then_yielded_before_body_fully_read(self):
+        chunks = iter(chunked(self.content, 100))
+
+        next(iter_feed_entries(chunks))
+
+        assert_that(list(chunks)).is_not_empty()
+
+    def test_when_single_entry_object_then_yields_it(self):
+        body = {"feed": {"opensearch:totalResults": "1", "entry": self.entries[0]}}
+
+        entries = list(iter_feed_entries(chunked(json.dumps(body).encode(), 5)))
+
+        assert_that(entries).is_equal_to([self.entries[0]])
+
+    def test_when_strings_contain_structure_then_ignored(self):
+        entry = {"id": 'a"{[,:]}\\"', "title": "é \\", "int": [{"name": "x"}]}
+        body = {"feed": {"entry": [entry, {"id": "b"}], "link": [{"rel": "}"}]}}
+
+        entries = list(iter_feed_entries(chunked(json.dumps(body).encode(), 3)))
+
+        assert_that(entries).is_equal_to([entry, {"id": "b"}])
+
+    def test_when_no_entries_then_yields_nothing(self):
+        body = b'{"feed": {"opensearch:totalResults": "0", "entry": []}, "x": {}}'
+
+        assert_that(list(iter_feed_entries([body]))).is_empty()
+
+    def test_when_entry_nested_elsewhere_then_not_yielded(self):
+        body = b'{"other": {"entry": [{"id": "a"}]}, "feed": {"x": {"entry": {}}}}'
+
+        assert_that(list(iter_feed_entries([body]))).is_empty()
+
+    @pytest.mark.parametrize(
+        "body", [b"", b"<html>Error</html>", b'{"feed": {"entry": [{"id"', b"{}}"]
+    )
+    def test_when_body_invalid_then_raises_value_error(self, body):
+        with pytest.raises(ValueError):
+            list(iter_feed_entries([body]))
+
+
+class TestSentinelHubClientStream:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self):
+        self.sentinel_product_request = SentinelProductRequest(
+            "*", 30, None, 0, "test-user", "test-password"
+        )
+        self.response = Mock(status_code=200, content=b"Service Unavailable")
+        self.response.iter_content.return_value = [b'{"feed": {"entry": ', b"[{}]}}"]
+        with patch("sentinelpy.client.requests") as requests_mock, patch(
+            "sentinelpy.streaming.ijson", None
+        ):
+            self.session_mock = requests_mock.Session.return_value
+            self.session_mock.get.return_value = self.response
+            self.client = SentinelHubClient()
+            yield
+
+    def test_when_streamed_then_reads_response_in_chunks(self):
+        entries = list(
+            self.client.stream(self.sentinel_product_request, chunk_size=1024)
+        )
+
+        assert_that(entries).is_equal_to([{}])
+        assert_that(self.session_mock.get.call_args[1]["stream"]).is_true()
+        self.response.iter_content.assert_called_once_with(1024)
+        self.response.close.assert_called_once()
+
+    def test_when_fields_given_then_yields_projected_entries(self):
+        self.response.iter_content.return_value = [
+            b'{"feed": {"entry": [{"id": "a", "title": "S1A", "summary": "..."}]}}'
+        ]
+
+        entries = list(
+            self.client.stream(self.sentinel_product_request, fields=["title"])
+        )
+
+        assert_that(entries).is_equal_to([{"id": "a", "title": "S1A"}])
+
+    def test_when_chunk_size_invalid_then_raises_value_error(self):
+        with pytest.raises(ValueError):
+            self.client.stream(self.sentinel_product_request, chunk_size=0)
+
+    def test_when_status_unsuccessful_then_raises_error(self):
+        self.response.status_code = 503
+
+        with pytest.raises(QuerySentinelProductsError) as error:
+            list(self.client.stream(self.sentinel_product_request))
+
+        assert_that(error.value.status_code).is_equal_to(503)
+        assert_that(error.value.response_data).is_equal_to("Service Unavailable")
+        self.response.close.assert_called_once()
+
+    def test_when_body_invalid_then_raises_error(self):
+        self.response.iter_content.return_value = [b"<html>"]
+
+        with pytest.raises(QuerySentinelProductsError) as error:
+            list(self.client.stream(self.sentinel_product_request))
+
+        assert_that(error.value.source).is_instance_of(ValueError)
+
+    def test_when_circuit_open_then_raises_without_querying(self):
+        circuit_breaker = Mock()
+        circuit_breaker.allow_request.return_value = False
+        circuit_breaker.retry_after = 5.0
+        client = SentinelHubClient(circuit_breaker=circuit_breaker)
+
+        with pytest.raises(CircuitOpenError):
+            list(client.stream(self.sentinel_product_request))
+
+        self.session_mock.get.assert_not_called()
+
+    def test_when_streamed_then_records_outcome_with_circuit_breaker(self):
+        circuit_breaker = Mock()
+        circuit_breaker.allow_request.return_value = True
+        client = SentinelHubClient(circuit_breaker=circuit_breaker)
+
+        list(client.stream(self.sentinel_product_request))
+
+        outcome = circuit_breaker.record.call_args[0][0]
+        assert_that(outcome.status_code).is_equal_to(200)
+        assert_that(outcome.error).is_none()
+
+    def test_when_endpoint_fails_then_fails_over_and_records_stats(self):
+        unavailable = Mock(status_code=503, content=b"")
+        self.session_mock.get.side_effect = [unavailable, self.response]
+        endpoints = EndpointPool(
+            ["https://primary.example/dhus", "https://mirror.example/dhus"]
+        )
+
+        entries = list(
+            SentinelHubClient(endpoints=endpoints).stream(self.sentinel_product_request)
+        )
+
+        assert_that(entries).is_equal_to([{}])
+        urls = [call[0][0] for call in self.session_mock.get.call_args_list]
+        assert_that(urls[0]).starts_with("https://primary.example/dhus/search?")
+        assert_that(urls[1]).starts_with("https://mirror.example/dhus/search?")
+        unavailable.close.assert_called_once()
+        assert_that([stats.requests for stats in endpoints.stats]).is_equal_to([1, 1])
@@ -0,0 +1,180 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import (
+    PlatformName,
+    RequestQueryBuilder,
+    SentinelProductRequest,
+    SyncState,
+    SyncStateStore,
+    sync_sentinel_products,
+)
+from tests.utils import hub_client
+
+RANGE_PATTERN = re.compile(r"ingestiondate:\[(\S+) TO NOW\]")
+T0 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def product(identifier: str, ingestion_date: datetime):
+    return {
+        "id": identifier,
+        "date": [
+            {"name": "beginposition", "content": "2019-12-31T00:00:00.000Z"},
+            {
+                "name": "ingestiondate",
+                "content": f"{ingestion_date:%Y-%m-%dT%H:%M:%S.000Z}",
+            },
+        ],
+    }
+
+
+def products_since(
+    products: List[Tuple[str, datetime]]
+) -> Callable[[SentinelProductRequest], List[Dict[str, Any]]]:
+    def matching(request):
+        found = sorted(products, key=lambda product: product[1])
+        date_range = RANGE_PATTERN.search(request.query)
+        if date_range:
+            start = datetime.strptime(
+                date_range.group(1), "%Y-%m-%dT%H:%M:%S.%fZ"
+            ).replace(tzinfo=timezone.utc)
+            found = [product for product in found if product[1] >= start]
+        return [product(*found_product) for found_product in found]
+
+    return matching
+
+
+class TestSyncStateStore:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        self.path = tmp_path / "state" / "sync.json"
+        self.store = SyncStateStore(str(self.path))
+
+    def test_when_nothing_stored_then_get_returns_none(self):
+        assert_that(self.store.get("subscription")).is_none()
+
+    def test_when_state_put_then_get_returns_it(self):
+        state = SyncState(T0, frozenset({"a", "b"}))
+
+        self.store.put("subscription", state)
+
+        assert_that(SyncStateStore(str(self.path)).get("subscription")).is_equal_to(
+            state
+        )
+
+    def test_when_subscription_removed_then_get_returns_none(self):
+        self.store.put("subscription", SyncState(T0, frozenset()))
+        self.store.put("other", SyncState(T0, frozenset()))
+
+        self.store.remove("subscription")
+
+        assert_that(self.store.get("subscription")).is_none()
+        assert_that(self.store.get("other")).is_not_none()
+
+
+class TestSyncSentinelProducts:
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        self.store = SyncStateStore(str(tmp_path / "sync.json"))
+        self.products = [
+            ("a", T0),
+            ("b", T0 + timedelta(minutes=30)),
+            ("c", T0 + timedelta(hours=2)),
+        ]
+        self.client = hub_client(products_since(self.products))
+
+    def sync(self, query="*", **kwargs):
+        return [
+            product["id"]
+            for product in sync_sentinel_products(
+                "subscription",
+                query,
+                username="test-user",
+                password="test-password",
+                store=self.store,
+                client=self.client,
+                **kwargs,
+            )
+        ]
+
+    @pytest.mark.parametrize(
+        "subscription, overlap", [("", timedelta(0)), ("name", timedelta(hours=-1))]
+    )
+    def test_when_arguments_invalid_then_raises_value_error(
+        self, subscription, overlap
+    ):
+        with pytest.raises(ValueError):
+            sync_sentinel_products(
+                subscription,
+                "*",
+                username="test-user",
+                password="test-password",
+                store=self.store,
+                overlap=overlap,
+                client=self.client,
+            )
+
+    def test_when_first_sync_then_yields_every_product_and_stores_watermark(self):
+        assert_that(self.sync()).is_equal_to(["a", "b", "c"])
+        assert_that(self.store.get("subscription")).is_equal_to(
+            SyncState(T0 + timedelta(hours=2), frozenset({"c"}))
+        )
+        request = self.client.query.call_args[0][0]
+        assert_that(request.query).is_equal_to("*")
+        assert_that(request.order_by).is_equal_to("ingestiondate asc")
+
+    def test_when_first_sync_since_then_fetches_from_since(self):
+        assert_that(self.sync(since=datetime(2020, 1, 1, 1))).is_equal_to(["c"])
+
+    def test_when_synced_again_then_fetches_from_watermark_less_overlap(self):
+        self.sync()
+
+        assert_that(
+            self.sync(RequestQueryBuilder().platform_name(PlatformName.SENTINEL_1))
+        ).is_empty()
+        assert_that(self.client.query.call_args[0][0].query).is_equal_to(
+            "(platformname:Sentinel-1) AND "
+            "ingestiondate:[2020-01-01T01:00:00.000Z TO NOW]"
+        )
+
+    def test_when_late_products_appear_in_overlap_then_yields_only_new(self):
+        self.sync()
+        self.products.extend(
+            [
+                ("late", T0 + timedelta(hours=1, minutes=30)),
+                ("d", T0 + timedelta(hours=3)),
+            ]
+        )
+
+        assert_that(self.sync()).is_equal_to(["late", "d"])
+        assert_that(self.store.get("subscription")).is_equal_to(
+            SyncState(T0 + timedelta(hours=3), frozenset({"c", "d"}))
+        )
+
+    def test_when_products_leave_overlap_then_not_stored(self):
+        self.products.extend(
+            (f"p{hour}", T0 + timedelta(hours=hour)) for hour in range(3, 10)
+        )
+
+        self.sync(overlap=timedelta(hours=2))
+
+        assert_that(self.store.get("subscription")).is_equal_to(
+            SyncState(T0 + timedelta(hours=9), frozenset({"p7", "p8", "p9"}))
+        )
+
+    def test_when_not_iterated_to_end_then_state_not_stored(self):
+        products = sync_sentinel_products(
+            "subscription",
+            "*",
+            username="test-user",
+            password="test-password",
+            store=self.store,
+            client=self.client,
+        )
+        next(products)
+
+        assert_that(self.store.get("subscription")).is_none()
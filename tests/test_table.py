@@ -0,0 +1,187 @@
+import json
+import math
+import os
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import (
+    OrbitDirection,
+    PlatformName,
+    ProductTable,
+    QuerySentinelProductsResponse,
+    Sentinel2ProductType,
+)
+from sentinelpy.exceptions import QuerySentinelProductsError
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+class TestProductTable:
+    @pytest.fixture(autouse=True, params=["python", "numpy"])
+    def setup_fixtures(self, request):
+        with open(f"{DATA_DIR}/sentinel.api.json", "r") as sentinel_data:
+            body = json.load(sentinel_data)
+        self.entries = body["feed"]["entry"]
+        self.responses = [
+            QuerySentinelProductsResponse(200, {"feed": {"entry": self.entries[:4]}}),
+            QuerySentinelProductsResponse(200, {"feed": {"entry": self.entries[4:]}}),
+        ]
+        self.table = ProductTable.from_responses(self.responses)
+        numpy = pytest.importorskip("numpy") if request.param == "numpy" else None
+        with patch("sentinelpy.table.numpy", numpy):
+            yield
+
+    @staticmethod
+    def ids(table):
+        return [entry["id"][:8] for entry in table.entries]
+
+    def test_when_built_from_responses_then_has_every_product(self):
+        assert_that(self.table).is_length(10)
+        assert_that(self.table.entries).is_equal_to(self.entries)
+
+    def test_when_response_failed_then_raises_error(self):
+        with pytest.raises(QuerySentinelProductsError):
+            ProductTable.from_responses([QuerySentinelProductsResponse(503, None)])
+
+    def test_when_strings_repeated_then_dictionary_encoded(self):
+        codes, dictionary = self.table.codes("platform_name")
+
+        assert_that(dictionary).is_equal_to(["Sentinel-2", "Sentinel-1"])
+        assert_that(list(codes)).is_equal_to([0, 0, 1, 0, 0, 0, 0, 0, 0, 0])
+        assert_that(codes.typecode).is_equal_to("l")
+
+    def test_when_column_read_then_values_decoded(self):
+        assert_that(self.table.column("begin_position")[2]).is_equal_to(
+            datetime(2020, 10, 20, 9, 4, 24, 416000, timezone.utc)
+        )
+        assert_that(self.table.column("ingestion_date")[3]).is_equal_to(
+            datetime(2020, 10, 20, 13, 20, 36, 860000, timezone.utc)
+        )
+        assert_that(self.table.column("relative_orbit_number")[2]).is_equal_to(155)
+        assert_that(self.table.column("cloud_cover_percentage")[2]).is_none()
+        assert_that(self.table.column("polarisation_mode")[2]).is_equal_to("VV VH")
+        assert_that(self.table.column("polarisation_mode")[0]).is_none()
+
+    def test_when_values_missing_then_stored_as_missing_markers(self):
+        table = ProductTable([{"id": "a", "int": {"name": "orbitnumber"}}])
+
+        assert_that(math.isnan(table.values("begin_position")[0])).is_true()
+        assert_that(table.values("relative_orbit_number")[0]).is_equal_to(-1)
+        assert_that(table.values("platform_name")[0]).is_equal_to(-1)
+        assert_that(table.column("relative_orbit_number")).is_equal_to([None])
+        assert_that(table.column("begin_position")).is_equal_to([None])
+
+    def test_when_filtered_by_enums_then_returns_matches(self):
+        table = self.table.filter(
+            platform_name=PlatformName.SENTINEL_2,
+            product_type=Sentinel2ProductType.S2MSI1C,
+            relative_orbit_number=94,
+        )
+
+        assert_that(self.ids(table)).is_equal_to(["77ef9a90", "6fe41570", "2577d999"])
+
+    def test_when_filtered_by_orbit_direction_then_ignores_case(self):
+        table = self.table.filter(orbit_direction=OrbitDirection.ASCENDING)
+
+        assert_that(self.ids(table)).is_equal_to(["a0ac0971"])
+
+    def test_when_filtered_by_ranges_then_returns_matches(self):
+        table = self.table.filter(
+            cloud_cover_percentage=(80, 100),
+            begin_position=(datetime(2020, 10, 20), datetime(2020, 10, 20, 8)),
+            ingestion_date=(
+                datetime(2020, 10, 20, 13, 20, 5, tzinfo=timezone.utc),
+                datetime(2020, 10, 20, 13, 21),
+            ),
+        )
+
+        assert_that(self.ids(table)).is_equal_to(["de48270a", "79a91e80"])
+
+    def test_when_not_filtered_then_returns_every_product(self):
+        assert_that(self.table.filter()).is_length(10)
+
+    def test_when_masked_then_keeps_products_with_true_mask(self):
+        mask = [value > 50 for value in self.table.values("relative_orbit_number")]
+
+        assert_that(self.ids(self.table.where(mask))).is_equal_to(
+            ["a0ac0971", "de48270a", "77ef9a90", "6fe41570", "2577d999", "79a91e80"]
+            + ["fed0e260"]
+        )
+
+    def test_when_masked_with_numpy_view_then_keeps_products_with_true_mask(self):
+        numpy = pytest.importorskip("numpy")
+        mask = numpy.frombuffer(self.table.values("relative_orbit_number"), "l") > 50
+
+        assert_that(self.ids(self.table.where(mask))).is_equal_to(
+            ["a0ac0971", "de48270a", "77ef9a90", "6fe41570", "2577d999", "79a91e80"]
+            + ["fed0e260"]
+        )
+
+    def test_when_sorted_by_date_then_ordered_with_missing_last(self):
+        table = ProductTable(self.entries[8:] + [{"id": "missing"}])
+
+        assert_that(self.ids(table.sort("ingestion_date"))).is_equal_to(
+            ["fed0e260", "79a91e80", "missing"]
+        )
+        assert_that(
+            self.ids(table.sort("ingestion_date", descending=True))
+        ).is_equal_to(["79a91e80", "fed0e260", "missing"])
+
+    def test_when_sorted_by_dictionary_column_then_ordered_by_value(self):
+        table = self.table.sort("platform_name").sort("relative_orbit_number")
+
+        assert_that(table.column("relative_orbit_number")).is_sorted()
+        assert_that(
+            self.table.sort("platform_name").column("platform_name")[0]
+        ).is_equal_to("Sentinel-1")
+
+    def test_when_sorted_descending_then_equal_values_keep_table_order(self):
+        table = self.table.sort("relative_orbit_number", descending=True)
+
+        assert_that(self.ids(table)).is_equal_to(
+            ["a0ac0971", "77ef9a90", "6fe41570", "2577d999", "de48270a", "79a91e80"]
+            + ["fed0e260", "cf604f89", "6fbea821", "10fb86db"]
+        )
+
+    def test_when_grouped_then_tables_per_value_in_first_appearance_order(self):
+        groups = self.table.group_by("platform_name")
+
+        assert_that(list(groups)).is_equal_to(["Sentinel-2", "Sentinel-1"])
+        assert_that(groups["Sentinel-2"]).is_length(9)
+        assert_that(
+            {
+                orbit: len(group)
+                for orbit, group in self.table.group_by("relative_orbit_number").items()
+            }
+        ).is_equal_to({21: 3, 155: 1, 92: 3, 94: 3})
+
+    def test_when_grouped_by_missing_values_then_grouped_under_none(self):
+        table = ProductTable([{"id": "a"}])
+
+        assert_that(list(table.group_by("platform_name"))).is_equal_to([None])
+
+    def test_when_grouped_by_float_column_then_raises_key_error(self):
+        with pytest.raises(KeyError):
+            self.table.group_by("cloud_cover_percentage")
+
+    def test_when_numpy_installed_then_views_array_without_copying(self):
+        with patch("sentinelpy.table.numpy") as numpy_mock:
+            view = self.table.to_numpy("begin_position")
+
+        numpy_mock.frombuffer.assert_called_once_with(
+            self.table.values("begin_position"), dtype="d"
+        )
+        assert_that(view).is_same_as(numpy_mock.frombuffer.return_value)
+
+    def test_when_numpy_not_installed_then_to_numpy_raises_import_error(self):
+        with patch("sentinelpy.table.numpy", None):
+            with pytest.raises(ImportError):
+                self.table.to_numpy("begin_position")
+
+    def test_when_columns_listed_then_includes_every_column(self):
+        assert_that(self.table.columns).contains(
+            "platform_name", "begin_position", "relative_orbit_number"
+        )
@@ -0,0 +1,150 @@
+from unittest.mock import Mock
+
+import pytest
+from assertpy import assert_that
+
+from sentinelpy import (
+    PlatformName,
+    QuerySentinelProductsResponse,
+    RequestQueryBuilder,
+    iter_tiled_sentinel_products,
+    tile_footprint,
+)
+
+SQUARE = "POLYGON((0 0, 10 0, 10 10, 0 10, 0 0))"
+
+
+class TestTileFootprint:
+    def test_when_square_tiled_then_returns_grid_of_squares(self):
+        tiles = tile_footprint(SQUARE, 2, 2)
+
+        assert_that(tiles).is_equal_to(
+            [
+                "POLYGON((0 0, 5 0, 5 5, 0 5, 0 0))",
+                "POLYGON((5 0, 10 0, 10 5, 5 5, 5 0))",
+                "POLYGON((0 5, 5 5, 5 10, 0 10, 0 5))",
+                "POLYGON((5 5, 10 5, 10 10, 5 10, 5 5))",
+            ]
+        )
+
+    def test_when_triangle_tiled_then_drops_cells_outside_polygon(self):
+        tiles = tile_footprint("POLYGON((0 0, 10 0, 0 10, 0 0))", 2, 2)
+
+        assert_that(tiles).is_equal_to(
+            [
+                "POLYGON((0 0, 5 0, 5 5, 0 5, 0 0))",
+                "POLYGON((5 0, 10 0, 10 5, 5 5, 5 0))",
+                "POLYGON((0 5, 5 5, 5 10, 0 10, 0 5))",
+            ]
+        )
+
+    def test_when_concave_polygon_tiled_then_returns_cells_overlapping_polygon(self):
+        tiles = tile_footprint(
+            "POLYGON((0 0, 12 0, 12 2, 2 2, 2 10, 12 10, 12 12, 0 12, 0 0))", 3, 3
+        )
+
+        # The centre and centre right cells lie within the notch of the polygon
+        assert_that(tiles).is_equal_to(
+            [
+                "POLYGON((0 0, 4 0, 4 4, 0 4, 0 0))",
+                "POLYGON((4 0, 8 0, 8 4, 4 4, 4 0))",
+                "POLYGON((8 0, 12 0, 12 4, 8 4, 8 0))",
+                "POLYGON((0 4, 4 4, 4 8, 0 8, 0 4))",
+                "POLYGON((0 8, 4 8, 4 12, 0 12, 0 8))",
+                "POLYGON((4 8, 8 8, 8 12, 4 12, 4 8))",
+                "POLYGON((8 8, 12 8, 12 12, 8 12, 8 8))",
+            ]
+        )
+
+    def test_when_tiled_then_tiles_are_valid_footprints(self):
+        tiles = tile_footprint(
+            '"Intersects(POLYGON((-4.53 29.85, 26.75 29.85, 26.75 46.80,'
+            '-4.53 46.80,-4.53 29.85)))"',
+            3,
+            4,
+        )
+
+        assert_that(tiles).is_length(12)
+        for tile in tiles:
+            RequestQueryBuilder().footprint(tile)
+
+    @pytest.mark.parametrize(
+        "footprint,rows,columns",
+        [
+            ("0.000, 1.000", 2, 2),
+            ("POLYGON((0 0, 1 a, 0 1, 0 0))", 2, 2),
+            ("POLYGON((0 0, 1 1, 0 0))", 2, 2),
+            (SQUARE, 0, 2),
+            (SQUARE, 2, 0),
+        ],
+    )
+    def test_when_invalid_arguments_then_raises_value_error(
+        self, footprint, rows, columns
+    ):
+        with pytest.raises(ValueError):
+            tile_footprint(footprint, rows, columns)
+
+
+class TestIterTiledSentinelProducts:
+    def test_when_iterated_then_queries_each_tile_and_dedupes_products(self):
+        def query(request, logger=None):
+            # Products on the boundary between tiles are returned by both tiles
+            return QuerySentinelProductsResponse(
+                200,
+                {
+                    "feed": {
+                        "opensearch:totalResults": "2",
+                        "entry": [{"id": "boundary"}, {"id": request.query}],
+                    }
+                },
+            )
+
+        client = Mock()
+        client.query.side_effect = query
+
+        products = list(
+            iter_tiled_sentinel_products(
+                RequestQueryBuilder().platform_name(PlatformName.SENTINEL_1),
+                SQUARE,
+                rows=1,
+                columns=2,
+                username="test-user",
+                password="test-password",
+                client=client,
+            )
+        )
+
+        assert_that(sorted(product["id"] for product in products)).is_equal_to(
+            [
+                "(platformname:Sentinel-1) AND footprint:"
+                '"Intersects(POLYGON((0 0, 5 0, 5 10, 0 10, 0 0)))" AND footprint:'
+                '"Intersects(POLYGON((0 0, 10 0, 10 10, 0 10, 0 0)))"',
+                "(platformname:Sentinel-1) AND footprint:"
+                '"Intersects(POLYGON((5 0, 10 0, 10 10, 5 10, 5 0)))" AND footprint:'
+                '"Intersects(POLYGON((0 0, 10 0, 10 10, 0 10, 0 0)))"',
+                "boundary",
+            ]
+        )
+
+    def test_when_query_is_everything_then_only_filters_on_tile_and_footprint(self):
+        client = Mock()
+        client.query.return_value = QuerySentinelProductsResponse(
+            200, {"feed": {"opensearch:totalResults": "0"}}
+        )
+
+        list(
+            iter_tiled_sentinel_products(
+                "*",
+                SQUARE,
+                rows=1,
+                columns=1,
+                username="test-user",
+                password="test-password",
+                client=client,
+            )
+        )
+
+        assert_that(client.query.call_args[0][0].query).is_equal_to(
+            'footprint:"Intersects(POLYGON((0 0, 10 0, 10 10, 0 10, 0 0)))" AND '
+            'footprint:"Intersects(POLYGON((0 0, 10 0, 10 10, 0 10, 0 0)))"'
+        )
@@ -1,7 +1,82 @@
-from typing import Dict, List
+import asyncio
+import json
+from typing import Any, Callable, Coroutine, Dict, List, Sequence, TypeVar, Union
+from unittest.mock import Mock
 from urllib.parse import parse_qs
 
+from sentinelpy import (
+    QuerySentinelProductsResponse,
+    RawSentinelProductsResponse,
+    SentinelProductRequest,
+)
+from sentinelpy.client import SENTINEL_HUB_MAX_ROWS
+
+T = TypeVar("T")
+
+# A product (feed entry), or just its id
+Product = Union[str, Dict[str, Any]]
+Products = Union[
+    Sequence[Product], Callable[[SentinelProductRequest], Sequence[Product]]
+]
+
 
 def get_query_parameters_of_url(url: str) -> Dict[str, List[str]]:
     just_query_params = url[url.index("?") + 1 :]
     return parse_qs(just_query_params)
+
+
+def run_async(coroutine: Coroutine[Any, Any, T]) -> T:
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def product_ids(count: int) -> List[str]:
+    return [str(index) for index in range(count)]
+
+
+def page(
+    products: Sequence[Product], total_results: int
+) -> QuerySentinelProductsResponse:
+    return QuerySentinelProductsResponse(
+        200,
+        {
+            "feed": {
+                "opensearch:totalResults": str(total_results),
+                "entry": [
+                    {"id": product} if isinstance(product, str) else product
+                    for product in products
+                ],
+            }
+        },
+    )
+
+
+def raw_page(
+    products: Sequence[Product], total_results: int
+) -> RawSentinelProductsResponse:
+    return RawSentinelProductsResponse(
+        200, {}, json.dumps(page(products, total_results).body).encode()
+    )
+
+
+def hub_client(products: Products) -> Mock:
+    """Mock client paging through the products, or the products matching each
+    request, as the hub does"""
+
+    def matching(request: SentinelProductRequest) -> Sequence[Product]:
+        return products(request) if callable(products) else products
+
+    def page_of(request: SentinelProductRequest, to_page: Callable[..., T]) -> T:
+        found = matching(request)
+        rows = SENTINEL_HUB_MAX_ROWS if request.rows is None else request.rows
+        return to_page(found[request.start : request.start + rows], len(found))
+
+    client = Mock()
+    client.query.side_effect = lambda request, logger=None: page_of(request, page)
+    client.query_raw.side_effect = lambda request, logger=None: page_of(
+        request, raw_page
+    )
+    return client